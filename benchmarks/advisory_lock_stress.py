@@ -0,0 +1,243 @@
+"""
+Concurrent scheduling stress test
+
+Contended run: T threads (one DatabaseManager each) book random
+meetings for a small shared pool of persons on a few overlapping slots,
+then the database is checked for double bookings. With participant
+locks there must be none; --no-locks shows what happens without them,
+--serializable runs the writes at SERIALIZABLE isolation and reports
+how often the transactional executor had to retry
+
+Import run: the same contention through the import path, every thread
+importing one-event calendars (ATTENDEEs of the shared pool) with
+DatabaseManager.run_import_pipeline; the database must again hold no
+double booking. Run it on a database created with
+`cli.py init-db --partitioned` to cover the partition creation of imports
+
+Scaling run: every thread books meetings for its own persons only
+(disjoint participants), for 1, 2, 4 ... T threads, and prints the
+meetings/s of each thread count
+
+Usage:
+    python benchmarks/advisory_lock_stress.py [--threads T] [--count N] [--no-locks]
+        [--serializable]
+
+Needs a configured config/db_config.py pointing to a scratch database
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.db_config import DEFAULT_CONFIG
+from database import DatabaseManager
+from database.ics_parser import build_event, new_calendar
+
+
+def connect(locks, serializable=False):
+    db = DatabaseManager(participant_locks=locks, serializable_scheduling=serializable)
+    ok, message = db.connect(**DEFAULT_CONFIG)
+    if not ok:
+        sys.exit(message)
+    return db
+
+
+def create_persons(db, count):
+    """
+    Create `count` persons
+
+    Returns:
+        list[int]: their person_ids
+    """
+    tag = uuid.uuid4().hex[:8]
+    db.write_batch([(f"Stress {tag} {i}", f"stress-{tag}-{i}@example.com", None)
+                    for i in range(count)], [])
+    db.cursor.execute(
+        "SELECT person_id FROM persons WHERE email LIKE %s ORDER BY person_id;",
+        (f"stress-{tag}-%",)
+    )
+    return [row[0] for row in db.cursor.fetchall()]
+
+
+def emails_of(db, person_ids):
+    """
+    Emails of the given persons
+
+    Returns:
+        dict: person_id -> email
+    """
+    db.cursor.execute(
+        "SELECT person_id, email FROM persons WHERE person_id = ANY(%s::int[]);",
+        (person_ids,)
+    )
+    emails = dict(db.cursor.fetchall())
+    db.connection.commit()
+    return emails
+
+
+def count_double_bookings(db, person_ids):
+    """
+    Pairs of live overlapping meetings that share a participant
+
+    Returns:
+        int
+    """
+    db.cursor.execute(
+        """
+        SELECT COUNT(*)
+        FROM meeting_participants a
+            JOIN meeting_participants b
+                ON a.person_id = b.person_id AND a.meeting_id < b.meeting_id
+            JOIN meetings ma ON ma.meeting_id = a.meeting_id
+            JOIN meetings mb ON mb.meeting_id = b.meeting_id
+        WHERE a.person_id = ANY(%s::int[])
+          AND ma.deleted_at IS NULL AND mb.deleted_at IS NULL
+          AND ma.start_time < mb.end_time AND mb.start_time < ma.end_time;
+        """, (person_ids,)
+    )
+    count = db.cursor.fetchone()[0]
+    db.connection.commit()
+    return count
+
+
+def run_threads(threads, locks, work, serializable=False):
+    """
+    Run work(db, thread_index) on `threads` threads, each with its own
+    connection, all released at the same moment
+
+    Returns:
+        (float, int, int): elapsed seconds, number of scheduled meetings
+                           and number of retried transactions
+    """
+    dbs = [connect(locks, serializable) for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+    scheduled = [0] * threads
+
+    def worker(index):
+        barrier.wait()
+        scheduled[index] = work(dbs[index], index)
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    retries = sum(db.tx_metrics.as_dict()["retries"] for db in dbs)
+    for db in dbs:
+        db.close()
+    return elapsed, sum(scheduled), retries
+
+
+def contended(db, threads, count, locks, start, serializable):
+    persons = create_persons(db, 6)
+
+    def work(thread_db, index):
+        rng = random.Random(index)
+        scheduled = 0
+        for i in range(count):
+            begin = start + timedelta(minutes=15 * rng.randrange(8))
+            ok, message = thread_db.add_meeting(
+                f"Contended {index}-{i}", "", begin, begin + timedelta(minutes=30),
+                "", rng.sample(persons, 2)
+            )
+            scheduled += ok
+        return scheduled
+
+    elapsed, scheduled, retries = run_threads(threads, locks, work, serializable)
+    doubles = count_double_bookings(db, persons)
+    print(f"contended: {threads} threads, {scheduled} meetings scheduled in "
+          f"{elapsed:.2f}s, {doubles} double bookings, {retries} retries "
+          f"({'locks' if locks else 'no locks'}"
+          f"{', serializable' if serializable else ''})")
+    return doubles
+
+
+def contended_imports(db, threads, count, locks, start, serializable):
+    persons = create_persons(db, 6)
+    emails = emails_of(db, persons)
+    #months ahead, so the partitioned layout has to create partitions
+    start = start + timedelta(days=400)
+
+    def work(thread_db, index):
+        rng = random.Random(index)
+        scheduled = 0
+        for i in range(count):
+            begin = start + timedelta(minutes=15 * rng.randrange(8))
+            attendees = rng.sample(persons, 2)
+            cal = new_calendar()
+            cal.add_component(build_event(
+                uuid.uuid4().hex, f"Imported {index}-{i}", "", begin,
+                begin + timedelta(minutes=30), "",
+                [f"Person {pid}" for pid in attendees], [emails[pid] for pid in attendees]
+            ))
+            ok, report = thread_db.run_import_pipeline(cal.to_ical(), f"<thread {index}>")
+            scheduled += report["imported"]
+        return scheduled
+
+    elapsed, scheduled, retries = run_threads(threads, locks, work, serializable)
+    doubles = count_double_bookings(db, persons)
+    print(f"imports: {threads} threads, {scheduled} meetings imported in "
+          f"{elapsed:.2f}s, {doubles} double bookings, {retries} retries "
+          f"({'locks' if locks else 'no locks'}"
+          f"{', serializable' if serializable else ''})")
+    return doubles
+
+
+def scaling(db, max_threads, count, locks, start, serializable):
+    threads = 1
+    base_rate = None
+    while threads <= max_threads:
+        persons = create_persons(db, threads)
+
+        def work(thread_db, index):
+            scheduled = 0
+            for i in range(count):
+                begin = start + timedelta(hours=i)
+                ok, message = thread_db.add_meeting(
+                    f"Disjoint {index}-{i}", "", begin, begin + timedelta(minutes=30),
+                    "", [persons[index]]
+                )
+                scheduled += ok
+            return scheduled
+
+        elapsed, scheduled, retries = run_threads(threads, locks, work, serializable)
+        rate = scheduled / elapsed
+        base_rate = base_rate or rate
+        print(f"disjoint: {threads:3} threads {rate:10.0f} meetings/s (x{rate / base_rate:.1f})")
+        threads *= 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--count", type=int, default=200, help="meetings per thread")
+    parser.add_argument("--no-locks", action="store_true")
+    parser.add_argument("--serializable", action="store_true")
+    args = parser.parse_args()
+    locks = not args.no_locks
+
+    db = connect(locks)
+    db.create_tables()
+    start = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+    doubles = contended(db, args.threads, args.count, locks, start, args.serializable)
+    doubles += contended_imports(db, args.threads, args.count, locks, start, args.serializable)
+    scaling(db, args.threads, args.count, locks, start, args.serializable)
+    db.close()
+
+    if (locks or args.serializable) and doubles:
+        sys.exit("double bookings found with participant locks or serializable writes")
+
+
+if __name__ == "__main__":
+    main()
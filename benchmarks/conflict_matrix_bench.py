@@ -0,0 +1,107 @@
+"""
+Batch conflict check benchmark
+
+Fills a scratch database with a busy calendar for P persons, then tests
+N candidate meetings once with DatabaseManager.check_conflicts in a loop
+and once with check_conflicts_batch, checks that both agree and prints
+the candidates/s of both
+
+Usage:
+    python benchmarks/conflict_matrix_bench.py [--persons P] [--candidates N]
+
+Needs numpy and a configured config/db_config.py pointing to a scratch database
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.db_config import DEFAULT_CONFIG
+from database import DatabaseManager
+
+
+def connect():
+    db = DatabaseManager()
+    ok, message = db.connect(**DEFAULT_CONFIG)
+    if not ok:
+        sys.exit(message)
+    db.create_tables()
+    return db
+
+
+def fill_calendar(db, persons, meetings_per_person, start):
+    """
+    Create `persons` persons with back to back one hour meetings every
+    few hours over the next weeks
+
+    Returns:
+        list[int]: their person_ids
+    """
+    tag = uuid.uuid4().hex[:8]
+    for i in range(persons):
+        db.add_person(f"Bench {tag} {i}", f"bench-{tag}-{i}@example.com")
+    db.cursor.execute(
+        "SELECT person_id FROM persons WHERE email LIKE %s ORDER BY person_id;",
+        (f"bench-{tag}-%",)
+    )
+    person_ids = [row[0] for row in db.cursor.fetchall()]
+
+    meetings = []
+    for n, pid in enumerate(person_ids):
+        for i in range(meetings_per_person):
+            begin = start + timedelta(hours=3 * i + n % 3)
+            meetings.append((f"Busy {i}", "", begin, begin + timedelta(hours=1), "", [pid]))
+    person_results, results = db.write_batch([], meetings)
+    failed = [message for ok, message in results if not ok]
+    if failed:
+        sys.exit(failed[0])
+    return person_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--persons", type=int, default=200)
+    parser.add_argument("--meetings", type=int, default=50, help="meetings per person")
+    parser.add_argument("--candidates", type=int, default=5000)
+    args = parser.parse_args()
+
+    db = connect()
+    start = datetime.now().replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    person_ids = fill_calendar(db, args.persons, args.meetings, start)
+
+    random.seed(0)
+    candidates = []
+    for _ in range(args.candidates):
+        begin = start + timedelta(minutes=30 * random.randrange(6 * args.meetings))
+        candidates.append((random.sample(person_ids, 4), begin, begin + timedelta(minutes=90)))
+
+    started = time.perf_counter()
+    looped = []
+    for ids, begin, end in candidates:
+        ok, conflicts, message = db.check_conflicts(ids, begin, end)
+        if not ok:
+            sys.exit(message)
+        looped.append(bool(conflicts))
+    loop_rate = len(candidates) / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    ok, matrix, message = db.check_conflicts_batch(candidates)
+    if not ok:
+        sys.exit(message)
+    batch_rate = len(candidates) / (time.perf_counter() - started)
+
+    if matrix.any().tolist() != looped:
+        sys.exit("check_conflicts and check_conflicts_batch disagree")
+
+    print(f"check_conflicts loop   {loop_rate:12.0f} candidates/s")
+    print(f"check_conflicts_batch  {batch_rate:12.0f} candidates/s "
+          f"(x{batch_rate / loop_rate:.1f}, {sum(looped)} conflicting)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Partition pruning check
+
+Pre-creates the monthly partitions of a year and, for a set of ranges
+(inside one month, across a month boundary, at the start of a month so
+overlap searches reach into the previous one, a whole quarter), checks
+with DatabaseManager.check_partition_pruning that the interval search
+in every mode and the conflict check only scan the partitions the range
+can match. Exits with an error listing the unpruned queries
+
+Usage:
+    python benchmarks/partition_pruning_check.py [--year Y]
+
+Needs a configured config/db_config.py pointing to a scratch database
+created with `cli.py init-db --partitioned`
+"""
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.db_config import DEFAULT_CONFIG
+from database import DatabaseManager
+
+
+def ranges(year):
+    """
+    (label, start, end) of the checked ranges
+
+    Returns:
+        list[tuple]
+    """
+    return [
+        ("one day", datetime(year, 5, 14), datetime(year, 5, 15)),
+        ("month boundary", datetime(year, 6, 28), datetime(year, 7, 3)),
+        ("start of month", datetime(year, 9, 1), datetime(year, 9, 1, 12)),
+        ("quarter", datetime(year, 10, 1), datetime(year + 1, 1, 1)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--year", type=int, default=datetime.now().year + 1)
+    args = parser.parse_args()
+
+    db = DatabaseManager()
+    ok, message = db.connect(**DEFAULT_CONFIG)
+    if not ok:
+        sys.exit(message)
+    if not db.partitioned:
+        sys.exit("meetings is not partitioned, create the database with init-db --partitioned")
+
+    ok, message = db.create_partitions(datetime(args.year - 1, 12, 1),
+                                       datetime(args.year + 1, 1, 31) + timedelta(days=1))
+    if not ok:
+        sys.exit(message)
+
+    failures = []
+    for label, start, end in ranges(args.year):
+        ok, result = db.check_partition_pruning(start, end)
+        if not ok:
+            sys.exit(result)
+        for query, outside in result.items():
+            status = "pruned" if not outside else "scans " + ", ".join(outside)
+            print(f"{label:15} {query:24} {status}")
+            if outside:
+                failures.append(f"{label}: {query}")
+    db.close()
+
+    if failures:
+        sys.exit("partitions outside the range scanned by: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Read/write split check
+
+Uses two databases of the same server as primary (config/db_config.py)
+and stand-in replica (--replica-database, same credentials), each holding
+its own marker person, so every read shows which connection served it.
+Checks that:
+    -a read right after a write goes to the primary (read-your-writes)
+    -once the pin expires, reads go to the replica
+    -writes go to the primary and never to the replica
+    -reads fall back to the primary while the replica lags more than
+     max_replica_lag, and return to it when the lag drops again
+Exits with an error listing the failed checks
+
+Usage:
+    python benchmarks/replica_routing_check.py --replica-database NAME
+        [--max-lag SECONDS] [--reads N]
+
+Needs a configured config/db_config.py pointing to a scratch database and
+a second scratch database NAME on the same server
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.db_config import DEFAULT_CONFIG
+from database import DatabaseManager
+
+
+def connect(config, **options):
+    db = DatabaseManager()
+    ok, message = db.connect(**config, **options)
+    if not ok:
+        sys.exit(message)
+    return db
+
+
+def add_marker(db, label, tag):
+    """
+    Add the marker person of one database
+
+    Returns:
+        str: its email
+    """
+    email = f"{label}-{tag}@example.com"
+    ok, message = db.add_person(f"{label.capitalize()} marker {tag}", email)
+    if not ok:
+        sys.exit(message)
+    return email
+
+
+def served_by(db, markers):
+    """
+    Which database answered a read, from the marker it returned
+
+    Returns:
+        str: "primary", "replica" or "unknown"
+    """
+    ok, persons = db.get_all_persons()
+    if not ok:
+        sys.exit(persons)
+    emails = {person.email for person in persons}
+    for source, email in markers.items():
+        if email in emails:
+            return source
+    return "unknown"
+
+
+def set_lag(db, lag):
+    """
+    Make every replica report `lag` seconds until the next lag check
+    (None measures it again on the next read)
+
+    Returns:
+        None
+    """
+    for replica in db.replica_set.replicas:
+        replica.lag = lag
+        replica.checked_at = 0.0 if lag is None else time.monotonic()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--replica-database", required=True)
+    parser.add_argument("--max-lag", type=float, default=5.0)
+    parser.add_argument("--reads", type=int, default=20)
+    args = parser.parse_args()
+
+    replica_config = dict(DEFAULT_CONFIG, database=args.replica_database)
+    tag = uuid.uuid4().hex[:8]
+
+    replica_db = connect(replica_config)
+    replica_db.create_tables()
+    markers = {"replica": add_marker(replica_db, "replica", tag)}
+
+    db = connect(DEFAULT_CONFIG, replicas=[replica_config], max_replica_lag=args.max_lag)
+    db.create_tables()
+    if not db.replica_set.replicas or db.replica_set.replicas[0].connection is None:
+        sys.exit(f"Replica {args.replica_database} unavailable")
+    markers["primary"] = add_marker(db, "primary", tag)
+
+    failures = []
+
+    def check(label, expected, reads, lag=None, sources_of=None):
+        sources = []
+        for _ in range(reads):
+            #the lag is trusted for LAG_CHECK_INTERVAL only, set it before every read
+            if lag is not None:
+                set_lag(db, lag)
+            sources.append(served_by(db, sources_of or markers))
+        wrong = [source for source in sources if source != expected]
+        print(f"{label:32} {reads - len(wrong)}/{reads} reads from the {expected}")
+        if wrong:
+            failures.append(label)
+
+    #the marker write pinned reads to the primary
+    check("read-your-writes", "primary", 1)
+
+    time.sleep(db.replica_set.pin_seconds)
+    check("reads after the pin", "replica", args.reads)
+
+    written = add_marker(db, "written", tag)
+    on_replica = served_by(replica_db, {"replica": written}) == "replica"
+    print(f"{'write':32} {'on the replica' if on_replica else 'on the primary only'}")
+    if on_replica:
+        failures.append("write")
+    #the new row itself must be visible right away
+    check("read after the write", "primary", 1,
+          sources_of={"primary": written, "replica": markers["replica"]})
+
+    time.sleep(db.replica_set.pin_seconds)
+    check("replica lagging", "primary", args.reads, lag=args.max_lag + 1)
+
+    set_lag(db, None)
+    check("replica caught up", "replica", args.reads)
+
+    print(f"replica reads {db.replica_set.replica_reads}, "
+          f"primary reads {db.replica_set.primary_reads}")
+    db.close()
+    replica_db.close()
+
+    if failures:
+        sys.exit("failed: " + ", ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
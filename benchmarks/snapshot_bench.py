@@ -0,0 +1,91 @@
+"""
+Offline snapshot benchmark
+
+Writes a snapshot of N synthetic meetings for P persons, maps it and
+runs Q interval searches and Q conflict checks, once with the snapshot's
+binary searches and once with a linear scan over the same meetings in
+memory; both must agree. Prints the write / open times and the
+queries/s of both
+
+Usage:
+    python benchmarks/snapshot_bench.py [--meetings N] [--persons P] [--queries Q]
+
+Needs no database
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.snapshot import CalendarSnapshot, write_snapshot
+
+START = datetime(2030, 1, 1, tzinfo=timezone.utc)
+DAYS = 365
+
+
+def build_calendar(rng, meetings, persons):
+    people = {pid: (f"Person {pid}", f"person{pid}@example.com") for pid in range(1, persons + 1)}
+    rows = []
+    for meeting_id in range(1, meetings + 1):
+        begin = START + timedelta(minutes=15 * rng.randrange(4 * 24 * DAYS))
+        rows.append((meeting_id, f"uid-{meeting_id}", f"Meeting {meeting_id}", "", begin,
+                     begin + timedelta(minutes=30 * rng.randint(1, 4)), "Room",
+                     rng.sample(range(1, persons + 1), rng.randint(1, 4))))
+    return people, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--meetings", type=int, default=200000)
+    parser.add_argument("--persons", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    people, rows = build_calendar(rng, args.meetings, args.persons)
+    queries = []
+    for _ in range(args.queries):
+        begin = START + timedelta(minutes=15 * rng.randrange(4 * 24 * DAYS))
+        queries.append((rng.sample(range(1, args.persons + 1), 3), begin, begin + timedelta(hours=2)))
+
+    path = os.path.join(tempfile.mkdtemp(), "calendar.snap")
+    started = time.perf_counter()
+    write_snapshot(path, people, rows, START)
+    write_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    snapshot = CalendarSnapshot(path)
+    open_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    mapped = [([m.meeting_id for m in snapshot.meetings_in_interval(start, end, "overlapping")],
+               snapshot.conflicts(ids, start, end)) for ids, start, end in queries]
+    mapped_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scanned = []
+    for ids, start, end in queries:
+        found = sorted((row for row in rows if row[4] < end and row[5] > start),
+                       key=lambda row: (row[4], row[0]))
+        busy = {pid for row in found for pid in row[7]}
+        scanned.append(([row[0] for row in found],
+                        [(pid, people[pid][0]) for pid in ids if pid in busy]))
+    scan_elapsed = time.perf_counter() - started
+
+    snapshot.close()
+    os.remove(path)
+    if mapped != scanned:
+        sys.exit("snapshot results differ from the linear scan")
+    print(f"{args.meetings} meetings: write {write_elapsed:.2f}s, open {open_elapsed * 1000:.2f}ms")
+    print(f"{args.queries} searches + conflict checks: snapshot "
+          f"{args.queries / mapped_elapsed:.0f}/s, scan {args.queries / scan_elapsed:.0f}/s "
+          f"(x{scan_elapsed / mapped_elapsed:.0f})")
+
+
+if __name__ == "__main__":
+    main()
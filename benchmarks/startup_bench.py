@@ -0,0 +1,87 @@
+"""
+Startup benchmark
+
+Measures, in fresh interpreter processes:
+    - import time of main.py (and everything it imports at module level)
+    - time until the menu is painted, in fast start and eager mode
+
+Usage:
+    python benchmarks/startup_bench.py [--runs N]
+
+Needs a display and a configured config/db_config.py
+(eager mode also needs a reachable database)
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = """
+import time
+started = time.perf_counter()
+import main
+print(time.perf_counter() - started)
+"""
+
+FIRST_PAINT_SNIPPET = """
+import time
+started = time.perf_counter()
+import main
+
+def ready(root):
+    root.update_idletasks()
+    print(time.perf_counter() - started)
+    root.destroy()
+
+main.main(fast_start={fast_start}, on_ready=ready)
+"""
+
+
+def measure(snippet, runs):
+    """
+    Run a snippet in fresh processes and collect the printed timings
+
+    Returns:
+        list[float]: seconds per run
+    """
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", snippet],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return timings
+
+
+def report(label, timings):
+    """
+    Print median/min/max of a measurement in milliseconds
+
+    Returns:
+        None
+    """
+    print(
+        f"{label:<24} median {statistics.median(timings) * 1000:8.1f} ms   "
+        f"min {min(timings) * 1000:8.1f} ms   max {max(timings) * 1000:8.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    report("import main", measure(IMPORT_SNIPPET, args.runs))
+    report("first paint (fast)", measure(FIRST_PAINT_SNIPPET.format(fast_start=True), args.runs))
+    report("first paint (eager)", measure(FIRST_PAINT_SNIPPET.format(fast_start=False), args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Tenant scaling benchmark
+
+Fills T tenants (1, 10, 100 by default, grown step by step) with the
+same calendar of P persons and M meetings each, and after every step
+times Q interval searches and Q conflict checks of the first tenant.
+With tenant_id leading the indexes the per-tenant latency stays flat
+while the tables grow with the number of tenants
+
+Usage:
+    python benchmarks/tenant_scaling_bench.py [--tenants 1,10,100]
+        [--persons P] [--meetings M] [--queries Q]
+
+Needs a configured config/db_config.py pointing to a scratch database
+Tenant ids are picked at random above 1000000 so existing data is not touched
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.db_config import DEFAULT_CONFIG
+from database import DatabaseManager
+
+START = datetime(2031, 1, 1, tzinfo=timezone.utc)
+DAYS = 90
+
+
+def connect(tenant_id):
+    db = DatabaseManager(tenant_id=tenant_id)
+    ok, message = db.connect(**DEFAULT_CONFIG)
+    if not ok:
+        sys.exit(message)
+    return db
+
+
+def fill_tenant(tenant_id, persons, meetings):
+    """
+    Write the benchmark calendar of one tenant (same seed for all tenants)
+
+    Returns:
+        None
+    """
+    db = connect(tenant_id)
+    rng = random.Random(0)
+    db.write_batch([(f"Person {i}", f"person{i}@example.com", "") for i in range(persons)], [])
+    ok, rows = db.get_all_persons()
+    if not ok:
+        sys.exit(rows)
+    person_ids = [row[0] for row in rows]
+
+    batch = []
+    for i in range(meetings):
+        begin = START + timedelta(minutes=15 * rng.randrange(4 * 24 * DAYS))
+        batch.append((f"Meeting {i}", "", begin, begin + timedelta(minutes=30),
+                      "Room", [rng.choice(person_ids)]))
+    db.write_batch([], batch)
+    db.close()
+
+
+def measure(db, queries, rng):
+    """
+    Median latency (ms) of interval searches and conflict checks
+
+    Returns:
+        (float,float)
+    """
+    ok, rows = db.get_all_persons()
+    person_ids = [row[0] for row in rows]
+    searches, checks = [], []
+    for _ in range(queries):
+        begin = START + timedelta(minutes=15 * rng.randrange(4 * 24 * DAYS))
+        end = begin + timedelta(hours=4)
+
+        started = time.perf_counter()
+        ok, result = db.get_meetings_in_interval(begin, end, mode="overlapping")
+        searches.append(time.perf_counter() - started)
+        if not ok:
+            sys.exit(result)
+
+        started = time.perf_counter()
+        ok, conflicts, message = db.check_conflicts(rng.sample(person_ids, 3), begin, end)
+        checks.append(time.perf_counter() - started)
+        if not ok:
+            sys.exit(message)
+    return statistics.median(searches) * 1000, statistics.median(checks) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tenants", default="1,10,100",
+                        help="comma separated tenant counts, ascending")
+    parser.add_argument("--persons", type=int, default=50)
+    parser.add_argument("--meetings", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    steps = sorted(int(count) for count in args.tenants.split(","))
+    first = random.randrange(1000000, 2**31 - 1 - steps[-1])
+
+    db = connect(first)
+    db.create_tables()
+    db.close()
+
+    filled = 0
+    for count in steps:
+        for tenant_id in range(first + filled, first + count):
+            fill_tenant(tenant_id, args.persons, args.meetings)
+        filled = count
+
+        db = connect(first)
+        search_ms, check_ms = measure(db, args.queries, random.Random(1))
+        db.close()
+        print(f"{count:>6} tenants ({count * args.meetings} meetings): "
+              f"interval search {search_ms:.2f}ms, conflict check {check_ms:.2f}ms (median)")
+
+
+if __name__ == "__main__":
+    main()
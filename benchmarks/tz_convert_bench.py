@@ -0,0 +1,58 @@
+"""
+Time zone conversion benchmark
+
+Formats the start/end times of N synthetic meetings (UTC datetimes on
+15 minute slots, as returned by the data layer) for display in a zone,
+once with a plain astimezone + strftime per value and once with the
+cached ZoneConverter used by the GUI and the cli
+
+Usage:
+    python benchmarks/tz_convert_bench.py [--meetings N] [--zone ZONE]
+
+Needs no database
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.timezones import UTC, ZoneConverter, get_zone
+
+FORMAT = "%d-%m-%Y %H:%M"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--meetings", type=int, default=200000)
+    parser.add_argument("--zone", default="Europe/Bucharest")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    start = datetime(2025, 1, 1, tzinfo=UTC)
+    times = []
+    for _ in range(args.meetings):
+        begin = start + timedelta(minutes=15 * rng.randrange(4 * 24 * 90))
+        times += [begin, begin + timedelta(minutes=30 * rng.randint(1, 4))]
+
+    zone = get_zone(args.zone)
+    started = time.perf_counter()
+    plain = [value.astimezone(zone).strftime(FORMAT) for value in times]
+    plain_elapsed = time.perf_counter() - started
+
+    converter = ZoneConverter(args.zone)
+    started = time.perf_counter()
+    cached = [converter.format(value, FORMAT) for value in times]
+    cached_elapsed = time.perf_counter() - started
+
+    if plain != cached:
+        sys.exit("cached conversion differs from astimezone")
+    print(f"{len(times)} values in {args.zone}: astimezone {plain_elapsed:.3f}s, "
+          f"cached {cached_elapsed:.3f}s (x{plain_elapsed / cached_elapsed:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Group-commit benchmark
+
+Creates N persons and N one-person meetings (no conflicts) once with
+DatabaseManager.add_meeting in a loop and once through WriteBatcher fed
+by several threads, and prints the sustained meetings/s of both
+
+Usage:
+    python benchmarks/write_batch_bench.py [--count N] [--threads T]
+
+Needs a configured config/db_config.py pointing to a scratch database
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.db_config import DEFAULT_CONFIG
+from database import DatabaseManager, WriteBatcher
+
+
+def connect():
+    db = DatabaseManager()
+    ok, message = db.connect(**DEFAULT_CONFIG)
+    if not ok:
+        sys.exit(message)
+    db.create_tables()
+    return db
+
+
+def create_persons(db, count, tag):
+    """
+    Create `count` persons for one run
+
+    Returns:
+        list[int]: their person_ids
+    """
+    for i in range(count):
+        db.add_person(f"Bench {tag} {i}", f"bench-{tag}-{i}@example.com")
+    db.cursor.execute(
+        "SELECT person_id FROM persons WHERE email LIKE %s ORDER BY person_id;",
+        (f"bench-{tag}-%",)
+    )
+    return [row[0] for row in db.cursor.fetchall()]
+
+
+def meetings_for(person_ids):
+    start = datetime.now() + timedelta(days=1)
+    return [
+        (f"Bench {i}", "", start, start + timedelta(minutes=30), "", [pid])
+        for i, pid in enumerate(person_ids)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+
+    db = connect()
+
+    meetings = meetings_for(create_persons(db, args.count, uuid.uuid4().hex[:8]))
+    started = time.perf_counter()
+    for meeting in meetings:
+        ok, message = db.add_meeting(*meeting)
+        if not ok:
+            sys.exit(message)
+    loop_rate = len(meetings) / (time.perf_counter() - started)
+
+    meetings = meetings_for(create_persons(db, args.count, uuid.uuid4().hex[:8]))
+    batcher = WriteBatcher(connect())
+    batcher.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        results = list(pool.map(lambda meeting: batcher.add_meeting(*meeting), meetings))
+    batch_rate = len(meetings) / (time.perf_counter() - started)
+    batcher.stop()
+
+    failed = [message for ok, message in results if not ok]
+    if failed:
+        sys.exit(failed[0])
+
+    print(f"add_meeting loop      {loop_rate:10.0f} meetings/s")
+    print(f"WriteBatcher ({args.threads:>3} th) {batch_rate:10.0f} meetings/s "
+          f"({batcher.batches} batches, x{batch_rate / loop_rate:.1f})")
+
+
+if __name__ == "__main__":
+    main()
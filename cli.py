@@ -0,0 +1,800 @@
+import argparse
+import csv
+import json
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from config.db_config import DEFAULT_CONFIG
+from database import DatabaseManager
+from database.db_manager import ARCHIVE_BATCH, ARCHIVE_HORIZON, ARCHIVE_PAUSE
+from database.import_pipeline import format_bulk_summary, format_import_report
+from database.tenants import DEFAULT_TENANT, validate_tenant_id
+from database.timezones import converter, is_valid_zone
+
+
+#fields of one exported meeting in json / csv output
+MEETING_FIELDS = ("meeting_id", "uid", "title", "description", "start_time",
+                  "end_time", "location", "participant_ids",
+                  "participant_names", "participant_emails")
+
+
+def write_records(records, fields, fmt, out=None):
+    """
+    Write rows as tab separated text, JSON lines (one object per row)
+    or CSV with a header
+
+    Returns:
+        None
+    """
+    out = out or sys.stdout
+    if fmt == "json":
+        for record in records:
+            out.write(json.dumps(dict(zip(fields, record)), default=str) + "\n")
+    elif fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(fields)
+        for record in records:
+            writer.writerow([";".join(map(str, value)) if isinstance(value, list) else value
+                             for value in record])
+    else:
+        for record in records:
+            out.write("\t".join("-" if value is None else str(value) for value in record) + "\n")
+
+
+def print_name_matches(names):
+    """
+    Print the participant names that were not matched exactly,
+    with their confidence
+
+    Returns:
+        None
+    """
+    for name, match in names.items():
+        if match["method"] == "exact":
+            continue
+        if match["person_id"] is None:
+            candidates = ", ".join(map(str, match["candidates"])) or "none"
+            print(f"    ? {name}: {match['method']} (candidates: {candidates})", file=sys.stderr)
+        else:
+            print(f"    ~ {name} -> person {match['person_id']} "
+                  f"({match['method']}, {match['confidence']:.2f})", file=sys.stderr)
+
+
+def print_file_progress(done, total, report):
+    """
+    Print the pipeline report of one imported file, with its
+    warnings and approximate name matches
+
+    Returns:
+        None
+    """
+    print(f"[{done}/{total}] {report['file']}: {format_import_report(report)}", file=sys.stderr)
+    for warning in report["warnings"]:
+        print(f"    #{warning['index'] + 1} {warning['title']}: {warning['message']}",
+              file=sys.stderr)
+    print_name_matches(report["names"])
+
+
+def run_import(db, args):
+    """
+    Import ics files, directories or glob patterns ("-" reads one
+    calendar from stdin) through the staged import pipeline: every file
+    is imported all or nothing, --dry-run only reports the problems
+
+    Returns:
+        int: process exit code (2 when some file has problems, 1 when
+             the import failed; the files committed before are listed)
+    """
+    paths = [path for path in args.paths if path != "-"]
+    summary = {"files": [], "dry_run": args.dry_run, "events": 0, "accepted": 0,
+               "imported": 0, "duplicates": 0, "failed_files": 0,
+               "elapsed": 0.0, "events_per_sec": 0.0}
+
+    if paths:
+        ok, result = db.bulk_import_files(
+            paths,
+            workers=args.workers,
+            progress=None if args.quiet else print_file_progress,
+            dry_run=args.dry_run
+        )
+        if not ok and not isinstance(result, dict):
+            print(result, file=sys.stderr)
+            return 1
+        summary = result
+
+    if len(paths) != len(args.paths) and not summary.get("error"):
+        ok, report = db.run_import_pipeline(sys.stdin.buffer.read(), "<stdin>", args.dry_run)
+        if not args.quiet:
+            print_file_progress(1, 1, report)
+        summary["files"].append(report)
+        for key in ("events", "accepted", "imported", "duplicates"):
+            summary[key] += report[key]
+        summary["failed_files"] += not ok
+
+    if args.format == "json":
+        print(json.dumps(summary, default=str))
+    else:
+        print(format_bulk_summary(summary))
+    if summary.get("error"):
+        return 1
+    return 2 if summary["failed_files"] else 0
+
+
+def run_export(db, args):
+    """
+    Write the meetings of an interval or of one person to stdout
+    (or a file) as ics, JSON lines or CSV, with times in --timezone
+    (the local zone by default)
+
+    Returns:
+        int: process exit code
+    """
+    if args.person is not None:
+        ok, meetings = db.get_meetings_for_person(args.person, args.start, args.end)
+    elif args.start and args.end:
+        ok, meetings = db.get_meetings_in_interval(args.start, args.end, args.mode,
+                                                   include_archived=args.include_archived)
+    else:
+        print("export needs --person or both --start and --end", file=sys.stderr)
+        return 1
+    if not ok:
+        print(meetings, file=sys.stderr)
+        return 1
+
+    if args.format == "ics":
+        data = db.meetings_to_ics(meetings, args.timezone)
+        if args.output:
+            with open(args.output, "wb") as f:
+                f.write(data)
+        else:
+            sys.stdout.buffer.write(data)
+    else:
+        zone = converter(args.timezone)
+        records = (
+            [zone.convert(value) if isinstance(value, datetime) else value
+             for value in (getattr(meeting, field) for field in MEETING_FIELDS)]
+            for meeting in meetings
+        )
+        if args.output:
+            with open(args.output, "w", newline="", encoding="utf-8") as f:
+                write_records(records, MEETING_FIELDS, args.format, f)
+        else:
+            write_records(records, MEETING_FIELDS, args.format)
+
+    print(f"Exported {len(meetings)} meetings", file=sys.stderr)
+    return 0
+
+
+def run_seed(db, args):
+    """
+    Fill the database with synthetic persons and meetings for load tests
+    Conflicting random meetings are rejected like any other write
+
+    Returns:
+        int: process exit code
+    """
+    rng = random.Random(args.seed)
+    tag = uuid.uuid4().hex[:8]
+
+    persons = [
+        (f"Seed {tag} {i}", f"seed-{tag}-{i}@example.com", None)
+        for i in range(args.persons)
+    ]
+    for offset in range(0, len(persons), args.batch):
+        db.write_batch(persons[offset:offset + args.batch], [])
+
+    ok, all_persons = db.get_all_persons()
+    if not ok:
+        print(all_persons, file=sys.stderr)
+        return 1
+    person_ids = [
+        person.person_id for person in all_persons
+        if person.email.startswith(f"seed-{tag}-")
+    ]
+    if not person_ids:
+        print("No seed persons created", file=sys.stderr)
+        return 1
+    if not args.quiet:
+        print(f"{len(person_ids)} persons created", file=sys.stderr)
+
+    first_day = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    created = rejected = 0
+    for offset in range(0, args.meetings, args.batch):
+        meetings = []
+        for i in range(offset, min(offset + args.batch, args.meetings)):
+            start = first_day + timedelta(
+                days=rng.randrange(args.days),
+                hours=rng.randrange(8, 18),
+                minutes=15 * rng.randrange(4)
+            )
+            participants = rng.sample(person_ids, min(len(person_ids), rng.randint(2, 5)))
+            meetings.append((
+                f"Seed meeting {i}", "synthetic load", start,
+                start + timedelta(minutes=rng.choice((30, 60, 90))),
+                f"Room {rng.randrange(20)}", participants
+            ))
+
+        person_results, meeting_results = db.write_batch([], meetings)
+        batch_created = sum(1 for ok, message in meeting_results if ok)
+        created += batch_created
+        rejected += len(meetings) - batch_created
+        if not args.quiet:
+            print(f"[{offset + len(meetings)}/{args.meetings}] {created} created, "
+                  f"{rejected} rejected", file=sys.stderr)
+
+    print(f"Seeded {len(person_ids)} persons and {created} meetings ({rejected} rejected)")
+    return 0
+
+
+def run_stats(db, args):
+    """
+    Print the overall counts of the database
+
+    Returns:
+        int: process exit code
+    """
+    ok, stats = db.get_stats()
+    if not ok:
+        print(stats, file=sys.stderr)
+        return 1
+
+    if args.format == "text":
+        for key, value in stats.items():
+            print(f"{key:15} {'-' if value is None else value}")
+    else:
+        write_records([list(stats.values())], list(stats), args.format)
+    return 0
+
+
+def run_sync_export(db, args):
+    """
+    Export the changes since a sync token, print the next token
+
+    Returns:
+        int: process exit code
+    """
+    ok, result = db.export_changes_since(args.token, args.file)
+    if not ok:
+        print(result, file=sys.stderr)
+        return 1
+
+    print(f"Exported {result['exported']} changed meetings", file=sys.stderr)
+    print(result["sync_token"])
+    return 0
+
+
+def run_sync_import(db, args):
+    """
+    Apply an incremental sync file
+
+    Returns:
+        int: process exit code
+    """
+    ok, report = db.import_changes_from_file(args.file)
+    if not ok:
+        print(report, file=sys.stderr)
+        return 1
+
+    for error in report["errors"]:
+        print(f"    {error}", file=sys.stderr)
+    print_name_matches(report["names"])
+    print(
+        f"{report['created']} created, {report['updated']} updated, "
+        f"{report['cancelled']} cancelled, {report['unchanged']} unchanged, "
+        f"{report['rejected']} rejected"
+    )
+    return 0 if not report["rejected"] else 2
+
+
+def run_feed(db, args):
+    """
+    Write the ICS feed of one person to a file or stdout
+
+    Returns:
+        int: process exit code
+    """
+    ok, feed = db.render_person_feed(args.person_id)
+    if not ok:
+        print(feed, file=sys.stderr)
+        return 1
+
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(feed)
+    else:
+        sys.stdout.buffer.write(feed)
+    return 0
+
+
+def run_snapshot(db, args):
+    """
+    Write a local snapshot file for offline reads, or bring an
+    existing one up to date with --refresh
+
+    Returns:
+        int: process exit code
+    """
+    if args.refresh:
+        ok, message = db.open_snapshot(args.file, offline=False)
+        if not ok:
+            print(message, file=sys.stderr)
+            return 1
+        ok, result = db.refresh_snapshot()
+    else:
+        ok, result = db.export_snapshot(args.file)
+    if not ok:
+        print(result, file=sys.stderr)
+        return 1
+
+    changed = f", {result['changed']} changed" if args.refresh else ""
+    print(f"{result['meetings']} meetings{changed}, sync token {result['sync_token']}")
+    return 0
+
+
+def run_set_timezone(db, args):
+    """
+    Set the time zone of a person's feed
+
+    Returns:
+        int: process exit code
+    """
+    ok, message = db.set_person_timezone(args.person_id, args.timezone)
+    print(message, file=sys.stdout if ok else sys.stderr)
+    return 0 if ok else 1
+
+
+def parse_timezone(value):
+    """
+    argparse type for IANA time zone names
+
+    Returns:
+        str
+    """
+    if not is_valid_zone(value):
+        raise argparse.ArgumentTypeError(f"unknown time zone: {value}")
+    return value
+
+
+def parse_tenant(value):
+    """
+    argparse type for tenant ids
+
+    Returns:
+        int
+    """
+    try:
+        return validate_tenant_id(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def parse_datetime(value):
+    """
+    argparse type for "YYYY-MM-DD" or "YYYY-MM-DD HH:MM" values
+
+    Returns:
+        datetime
+    """
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"invalid date: {value}")
+
+
+def run_init_db(db, args):
+    """
+    Create the tables (optionally with the time partitioned layout)
+
+    Returns:
+        int: process exit code
+    """
+    ok, message = db.create_tables(partitioned=args.partitioned)
+    print(message, file=sys.stdout if ok else sys.stderr)
+    if ok and args.partitioned and args.until:
+        ok, message = db.create_partitions(datetime.now(), args.until)
+        print(message, file=sys.stdout if ok else sys.stderr)
+    if ok and args.summaries:
+        ok, message = db.setup_load_summaries()
+        print(message, file=sys.stdout if ok else sys.stderr)
+    if ok and args.notify:
+        ok, message = db.setup_change_notifications()
+        print(message, file=sys.stdout if ok else sys.stderr)
+    if ok and args.row_security:
+        ok, message = db.setup_row_security()
+        print(message, file=sys.stdout if ok else sys.stderr)
+    if ok and args.archive:
+        ok, message = db.setup_archive()
+        print(message, file=sys.stdout if ok else sys.stderr)
+    return 0 if ok else 1
+
+
+def run_detach_partitions(db, args):
+    """
+    Detach the monthly partitions that end before a date
+
+    Returns:
+        int: process exit code
+    """
+    ok, detached = db.detach_partitions_before(args.before)
+    if not ok:
+        print(detached, file=sys.stderr)
+        return 1
+
+    for month in detached:
+        print(f"detached {month}")
+    return 0
+
+
+def run_archive(db, args):
+    """
+    Move past meetings into the archive table, in throttled batches
+
+    Returns:
+        int: process exit code
+    """
+    if args.before is not None:
+        cutoff = args.before
+    else:
+        cutoff = datetime.now() - timedelta(days=args.older_than)
+
+    def progress(archived):
+        if not args.quiet:
+            print(f"archived {archived} meetings", file=sys.stderr)
+
+    ok, report = db.archive_meetings_before(cutoff, args.batch, args.pause, progress)
+    if not ok:
+        print(report, file=sys.stderr)
+        return 1
+
+    print(f"Archived {report['archived']} meetings that ended before "
+          f"{report['cutoff']:%Y-%m-%d %H:%M %Z} in {report['batches']} batches")
+    return 0
+
+
+def run_explain_partitions(db, args):
+    """
+    Print the partitions scanned by the interval search and conflict
+    check; with --check fail when one scans partitions outside the range
+
+    Returns:
+        int: process exit code (2 when --check finds unpruned partitions)
+    """
+    if args.check:
+        ok, result = db.check_partition_pruning(args.start, args.end)
+        if not ok:
+            print(result, file=sys.stderr)
+            return 1
+        for query, outside in result.items():
+            print(f"{query}: {'pruned' if not outside else 'scans ' + ', '.join(outside)}")
+        return 2 if any(result.values()) else 0
+
+    ok, result = db.explain_partitions(args.start, args.end)
+    if not ok:
+        print(result, file=sys.stderr)
+        return 1
+
+    for query, scans in result.items():
+        print(f"{query}: {', '.join(scans['scanned'])}")
+    return 0
+
+
+def run_load(db, args):
+    """
+    Print the per day / per week load of persons or locations
+
+    Returns:
+        int: process exit code
+    """
+    if args.by == "person":
+        ok, rows = db.get_person_load(args.start, args.end, args.ids or None, args.period)
+    else:
+        ok, rows = db.get_location_load(args.start, args.end, args.ids or None, args.period)
+    if not ok:
+        print(rows, file=sys.stderr)
+        return 1
+
+    rows = [(key, period_start, meetings, round(busy_hours, 2))
+            for key, period_start, meetings, busy_hours in rows]
+    write_records(rows, (args.by, "period_start", "meetings", "busy_hours"), args.format)
+    return 0
+
+
+def run_add_room(db, args):
+    """
+    Add a bookable room
+
+    Returns:
+        int: process exit code
+    """
+    ok, message = db.add_room(args.name, args.capacity)
+    print(message, file=sys.stdout if ok else sys.stderr)
+    return 0 if ok else 1
+
+
+def run_free_rooms(db, args):
+    """
+    Print the rooms free for a whole time slot
+
+    Returns:
+        int: process exit code
+    """
+    ok, rooms = db.find_free_rooms(args.start, args.end, args.min_capacity)
+    if not ok:
+        print(rooms, file=sys.stderr)
+        return 1
+
+    write_records(rooms, ("room_id", "name", "capacity"), args.format)
+    return 0
+
+
+def build_parser():
+    """
+    Build the argument parser of the command line tool
+
+    Returns:
+        argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog="meeting-scheduler",
+        description="Meeting Scheduler command line tool"
+    )
+    parser.add_argument(
+        "--tenant",
+        type=parse_tenant,
+        default=DEFAULT_TENANT,
+        help=f"tenant whose data is read and written (default: {DEFAULT_TENANT})"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser(
+        "import",
+        help="import meetings from ics files, directories or glob patterns"
+    )
+    import_parser.add_argument("paths", nargs="+", help='files, directories, globs or "-" for stdin')
+    import_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="number of parser processes (default: cpu count)"
+    )
+    import_parser.add_argument("--format", choices=["text", "json"], default="text")
+    import_parser.add_argument("-q", "--quiet", action="store_true", help="no per file progress")
+    import_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="report every problem of each file without writing anything"
+    )
+    import_parser.set_defaults(handler=run_import)
+
+    export_parser = subparsers.add_parser(
+        "export",
+        help="export the meetings of an interval or of one person"
+    )
+    export_parser.add_argument("--start", type=parse_datetime, default=None)
+    export_parser.add_argument("--end", type=parse_datetime, default=None)
+    export_parser.add_argument(
+        "--mode",
+        choices=["contained", "overlapping", "starts_within"],
+        default="contained"
+    )
+    export_parser.add_argument(
+        "--include-archived",
+        action="store_true",
+        help="with --start/--end, also export archived meetings"
+    )
+    export_parser.add_argument("--person", type=int, default=None)
+    export_parser.add_argument("--format", choices=["ics", "json", "csv"], default="ics")
+    export_parser.add_argument("--timezone", type=parse_timezone, default=None,
+                               help="IANA zone of the written times (default: local)")
+    export_parser.add_argument("-o", "--output", default=None, help="file (default: stdout)")
+    export_parser.set_defaults(handler=run_export)
+
+    seed_parser = subparsers.add_parser(
+        "seed",
+        help="create synthetic persons and meetings"
+    )
+    seed_parser.add_argument("--persons", type=int, default=100)
+    seed_parser.add_argument("--meetings", type=int, default=1000)
+    seed_parser.add_argument("--days", type=int, default=30, help="spread meetings over N days")
+    seed_parser.add_argument("--batch", type=int, default=200, help="items per commit")
+    seed_parser.add_argument("--seed", type=int, default=None, help="random seed")
+    seed_parser.add_argument("-q", "--quiet", action="store_true", help="no progress")
+    seed_parser.set_defaults(handler=run_seed)
+
+    stats_parser = subparsers.add_parser(
+        "stats",
+        help="print overall database counts"
+    )
+    stats_parser.add_argument("--format", choices=["text", "json", "csv"], default="text")
+    stats_parser.set_defaults(handler=run_stats)
+
+    sync_export_parser = subparsers.add_parser(
+        "sync-export",
+        help="export meetings changed since a sync token, print the new token"
+    )
+    sync_export_parser.add_argument("file")
+    sync_export_parser.add_argument("--token", default=None)
+    sync_export_parser.set_defaults(handler=run_sync_export)
+
+    sync_import_parser = subparsers.add_parser(
+        "sync-import",
+        help="apply an incremental sync file"
+    )
+    sync_import_parser.add_argument("file")
+    sync_import_parser.set_defaults(handler=run_sync_import)
+
+    feed_parser = subparsers.add_parser(
+        "feed",
+        help="write the ICS feed of one person"
+    )
+    feed_parser.add_argument("person_id", type=int)
+    feed_parser.add_argument("-o", "--output", default=None)
+    feed_parser.set_defaults(handler=run_feed)
+
+    init_parser = subparsers.add_parser(
+        "init-db",
+        help="create the database tables"
+    )
+    init_parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="use monthly range partitions on a new database"
+    )
+    init_parser.add_argument(
+        "--until",
+        type=parse_datetime,
+        default=None,
+        help="with --partitioned, pre-create partitions up to this date"
+    )
+    init_parser.add_argument(
+        "--summaries",
+        action="store_true",
+        help="install the trigger maintained daily load summaries"
+    )
+    init_parser.add_argument(
+        "--notify",
+        action="store_true",
+        help="install the NOTIFY triggers used for live refresh of open views"
+    )
+    init_parser.add_argument(
+        "--row-security",
+        action="store_true",
+        help="install the row level security policies isolating tenants"
+    )
+    init_parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="install the archive table of past meetings"
+    )
+    init_parser.set_defaults(handler=run_init_db)
+
+    detach_parser = subparsers.add_parser(
+        "detach-partitions",
+        help="archive the monthly partitions that end before a date"
+    )
+    detach_parser.add_argument("--before", type=parse_datetime, required=True)
+    detach_parser.set_defaults(handler=run_detach_partitions)
+
+    archive_parser = subparsers.add_parser(
+        "archive",
+        help="move past meetings out of the hot tables into the archive"
+    )
+    archive_when = archive_parser.add_mutually_exclusive_group()
+    archive_when.add_argument("--before", type=parse_datetime, default=None)
+    archive_when.add_argument(
+        "--older-than",
+        type=int,
+        default=ARCHIVE_HORIZON.days,
+        help=f"archive meetings that ended more than N days ago (default: {ARCHIVE_HORIZON.days})"
+    )
+    archive_parser.add_argument("--batch", type=int, default=ARCHIVE_BATCH, help="meetings per transaction")
+    archive_parser.add_argument(
+        "--pause",
+        type=float,
+        default=ARCHIVE_PAUSE,
+        help="seconds to sleep between batches"
+    )
+    archive_parser.add_argument("-q", "--quiet", action="store_true", help="no progress")
+    archive_parser.set_defaults(handler=run_archive)
+
+    explain_parser = subparsers.add_parser(
+        "explain-partitions",
+        help="show the partitions scanned for a time range"
+    )
+    explain_parser.add_argument("start", type=parse_datetime)
+    explain_parser.add_argument("end", type=parse_datetime)
+    explain_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="fail when a query scans partitions outside the range"
+    )
+    explain_parser.set_defaults(handler=run_explain_partitions)
+
+    load_parser = subparsers.add_parser(
+        "load",
+        help="meetings and busy hours per person or location"
+    )
+    load_parser.add_argument("start", type=parse_datetime)
+    load_parser.add_argument("end", type=parse_datetime)
+    load_parser.add_argument("--by", choices=["person", "location"], default="person")
+    load_parser.add_argument("--period", choices=["day", "week"], default="day")
+    load_parser.add_argument(
+        "--ids",
+        nargs="*",
+        default=None,
+        help="person ids or location names to include (default: all)"
+    )
+    load_parser.add_argument("--format", choices=["text", "json", "csv"], default="text")
+    load_parser.set_defaults(handler=run_load)
+
+    add_room_parser = subparsers.add_parser(
+        "add-room",
+        help="add a bookable room"
+    )
+    add_room_parser.add_argument("name")
+    add_room_parser.add_argument("--capacity", type=int, default=None)
+    add_room_parser.set_defaults(handler=run_add_room)
+
+    free_rooms_parser = subparsers.add_parser(
+        "free-rooms",
+        help="list the rooms free for a time slot"
+    )
+    free_rooms_parser.add_argument("start", type=parse_datetime)
+    free_rooms_parser.add_argument("end", type=parse_datetime)
+    free_rooms_parser.add_argument("--min-capacity", type=int, default=None)
+    free_rooms_parser.add_argument("--format", choices=["text", "json", "csv"], default="text")
+    free_rooms_parser.set_defaults(handler=run_free_rooms)
+
+    snapshot_parser = subparsers.add_parser(
+        "snapshot",
+        help="write a local snapshot file for offline reads"
+    )
+    snapshot_parser.add_argument("file")
+    snapshot_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="update an existing snapshot with the changes since it was written"
+    )
+    snapshot_parser.set_defaults(handler=run_snapshot)
+
+    set_timezone_parser = subparsers.add_parser(
+        "set-timezone",
+        help="set the time zone of a person's feed"
+    )
+    set_timezone_parser.add_argument("person_id", type=int)
+    set_timezone_parser.add_argument(
+        "timezone", nargs="?", type=parse_timezone, default=None,
+        help="IANA zone name, omit to use the local zone"
+    )
+    set_timezone_parser.set_defaults(handler=run_set_timezone)
+
+    return parser
+
+
+def main(argv=None):
+    """
+    Entry point of the command line tool
+
+    Returns:
+        int: process exit code
+    """
+    args = build_parser().parse_args(argv)
+
+    db = DatabaseManager(tenant_id=args.tenant)
+    success, message = db.connect(**DEFAULT_CONFIG)
+    if not success:
+        print(message, file=sys.stderr)
+        return 1
+
+    try:
+        return args.handler(db, args)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
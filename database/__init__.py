@@ -1,3 +1,5 @@
 from .db_manager import DatabaseManager
+from .models import Meeting, Person
+from .write_batcher import WriteBatcher
 
-__all__ = ['DatabaseManager']
\ No newline at end of file
+__all__ = ['DatabaseManager', 'Meeting', 'Person', 'WriteBatcher']
@@ -0,0 +1,45 @@
+--Archive of past meetings, filled by DatabaseManager.archive_meetings_before()
+--Installed on demand with DatabaseManager.setup_archive()
+--Archived meetings leave meetings / meeting_participants, so conflict checks
+--and interval searches only scan the hot working set; searches reach the
+--archive with get_meetings_in_interval(..., include_archived=True)
+--One row per meeting, its participants kept as an array of person_ids
+--(persons deleted later drop out of the archived meeting, as they would
+--from a live one)
+
+CREATE TABLE IF NOT EXISTS meetings_archive (
+    meeting_id INTEGER PRIMARY KEY,
+    tenant_id INTEGER NOT NULL DEFAULT current_tenant(),
+    uid VARCHAR(255),
+    sequence INTEGER NOT NULL DEFAULT 0,
+    title VARCHAR(200) NOT NULL,
+    description TEXT,
+    start_time TIMESTAMPTZ NOT NULL,
+    end_time TIMESTAMPTZ NOT NULL,
+    location VARCHAR(200),
+    room_id INTEGER,
+    participant_ids INTEGER[] NOT NULL,
+    created_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL,
+    deleted_at TIMESTAMPTZ,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+--Archived searches: the same per tenant start_time / range indexes as meetings
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+CREATE INDEX IF NOT EXISTS idx_meetings_archive_tenant_start_time
+    ON meetings_archive (tenant_id, start_time);
+CREATE INDEX IF NOT EXISTS idx_meetings_archive_tenant_period
+    ON meetings_archive USING gist (tenant_id, tstzrange(start_time, end_time));
+
+--archives installed after row_security.sql get the same tenant policy
+DO $$
+BEGIN
+    IF (SELECT relrowsecurity FROM pg_class WHERE oid = 'meetings'::regclass) THEN
+        ALTER TABLE meetings_archive ENABLE ROW LEVEL SECURITY;
+        DROP POLICY IF EXISTS tenant_isolation ON meetings_archive;
+        CREATE POLICY tenant_isolation ON meetings_archive
+            USING (tenant_id = current_tenant())
+            WITH CHECK (tenant_id = current_tenant());
+    END IF;
+END $$;
@@ -0,0 +1,123 @@
+import json
+import select
+import threading
+from datetime import datetime
+
+import psycopg2
+from psycopg2 import Error
+
+#prefix of the NOTIFY channels written by the triggers of notify.sql
+#(one channel per tenant, see tenant_channel)
+CHANNEL = "meeting_changes"
+#how long one wait for notifications blocks, bounds the stop() delay (seconds)
+POLL_TIMEOUT = 1.0
+#wait before reconnecting after the listening connection failed (seconds)
+RECONNECT_DELAY = 5.0
+
+
+def tenant_channel(tenant_id):
+    """
+    NOTIFY channel of one tenant's meeting changes
+
+    Returns:
+        str
+    """
+    return f"{CHANNEL}_{int(tenant_id)}"
+
+
+class ChangeListener:
+    """
+    Background thread that LISTENs for meeting changes
+
+    Every batch of notifications is handed to on_change as a dict
+    meeting_id -> (start_time, end_time); after a reconnect on_change(None)
+    is called once, since notifications sent meanwhile were lost
+
+    on_change runs on the listener thread, so it must only hand the data
+    over (e.g. to a queue) and not touch Tk widgets or the db cursor
+    """
+
+    def __init__(self, config, on_change, channel=tenant_channel(0)):
+        """
+        Initialize a stopped listener
+
+        Args:
+            config: psycopg2.connect keyword arguments of the primary
+
+        Returns:
+            None
+        """
+        self.config = config
+        self.on_change = on_change
+        self.channel = channel
+        self.connection = None
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """
+        Start listening in a daemon thread
+
+        Returns:
+            None
+        """
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self._run, name="change-listener", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Stop the thread and close its connection
+
+        Returns:
+            None
+        """
+        self.stopped.set()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self):
+        connected_before = False
+        while not self.stopped.is_set():
+            try:
+                self.connection = psycopg2.connect(connect_timeout=10, **self.config)
+                self.connection.autocommit = True
+                self.connection.cursor().execute(f"LISTEN {self.channel};")
+
+                if connected_before:
+                    self.on_change(None)
+                connected_before = True
+
+                while not self.stopped.is_set():
+                    ready, _, _ = select.select([self.connection], [], [], POLL_TIMEOUT)
+                    if not ready:
+                        continue
+
+                    self.connection.poll()
+                    changes = {}
+                    while self.connection.notifies:
+                        notify = self.connection.notifies.pop(0)
+                        try:
+                            payload = json.loads(notify.payload)
+                            changes[payload["meeting_id"]] = (
+                                datetime.fromisoformat(payload["start"]),
+                                datetime.fromisoformat(payload["end"]),
+                            )
+                        except (ValueError, KeyError, TypeError):
+                            continue
+                    if changes:
+                        self.on_change(changes)
+
+            except (Error, OSError):
+                self.stopped.wait(RECONNECT_DELAY)
+            finally:
+                self._close()
+
+    def _close(self):
+        try:
+            if self.connection:
+                self.connection.close()
+        except Error:
+            pass
+        self.connection = None
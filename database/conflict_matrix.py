@@ -0,0 +1,129 @@
+from datetime import datetime, timezone
+from importlib.util import find_spec
+
+#batch conflict checks need the optional numpy dependency; it is only
+#imported on first use so importing the database package stays fast
+HAS_NUMPY = find_spec("numpy") is not None
+
+#aware timestamps are converted to minutes since this moment
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+#key stride between two persons in the flat interval arrays, larger than
+#any epoch minute so the intervals of one person never mix with the next
+PERSON_STRIDE = 1 << 40
+
+
+def to_minutes(value, ceil=False):
+    """
+    Minutes since EPOCH of an aware datetime, rounded down (or up)
+
+    Returns:
+        int
+    """
+    seconds = (value - EPOCH).total_seconds()
+    minutes = int(seconds // 60)
+    if ceil and minutes * 60 < seconds:
+        minutes += 1
+    return minutes
+
+
+class ConflictMatrix:
+    """
+    Result of a batch conflict check
+
+    matrix[i, j] is True when candidate i conflicts with an existing
+    meeting of person_ids[j] (only persons taking part in candidate i
+    can be True)
+    """
+
+    def __init__(self, person_ids, matrix):
+        self.person_ids = person_ids
+        self.matrix = matrix
+
+    def any(self):
+        """
+        Per candidate flag: True if at least one participant is busy
+
+        Returns:
+            numpy.ndarray of bool
+        """
+        return self.matrix.any(axis=1)
+
+    def conflicting(self):
+        """
+        Candidates with conflicts and the busy persons of each
+
+        Returns:
+            list of (candidate_index, [person_id,...])
+        """
+        import numpy as np
+
+        rows, cols = np.nonzero(self.matrix)
+        result = {}
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            result.setdefault(row, []).append(self.person_ids[col])
+        return sorted(result.items())
+
+
+def build_conflict_matrix(candidates, busy):
+    """
+    Test every candidate against the busy intervals of its participants
+
+    The intervals of all persons are flattened into one array sorted by
+    (person, start) with the person folded into the key; a running max of
+    the end keys answers "does any interval starting before the candidate
+    ends finish after it starts" with a single searchsorted per
+    (candidate, participant) pair
+
+    Args:
+        candidates: list of (participant_ids, start_time, end_time)
+        busy: dict person_id -> list of (start_time, end_time)
+
+    Returns:
+        ConflictMatrix
+    """
+    import numpy as np
+
+    person_ids = sorted({pid for ids, start, end in candidates for pid in ids})
+    rank = {pid: i for i, pid in enumerate(person_ids)}
+
+    #flat busy intervals, keyed by person rank
+    starts, ends = [], []
+    for pid in person_ids:
+        base = rank[pid] * PERSON_STRIDE
+        for start, end in busy.get(pid, []):
+            starts.append(base + to_minutes(start))
+            ends.append(base + to_minutes(end, ceil=True))
+
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    order = np.argsort(starts, kind="stable")
+    starts = starts[order]
+    max_ends = np.maximum.accumulate(ends[order]) if len(ends) else ends
+
+    #one row per (candidate, participant) pair
+    pair_candidate, pair_person, pair_start, pair_end = [], [], [], []
+    for index, (ids, start, end) in enumerate(candidates):
+        start, end = to_minutes(start), to_minutes(end, ceil=True)
+        for pid in set(ids):
+            pair_candidate.append(index)
+            pair_person.append(rank[pid])
+            pair_start.append(start)
+            pair_end.append(end)
+
+    pair_candidate = np.asarray(pair_candidate, dtype=np.int64)
+    pair_person = np.asarray(pair_person, dtype=np.int64)
+    base = pair_person * PERSON_STRIDE
+    pair_start = base + np.asarray(pair_start, dtype=np.int64)
+    pair_end = base + np.asarray(pair_end, dtype=np.int64)
+
+    matrix = np.zeros((len(candidates), len(person_ids)), dtype=bool)
+    if len(starts) and len(pair_candidate):
+        #intervals [0, idx) start before the candidate ends; the ones of
+        #earlier persons have smaller keys so they never pass the test
+        idx = np.searchsorted(starts, pair_end, side="left")
+        has_before = idx > 0
+        busy_pair = np.zeros(len(idx), dtype=bool)
+        busy_pair[has_before] = max_ends[idx[has_before] - 1] > pair_start[has_before]
+        matrix[pair_candidate[busy_pair], pair_person[busy_pair]] = True
+
+    return ConflictMatrix(person_ids, matrix)
@@ -1,10 +1,127 @@
+import glob
 import os
-import uuid
-from datetime import datetime
+import queue
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta
 
 import psycopg2
-from icalendar import Calendar, Event
-from psycopg2 import Error, OperationalError
+from psycopg2 import Error, InterfaceError, OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extras import execute_values
+
+from .change_listener import ChangeListener, tenant_channel
+from .conflict_matrix import HAS_NUMPY, build_conflict_matrix
+from .feeds import FeedCache, assemble_feed
+from .fingerprint import meeting_fingerprint, new_uid
+from .ics_parser import (add_timezones, build_event, extract_participants,
+                         new_calendar, parse_events, parse_ics_file,
+                         remove_participants_description, vtimezone)
+from .import_pipeline import (StageClock, file_overlaps, format_import_report,
+                              import_problem, new_import_report)
+from .interval_cache import IntervalCache
+from .models import Meeting, Person
+from .name_resolver import NameIndex, pick_trigram_match
+from .replicas import ReplicaSet
+from .snapshot import CalendarSnapshot, write_snapshot
+from .tenants import DEFAULT_TENANT, session_options, validate_tenant_id
+from .timezones import UTC, is_valid_zone, local_zone_name, to_aware, to_utc
+from .transactions import (MAX_ATTEMPTS, CommitUnknownError, TransactionMetrics,
+                           backoff_delay, retry_reason)
+
+#re-export changes of the last minute on every sync, so rows written by
+#transactions that committed after the previous token are not missed
+#(imports are idempotent on UID + SEQUENCE)
+SYNC_OVERLAP = timedelta(seconds=60)
+
+#longest meeting allowed by the partitioned schema (check_length), used to
+#bound overlap searches on start_time so they prune partitions
+MAX_MEETING_LENGTH = timedelta(days=31)
+
+#search modes of get_meetings_in_interval
+INTERVAL_MODES = ("contained", "overlapping", "starts_within")
+
+#suffix of the monthly partitions (see _partition_names)
+PARTITION_NAME = re.compile(r"_p(\d{4})(\d{2})$")
+
+#archive_meetings_before defaults: meetings that ended more than
+#ARCHIVE_HORIZON ago leave the hot tables ARCHIVE_BATCH at a time, with
+#ARCHIVE_PAUSE seconds between batches so concurrent writers keep going
+ARCHIVE_HORIZON = timedelta(days=365)
+ARCHIVE_BATCH = 500
+ARCHIVE_PAUSE = 0.1
+
+
+#SQLSTATE of an exclusion constraint violation (room double booking)
+EXCLUSION_VIOLATION = "23P01"
+#SQLSTATE of a unique index violation (uid already stored)
+UNIQUE_VIOLATION = "23505"
+
+#first key of the transaction advisory locks taken per participant / room
+PERSON_LOCK_SPACE = 1
+ROOM_LOCK_SPACE = 2
+
+#join between meetings m and meeting_participants mp for each layout
+#(the partitioned layout also joins on the partition key)
+MP_JOIN = "m.meeting_id = mp.meeting_id"
+MP_JOIN_PARTITIONED = "m.meeting_id = mp.meeting_id AND m.start_time = mp.start_time"
+
+#meeting rows returned by the query methods:
+#(meeting_id, uid, title, description, start_time, end_time, location,
+# participant_ids, participant_names, participant_emails)
+MEETING_SELECT = """
+    SELECT m.meeting_id, m.uid, m.title, m.description,
+           m.start_time, m.end_time, m.location,
+           ARRAY_AGG(p.person_id ORDER BY p.name, p.person_id),
+           ARRAY_AGG(p.name ORDER BY p.name, p.person_id),
+           ARRAY_AGG(p.email ORDER BY p.name, p.person_id)
+    FROM meetings m
+        JOIN meeting_participants mp ON {mp_join}
+        JOIN persons p ON mp.person_id = p.person_id
+"""
+
+
+def partition_overlaps(name,lower,upper):
+    """
+    Whether a monthly partition (meetings_pYYYYMM or
+    meeting_participants_pYYYYMM, UTC months) may hold start times in
+    [lower, upper); True for any other relation
+
+    Returns:
+        bool
+    """
+    match=PARTITION_NAME.search(name)
+    if not match:
+        return True
+    year,month=int(match.group(1)),int(match.group(2))
+    first=datetime(year,month,1,tzinfo=UTC)
+    following=datetime(year+1,1,1,tzinfo=UTC) if month==12 else datetime(year,month+1,1,tzinfo=UTC)
+    return first<to_aware(upper) and following>to_aware(lower)
+
+
+def expand_ics_paths(paths):
+    """
+    Expand files, directories and glob patterns into a sorted list
+    of unique .ics file paths (directories are searched recursively)
+
+    Returns:
+        list[str]
+    """
+    files=set()
+    for path in paths:
+        if os.path.isdir(path):
+            matches=glob.glob(os.path.join(path,"**","*.ics"),recursive=True)
+        elif glob.has_magic(path):
+            matches=glob.glob(path,recursive=True)
+        else:
+            matches=[path]
+
+        for match in matches:
+            if match.lower().endswith(".ics") and os.path.isfile(match):
+                files.add(os.path.abspath(match))
+
+    return sorted(files)
 
 
 class DatabaseManager:
@@ -13,21 +130,70 @@ class DatabaseManager:
     Handles import/export of meetings
     """
 
-    def __init__(self):
+    def __init__(self, participant_locks=True, serializable_scheduling=False,
+                 tenant_id=DEFAULT_TENANT):
         """
         Initialize database manager
 
+        Every session of the manager belongs to tenant_id: its queries only
+        see that tenant's persons, rooms and meetings (current_tenant() in
+        SQL) and the rows it writes get that tenant
+
+        With participant_locks every write that checks conflicts first
+        takes a transaction advisory lock per participant (and room), so
+        concurrent clients cannot double book the same person while
+        meetings with disjoint participants still run in parallel
+
+        With serializable_scheduling add_meeting and write_batch run at
+        SERIALIZABLE isolation; serialization failures are retried by
+        _run_transaction
+
         Returns:
             None
         """
+        self.tenant_id = validate_tenant_id(tenant_id)
+        self.participant_locks = participant_locks
+        self.serializable_scheduling = serializable_scheduling
+        self.tx_metrics = TransactionMetrics()
         self.connection = None
         self.cursor = None
         self.is_connected = False
-
-    def connect(self, host, database, user, password, port="5432"):
+        self.feed_cache = FeedCache()
+        #interval search results, only used while the change listener
+        #runs and the NOTIFY triggers are installed (other clients'
+        #writes invalidate it through notifications)
+        self.interval_cache = IntervalCache()
+        self.partitioned = False
+        self.mp_join = MP_JOIN
+        #range type over (start_time, end_time) of the meetings columns
+        self.range_type = "tstzrange"
+        #pg_trgm installed: unresolved import names get a similarity search
+        self.has_trgm = False
+        #meetings_archive installed (see setup_archive)
+        self.has_archive = False
+        #NOTIFY triggers of notify.sql installed (see setup_change_notifications)
+        self.has_notify = False
+        #months (year, month) whose partitions are known to exist
+        self.partitions = set()
+        self.replica_set = ReplicaSet()
+        #primary connection parameters, reused by the change listener
+        self.connect_params = None
+        self.change_listener = None
+        self.change_queue = queue.Queue()
+        #mapped local snapshot (see open_snapshot); with offline set,
+        #interval searches and conflict checks are answered from it
+        self.snapshot = None
+        self.offline = False
+
+    def connect(self, host, database, user, password, port="5432",
+                replicas=None, max_replica_lag=5.0):
         """
         Connect to database
 
+        Optional read replicas (list of dicts with host/database/user/
+        password/port) serve the read-only queries; writes, conflict checks
+        and imports always use the primary connection
+
         Returns:
             (bool, str): success flag and message
         """
@@ -36,14 +202,12 @@ class DatabaseManager:
             if self.connection:
                 self.close()
 
-            self.connection = psycopg2.connect(
-                host=host,
-                database=database,
-                user=user,
-                password=password,
-                port=port,
-                connect_timeout=10
+            #sessions run in UTC as this manager's tenant (see tenants.session_options)
+            self.connect_params = dict(
+                host=host, database=database, user=user, password=password, port=port,
+                options=session_options(self.tenant_id)
             )
+            self.connection = psycopg2.connect(connect_timeout=10, **self.connect_params)
 
             self.connection.autocommit = False
             self.cursor = self.connection.cursor()
@@ -52,7 +216,16 @@ class DatabaseManager:
             self.cursor.execute("SELECT version();")
             version = self.cursor.fetchone()[0]
 
-            return True, f"Connection established with {version}"
+            self._detect_layout()
+
+            self.replica_set.close()
+            self.replica_set = ReplicaSet(replicas, max_lag=max_replica_lag,
+                                          options=session_options(self.tenant_id))
+            replica_messages = self.replica_set.connect()
+
+            return True, "\n".join(
+                [f"Connection established with {version}"] + replica_messages
+            )
 
         except (OperationalError, Error) as e:
             self.is_connected = False
@@ -62,9 +235,11 @@ class DatabaseManager:
             self.is_connected = False
             return False, f"Unexpected error: {e}"
 
-    def create_tables(self):
+    def create_tables(self, partitioned=False):
         """
         Create database tables using schema.sql or fallback SQL
+        With partitioned=True a new database gets the time partitioned
+        layout of schema_partitioned.sql instead
 
         Return: tuple (bool, str):
             - True and success message if tables created
@@ -74,17 +249,34 @@ class DatabaseManager:
             return False, "No active database connection"
 
         try:
+            #zone of the naive times written before the TIMESTAMPTZ migration
+            self.cursor.execute(
+                "SELECT set_config('meeting_scheduler.local_timezone', %s, true);",
+                (local_zone_name(),)
+            )
+
             schema_path = os.path.join(
                 os.path.dirname(__file__),
-                "schema.sql"
+                "schema_partitioned.sql" if partitioned else "schema.sql"
             )
 
             if os.path.exists(schema_path):
                 with open(schema_path, "r") as f:
                     self.cursor.execute(f.read())
+            elif partitioned:
+                return False, "schema_partitioned.sql not found"
             else:
                 self._create_tables_manual()
 
+            self._detect_layout()
+            self._backfill_meeting_keys()
+
+            #summary functions of an older install take TIMESTAMP arguments
+            self.cursor.execute("SELECT to_regclass('person_daily_load') IS NOT NULL;")
+            if self.cursor.fetchone()[0]:
+                with open(os.path.join(os.path.dirname(__file__), "summaries.sql")) as f:
+                    self.cursor.execute(f.read())
+
             self.connection.commit()
             return True, "Tables created successfully"
 
@@ -105,10 +297,14 @@ class DatabaseManager:
             CREATE TABLE IF NOT EXISTS persons (
                 person_id SERIAL PRIMARY KEY,
                 name VARCHAR(100) NOT NULL,
-                email VARCHAR(100) UNIQUE NOT NULL,
+                email VARCHAR(100) NOT NULL,
                 phone VARCHAR(20),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
             );
+            ALTER TABLE persons ADD COLUMN IF NOT EXISTS timezone VARCHAR(64);
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            CREATE INDEX IF NOT EXISTS idx_persons_name_trgm
+                ON persons USING gin (LOWER(name) gin_trgm_ops);
         """)
 
         self.cursor.execute("""
@@ -116,14 +312,116 @@ class DatabaseManager:
                 meeting_id SERIAL PRIMARY KEY,
                 title VARCHAR(200) NOT NULL,
                 description TEXT,
-                start_time TIMESTAMP NOT NULL,
-                end_time TIMESTAMP NOT NULL,
+                start_time TIMESTAMPTZ NOT NULL,
+                end_time TIMESTAMPTZ NOT NULL,
                 location VARCHAR(200),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
                 CONSTRAINT check_times CHECK (end_time > start_time)
             );
         """)
 
+        self.cursor.execute("""
+            CREATE OR REPLACE FUNCTION current_tenant()
+            RETURNS INTEGER AS $$
+                SELECT COALESCE(NULLIF(current_setting('meeting_scheduler.tenant_id', true), ''),
+                                '0')::INTEGER;
+            $$ LANGUAGE sql STABLE;
+            ALTER TABLE persons ADD COLUMN IF NOT EXISTS tenant_id INTEGER NOT NULL DEFAULT 0;
+            ALTER TABLE persons ALTER COLUMN tenant_id SET DEFAULT current_tenant();
+            ALTER TABLE meetings ADD COLUMN IF NOT EXISTS tenant_id INTEGER NOT NULL DEFAULT 0;
+            ALTER TABLE meetings ALTER COLUMN tenant_id SET DEFAULT current_tenant();
+            ALTER TABLE persons DROP CONSTRAINT IF EXISTS persons_email_key;
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_persons_tenant_email
+                ON persons (tenant_id, email);
+        """)
+
+        self.cursor.execute("""
+            ALTER TABLE meetings ADD COLUMN IF NOT EXISTS fingerprint CHAR(64);
+            DROP INDEX IF EXISTS idx_meetings_fingerprint;
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_meetings_tenant_fingerprint
+                ON meetings (tenant_id, fingerprint);
+        """)
+
+        self.cursor.execute("""
+            ALTER TABLE meetings ADD COLUMN IF NOT EXISTS uid VARCHAR(255);
+            ALTER TABLE meetings ADD COLUMN IF NOT EXISTS sequence INTEGER NOT NULL DEFAULT 0;
+            ALTER TABLE meetings ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL
+                DEFAULT CURRENT_TIMESTAMP;
+            ALTER TABLE meetings ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ;
+            DROP INDEX IF EXISTS idx_meetings_uid;
+            DROP INDEX IF EXISTS idx_meetings_updated_at;
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_meetings_tenant_uid
+                ON meetings (tenant_id, uid);
+            CREATE INDEX IF NOT EXISTS idx_meetings_tenant_updated_at
+                ON meetings (tenant_id, updated_at);
+        """)
+
+        self.cursor.execute("""
+            DO $$
+            DECLARE
+                zone TEXT := COALESCE(
+                    NULLIF(current_setting('meeting_scheduler.local_timezone', true), ''),
+                    current_setting('TimeZone')
+                );
+            BEGIN
+                IF EXISTS (SELECT 1 FROM information_schema.columns
+                           WHERE table_schema = current_schema() AND table_name = 'meetings'
+                             AND column_name = 'start_time'
+                             AND data_type = 'timestamp without time zone')
+                   AND (SELECT relkind FROM pg_class WHERE oid = 'meetings'::regclass) = 'r' THEN
+                    ALTER TABLE meetings DROP CONSTRAINT IF EXISTS meetings_room_no_overlap;
+                    DROP INDEX IF EXISTS idx_meetings_period;
+                    DROP TRIGGER IF EXISTS meetings_load_after_write ON meetings;
+                    EXECUTE format(
+                        'ALTER TABLE meetings
+                            ALTER COLUMN start_time TYPE TIMESTAMPTZ USING start_time AT TIME ZONE %1$L,
+                            ALTER COLUMN end_time TYPE TIMESTAMPTZ USING end_time AT TIME ZONE %1$L,
+                            ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE %1$L,
+                            ALTER COLUMN updated_at TYPE TIMESTAMPTZ USING updated_at AT TIME ZONE %1$L,
+                            ALTER COLUMN deleted_at TYPE TIMESTAMPTZ USING deleted_at AT TIME ZONE %1$L;
+                         ALTER TABLE persons
+                            ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE %1$L;',
+                        zone
+                    );
+                    UPDATE meetings SET fingerprint = NULL;
+                END IF;
+            END $$;
+        """)
+
+        self.cursor.execute("""
+            CREATE EXTENSION IF NOT EXISTS btree_gist;
+            DROP INDEX IF EXISTS idx_meetings_start_time;
+            DROP INDEX IF EXISTS idx_meetings_period;
+            CREATE INDEX IF NOT EXISTS idx_meetings_tenant_start_time
+                ON meetings (tenant_id, start_time);
+            CREATE INDEX IF NOT EXISTS idx_meetings_tenant_period
+                ON meetings USING gist (tenant_id, tstzrange(start_time, end_time));
+        """)
+
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS rooms (
+                room_id SERIAL PRIMARY KEY,
+                name VARCHAR(200) NOT NULL,
+                capacity INTEGER,
+                CONSTRAINT check_capacity CHECK (capacity > 0)
+            );
+            ALTER TABLE rooms ADD COLUMN IF NOT EXISTS tenant_id INTEGER NOT NULL DEFAULT 0;
+            ALTER TABLE rooms ALTER COLUMN tenant_id SET DEFAULT current_tenant();
+            ALTER TABLE rooms DROP CONSTRAINT IF EXISTS rooms_name_key;
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_rooms_tenant_name ON rooms (tenant_id, name);
+            ALTER TABLE meetings ADD COLUMN IF NOT EXISTS room_id INTEGER
+                REFERENCES rooms(room_id);
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_constraint
+                               WHERE conname = 'meetings_room_no_overlap') THEN
+                    ALTER TABLE meetings ADD CONSTRAINT meetings_room_no_overlap
+                        EXCLUDE USING gist (room_id WITH =, tstzrange(start_time, end_time) WITH &&)
+                        WHERE (deleted_at IS NULL AND room_id IS NOT NULL);
+                END IF;
+            END $$;
+        """)
+
         self.cursor.execute("""
             CREATE TABLE IF NOT EXISTS meeting_participants (
                 meeting_id INTEGER REFERENCES meetings(meeting_id) ON DELETE CASCADE,
@@ -132,6 +430,103 @@ class DatabaseManager:
             );
         """)
 
+    def _detect_layout(self):
+        """
+        Detect whether meetings uses the time partitioned layout
+        and load the list of existing monthly partitions
+        """
+        self.cursor.execute("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_partitioned_table pt
+                    JOIN pg_class c ON c.oid = pt.partrelid
+                WHERE c.relname = 'meetings' AND pg_table_is_visible(c.oid)
+            );
+        """)
+        self.partitioned = self.cursor.fetchone()[0]
+        self.mp_join = MP_JOIN_PARTITIONED if self.partitioned else MP_JOIN
+        self.partitions = set()
+
+        #partitioned databases created before TIMESTAMPTZ keep TIMESTAMP
+        #columns (a partition key cannot change type)
+        self.cursor.execute("""
+            SELECT data_type FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = 'meetings'
+              AND column_name = 'start_time';
+        """)
+        row = self.cursor.fetchone()
+        legacy = row is not None and row[0] == "timestamp without time zone"
+        self.range_type = "tsrange" if legacy else "tstzrange"
+
+        self.cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm');")
+        self.has_trgm = self.cursor.fetchone()[0]
+
+        self.cursor.execute("SELECT to_regclass('meetings_archive') IS NOT NULL;")
+        self.has_archive = self.cursor.fetchone()[0]
+
+        self.cursor.execute("""
+            SELECT COUNT(*) = 2 FROM pg_trigger
+            WHERE (tgname = 'meetings_notify' AND tgrelid = to_regclass('meetings'))
+               OR (tgname = 'meeting_participants_notify'
+                   AND tgrelid = to_regclass('meeting_participants'));
+        """)
+        self.has_notify = self.cursor.fetchone()[0]
+
+        if self.partitioned:
+            for name in self._list_partitions():
+                self.partitions.add((int(name[-6:-2]), int(name[-2:])))
+
+    def _backfill_meeting_keys(self):
+        """
+        Fill fingerprint and uid of meetings created before the columns existed
+        If old data already holds duplicates only the first one gets
+        a fingerprint, the others stay NULL so the unique index holds
+        """
+        self.cursor.execute("""
+            UPDATE meetings SET uid = v.uid
+            FROM (
+                SELECT meeting_id,
+                       md5(meeting_id::text || random()::text) || '@meeting-scheduler' AS uid
+                FROM meetings WHERE uid IS NULL
+            ) v
+            WHERE meetings.meeting_id = v.meeting_id;
+        """)
+
+        self.cursor.execute("""
+            SELECT m.meeting_id, m.tenant_id, m.title, m.start_time, m.end_time,
+                   m.location, ARRAY_AGG(mp.person_id)
+            FROM meetings m
+                JOIN meeting_participants mp ON {mp_join}
+            WHERE m.fingerprint IS NULL AND m.deleted_at IS NULL
+            GROUP BY m.meeting_id, m.start_time
+            ORDER BY m.meeting_id;
+        """.format(mp_join=self.mp_join))
+        rows=self.cursor.fetchall()
+        if not rows:
+            return
+
+        #fingerprints are unique per tenant
+        self.cursor.execute("SELECT tenant_id, fingerprint FROM meetings WHERE fingerprint IS NOT NULL;")
+        taken=set(self.cursor.fetchall())
+
+        updates=[]
+        for meeting_id,tenant_id,title,start,end,location,ids in rows:
+            #sessions run in UTC: naive values of legacy timestamp columns are UTC
+            fingerprint=meeting_fingerprint(title,to_utc(start,UTC),to_utc(end,UTC),location,ids)
+            if (tenant_id,fingerprint) in taken:
+                continue
+            taken.add((tenant_id,fingerprint))
+            updates.append((fingerprint,meeting_id))
+
+        execute_values(
+            self.cursor,
+            """
+            UPDATE meetings m SET fingerprint = v.fingerprint
+            FROM (VALUES %s) AS v(fingerprint, meeting_id)
+            WHERE m.meeting_id = v.meeting_id;
+            """,
+            updates
+        )
+
     def test_tables(self):
         """
         Verify existence of required tables
@@ -178,6 +573,10 @@ class DatabaseManager:
                 - False and error message on failure
         """
         try:
+            self.stop_change_listener()
+            self.replica_set.close()
+            self.close_snapshot()
+
             if self.cursor:
                 self.cursor.close()
                 self.cursor = None
@@ -193,10 +592,141 @@ class DatabaseManager:
             return False, f"Error closing connection: {e}"
 
 
-    def add_person(self, name, email, phone=None):
+    def _reconnect(self):
+        """
+        Re-open the primary connection after it was lost
+        (layout, partitions, replicas and caches are kept)
+
+        Returns:
+            None
+        """
+        try:
+            if self.connection:
+                self.connection.close()
+        except Error:
+            pass
+
+        self.connection = None
+        self.cursor = None
+        self.connection = psycopg2.connect(connect_timeout=10, **self.connect_params)
+        self.connection.autocommit = False
+        self.cursor = self.connection.cursor()
+        self.is_connected = True
+
+    def _run_transaction(self,work,serializable=False):
+        """
+        Shared transactional executor: run work() as one transaction
+        and commit it
+
+        Serialization failures, deadlocks and lock timeouts are retried
+        after a rollback, a lost connection is re-opened first; every
+        retry waits a jittered exponential backoff, and all of it is
+        counted in self.tx_metrics
+
+        A connection lost during commit() is not retried: the commit may
+        have been applied, and running work() again would report the
+        saved rows as duplicates (or write them twice where no unique
+        index catches it)
+
+        work() must use self.cursor (a reconnect replaces it), must be
+        safe to run again and may roll back itself to end without
+        changes; side effects outside the db belong after this call
+
+        Returns:
+            the value returned by work()
+
+        Raises:
+            CommitUnknownError: the connection was lost during commit()
+            psycopg2.Error: when the error is not retryable or
+                            MAX_ATTEMPTS were used
+        """
+        attempt=0
+        while True:
+            attempt+=1
+            committing=False
+            try:
+                if self.connection is None or self.connection.closed:
+                    self._reconnect()
+
+                #start a fresh transaction, so the isolation level applies
+                if self.connection.get_transaction_status()!=TRANSACTION_STATUS_IDLE:
+                    self.connection.rollback()
+                if serializable:
+                    self.cursor.execute("SET TRANSACTION ISOLATION LEVEL SERIALIZABLE;")
+
+                result=work()
+                committing=True
+                self.connection.commit()
+                self.tx_metrics.record_success()
+                return result
+
+            except Error as e:
+                reason=retry_reason(e,self.connection)
+                try:
+                    if self.connection and not self.connection.closed:
+                        self.connection.rollback()
+                except Error:
+                    pass
+
+                #a failed commit that reached the server (e.g. a serialization
+                #failure) was rolled back and can be retried, a lost one cannot
+                if committing and reason=="reconnect":
+                    self.tx_metrics.record_failure()
+                    raise CommitUnknownError(
+                        "Connection lost while saving, the change may have been saved"
+                    ) from e
+                if reason is None or attempt>=MAX_ATTEMPTS:
+                    self.tx_metrics.record_failure()
+                    raise
+                self.tx_metrics.record_retry(e,reason)
+                time.sleep(backoff_delay(attempt))
+
+    def _read_batch(self,statements,primary=False):
+        """
+        Run read-only statements on one replica (or on the primary when
+        no replica is usable or reads are pinned after a write)
+        A replica failing mid-read is marked down and the read is retried
+        on the primary
+
+        Args:
+            statements: list of (query, params)
+            primary: always read from the primary (results that must not
+                     lag, e.g. ones kept in a cache)
+
+        Returns:
+            list[list[tuple]]: fetched rows per statement
+        """
+        replica=None if primary else self.replica_set.pick()
+        if replica is not None:
+            try:
+                results=[]
+                for query,params in statements:
+                    replica.cursor.execute(query,params)
+                    results.append(replica.cursor.fetchall())
+                return results
+            except (OperationalError, InterfaceError):
+                replica.mark_down()
+
+        results=[]
+        for query,params in statements:
+            self.cursor.execute(query,params)
+            results.append(self.cursor.fetchall())
+        return results
+
+    def _read(self,query,params=None,primary=False):
+        """
+        Run one read-only query, see _read_batch
+
+        Returns:
+            list[tuple]
+        """
+        return self._read_batch([(query,params)],primary)[0]
+
+    def add_person(self, name, email, phone=None, timezone=None):
         """
         Adds a new person to the database with input validation
         and duplicate email prevention
+        timezone is the IANA zone of the person's feed (None = local zone)
 
         Returns:
             (bool, str):
@@ -225,10 +755,15 @@ class DatabaseManager:
             return False, response
         phone=response
 
-        try:
+        ok, response = self.validate_timezone(timezone)
+        if not ok:
+            return False, response
+        timezone=response
+
+        def work():
             # check for duplicate emails
             self.cursor.execute(
-                "SELECT 1 FROM persons WHERE email = %s;",
+                "SELECT 1 FROM persons WHERE tenant_id = current_tenant() AND email = %s;",
                 (email,)
             )
             if self.cursor.fetchone():
@@ -237,40 +772,77 @@ class DatabaseManager:
             # Insert person
             self.cursor.execute(
                 """
-                INSERT INTO persons (name, email, phone)
-                VALUES (%s, %s, %s);
+                INSERT INTO persons (name, email, phone, timezone)
+                VALUES (%s, %s, %s, %s);
                 """,
-                (name, email, phone)
+                (name, email, phone, timezone)
             )
-
-            self.connection.commit()
             return True, "Person added successfully"
 
+        try:
+            ok,message=self._run_transaction(work)
+            if ok:
+                self.replica_set.pin_primary()
+            return ok, message
+
         except Exception as e:
-            self.connection.rollback()
             return False, f"Database error: {str(e)}"
 
     def get_all_persons(self):
         """
-        Fetch all persons from GUI selection (person_id, name)
+        Fetch all persons for GUI selection
 
         Returns:
-            -True, list[(int,str)]
+            -True, list[Person]
             -False, msg
         """
         if not self.is_connected:
             return False, "No database connection"
         try:
+            rows=self._read(
+                "SELECT person_id,name,email,phone,timezone FROM persons "
+                "WHERE tenant_id = current_tenant() ORDER BY name;"
+            )
+            return True,[Person(*row) for row in rows]
+        except Error as e:
+            return False, f"Database error: {e}"
+
+    def set_person_timezone(self,person_id,timezone):
+        """
+        Change the time zone of a person (None = local zone)
+        Their feed is rendered again in the new zone
+
+        Returns:
+            (bool,str)
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+
+        ok,response=self.validate_timezone(timezone)
+        if not ok:
+            return False, response
+
+        def work():
             self.cursor.execute(
-                    "SELECT person_id,name FROM persons ORDER BY name;"
+                "UPDATE persons SET timezone = %s "
+                "WHERE person_id = %s AND tenant_id = current_tenant();",
+                (response,person_id)
             )
-            return True,self.cursor.fetchall()
+            return self.cursor.rowcount>0
+
+        try:
+            if not self._run_transaction(work):
+                return False, "Person not found"
+            self.feed_cache.invalidate_persons([person_id])
+            self.replica_set.pin_primary()
+            return True, "Time zone updated"
         except Error as e:
             return False, f"Database error: {e}"
 
-    def check_conflicts(self,participant_ids,start_time,end_time):
+    def check_conflicts(self,participant_ids,start_time,end_time,exclude_meeting_id=None):
         """
         Checks for overlapping meetings for a list of participants
+        exclude_meeting_id skips a meeting that is being updated
 
         Returns:
             (bool,list,str):
@@ -278,27 +850,23 @@ class DatabaseManager:
                 conflicts - list of tuples [(person_id, name),...]
                 -(False,[],error_msg) on failure
         """
-        if not self.is_connected:
+        if not self.is_connected and not self.offline:
             return False,[], "No database connection"
 
+        start_time,end_time=to_aware(start_time),to_aware(end_time)
         if end_time<=start_time:
             return False,[],"End time must be after start time"
 
         if not participant_ids:
             return True,[],""
 
-        try:
-            query="""
-                SELECT DISTINCT p.person_id,
-                                p.name FROM meetings m 
-                JOIN meeting_participants mp ON m.meeting_id = mp.meeting_id
-                JOIN persons p ON mp.person_id = p.person_id
-                WHERE mp.person_id=ANY(%s::int[])
-                AND (%s<m.end_time AND %s>m.start_time);
-            """
+        if self.offline:
+            return True, self.snapshot.conflicts(participant_ids,start_time,end_time,exclude_meeting_id), ""
 
-            self.cursor.execute(query,(participant_ids,start_time,end_time))
-            conflicts= self.cursor.fetchall()
+        try:
+            query,params=self._conflict_query(participant_ids,start_time,end_time,exclude_meeting_id)
+            self.cursor.execute(query,params)
+            conflicts= [(person_id,name) for kind,person_id,name in self.cursor.fetchall()]
             return True, conflicts, ""
         except Error as e:
             return False,[],f"Database error: {e}"
@@ -306,9 +874,169 @@ class DatabaseManager:
             return False,[],f"Unexpected error: {e}"
 
 
-    def add_meeting(self,title,description, start_time,end_time,location,participant_ids):
+    def check_conflicts_batch(self,candidates):
+        """
+        What-if conflict check of many candidate meetings at once
+
+        The busy intervals of every involved person are loaded with one
+        query and all candidates are tested with vectorized searchsorted
+        overlap tests (see conflict_matrix.py), instead of one
+        check_conflicts round trip per candidate
+        Candidates are only tested against stored meetings, not against
+        each other
+
+        Args:
+            candidates: list of (participant_ids, start_time, end_time)
+
+        Returns:
+            (bool,ConflictMatrix|None,str):
+                -(True,matrix,"") on success
+                -(False,None,error_msg) on failure
+        """
+        if not self.is_connected:
+            return False,None,"No database connection"
+
+        if not HAS_NUMPY:
+            return False,None,"Batch conflict checks require numpy (pip install numpy)"
+
+        try:
+            candidates=[
+                ([int(pid) for pid in ids],to_aware(start),to_aware(end))
+                for ids,start,end in candidates
+            ]
+        except (TypeError, ValueError):
+            return False,None,"Invalid participant ID"
+
+        for ids,start,end in candidates:
+            if end<=start:
+                return False,None,"End time must be after start time"
+
+        try:
+            busy={}
+            if candidates:
+                busy=self._load_busy_intervals(
+                    sorted({pid for ids,start,end in candidates for pid in ids}),
+                    min(start for ids,start,end in candidates),
+                    max(end for ids,start,end in candidates)
+                )
+                self.connection.commit()
+            return True,build_conflict_matrix(candidates,busy),""
+        except Error as e:
+            self.connection.rollback()
+            return False,None,f"Database error: {e}"
+
+    def _participant_bounds(self):
+        """
+        Condition repeating the start_time bounds of meetings m on
+        meeting_participants mp in the partitioned layout (empty in the
+        other one): the join on start_time does not carry range bounds
+        over, without it every participant partition is scanned
+
+        Returns:
+            str: "" or a condition with two parameters (lower, upper)
+        """
+        if not self.partitioned:
+            return ""
+        return """
+            AND mp.start_time >= %s AND mp.start_time < %s
+        """
+
+    def _participant_bound_params(self,lower,upper):
+        """
+        Parameters of _participant_bounds
+
+        Returns:
+            tuple
+        """
+        return (lower,upper) if self.partitioned else ()
+
+    def _conflict_query(self,participant_ids,start_time,end_time,exclude_meeting_id=None,room_id=None):
+        """
+        Build the conflict check query of check_conflicts
+        With a room_id the room is checked in the same query (on the
+        (room_id, time range) exclusion index)
+
+        Returns:
+            (str,tuple): query and parameters, rows are
+                         (kind, id, name) with kind "person" or "room"
+        """
+        floor=self._overlap_floor(start_time)
+        query="""
+            SELECT DISTINCT 'person', p.person_id,
+                            p.name FROM meetings m 
+            JOIN meeting_participants mp ON {mp_join}
+            JOIN persons p ON mp.person_id = p.person_id
+            WHERE mp.person_id=ANY(%s::int[])
+            AND m.tenant_id = current_tenant()
+            AND (%s<m.end_time AND %s>m.start_time)
+            AND m.start_time > %s
+            AND m.deleted_at IS NULL
+            AND m.meeting_id IS DISTINCT FROM %s
+        """.format(mp_join=self.mp_join)+self._participant_bounds()
+        params=(list(participant_ids),start_time,end_time,floor,exclude_meeting_id)
+        params+=self._participant_bound_params(floor,end_time)
+
+        if room_id is not None:
+            query+="""
+            UNION ALL
+            SELECT DISTINCT 'room', r.room_id, r.name FROM meetings m
+            JOIN rooms r ON r.room_id = m.room_id
+            WHERE m.room_id = %s
+            AND m.tenant_id = current_tenant()
+            AND {range_type}(m.start_time, m.end_time) && {range_type}(%s, %s)
+            AND m.start_time > %s
+            AND m.deleted_at IS NULL
+            AND m.meeting_id IS DISTINCT FROM %s
+            """.format(range_type=self.range_type)
+            params+=(room_id,start_time,end_time,floor,exclude_meeting_id)
+
+        return query+";",params
+
+    def _lock_participants(self,person_ids,room_id=None):
+        """
+        Take the advisory locks of the given persons (and room) until the
+        end of the current transaction; no-op without participant_locks,
+        except for the room in the partitioned layout: its exclusion
+        constraint is per monthly partition and misses bookings that
+        overlap across a month boundary, so rooms are always checked by
+        the conflict query under their lock there
+
+        Locks are always taken in (space, id) order, so two writers
+        sharing several participants cannot deadlock; all locks go in
+        one round trip
+
+        Returns:
+            None
+        """
+        keys=[]
+        if self.participant_locks:
+            keys=[(PERSON_LOCK_SPACE,int(pid)) for pid in sorted({int(pid) for pid in person_ids})]
+        if room_id is not None and (self.participant_locks or self.partitioned):
+            keys.append((ROOM_LOCK_SPACE,int(room_id)))
+        if keys:
+            self.cursor.execute("".join(
+                f"SELECT pg_advisory_xact_lock({space}, {key});" for space,key in keys
+            ))
+
+    def _overlap_floor(self,start_time):
+        """
+        Earliest start_time a meeting overlapping start_time can have
+        Only bounded in the partitioned layout (meetings of at most
+        MAX_MEETING_LENGTH), where it lets the planner prune partitions
+
+        Returns:
+            datetime
+        """
+        if self.partitioned:
+            return start_time-MAX_MEETING_LENGTH
+        return datetime.min.replace(tzinfo=UTC)
+
+    def add_meeting(self,title,description, start_time,end_time,location,participant_ids,uid=None,room_id=None):
         """
         Creates new meeting, validate input, check conflicts, and store participants
+        uid keeps the UID of an imported event (a new one is generated if None)
+        room_id books a room: participants and room are checked in one query
+        and the exclusion constraint rejects a concurrent double booking
 
         Returns:
             (bool, str):
@@ -333,425 +1061,2598 @@ class DatabaseManager:
             except Exception:
                 return False, "Invalid participant ID"
 
-        #check if participant ids exist in db
-        self.cursor.execute(
-            "SELECT person_id FROM persons WHERE person_id=ANY(%s::int[]);",
-            (participant_ids,)
-        )
-        existing= {row[0] for row in self.cursor.fetchall()}
-        missing= sorted(set(participant_ids) - existing)
-        if missing:
-            return False, f"Some participants do not exist in db: {missing}"
-
-
         #sorted+unique list of participants
         participant_ids=sorted(set(ids))
 
-        ok,title,msg=self.clean_str(title,"Title",allow_empty=False,max_len=100)
-        if not ok:
-            return False, msg
-
-        ok,description,msg=self.clean_str(description,"Description",allow_empty=True,max_len=1000)
+        ok,fields,msg=self.validate_meeting_fields(title,description,start_time,end_time,location)
         if not ok:
             return False, msg
+        title,description,location=fields
+        start_time,end_time=to_aware(start_time),to_aware(end_time)
 
-        ok,location,msg=self.clean_str(location,"Location",allow_empty=True,max_len=100)
-        if not ok:
-            return False, msg
+        def work():
+            #check if participant ids exist in db
+            self.cursor.execute(
+                "SELECT person_id FROM persons "
+                "WHERE person_id=ANY(%s::int[]) AND tenant_id = current_tenant();",
+                (participant_ids,)
+            )
+            existing= {row[0] for row in self.cursor.fetchall()}
+            missing= sorted(set(participant_ids) - existing)
+            if missing:
+                return False, f"Some participants do not exist in db: {missing}"
 
-        if not isinstance(start_time,datetime) or not isinstance(end_time,datetime):
-            return False,"Start and end times must be datetime values"
+            if room_id is not None:
+                self.cursor.execute(
+                    "SELECT 1 FROM rooms WHERE room_id=%s AND tenant_id = current_tenant();",
+                    (room_id,)
+                )
+                if not self.cursor.fetchone():
+                    return False, "Room does not exist in db"
 
-        if end_time<=start_time:
-            return False,"End time must be after start time"
+            #serialize against writers sharing a participant or the room
+            self._lock_participants(participant_ids,room_id)
 
-        if start_time< datetime.now():
-            return False, "Meeting cannot be scheduled in the past"
+            #check person and room conflicts
+            query,params=self._conflict_query(
+                participant_ids,start_time,end_time,room_id=room_id
+            )
+            self.cursor.execute(query,params)
+            conflicts=self.cursor.fetchall()
 
-        try:
-            #check conflicts
-            ok,conflicts,msg=self.check_conflicts(participant_ids,start_time,end_time)
-            if not ok:
-                return False, msg
+            rooms=[name for kind,conflict_id,name in conflicts if kind=="room"]
+            if rooms:
+                self.connection.rollback()
+                return False, f"Room {rooms[0]} is already booked at that time"
 
             if conflicts:
-               unique_names={person_name for person_id,person_name in conflicts}
+               self.connection.rollback()
+               unique_names={person_name for kind,person_id,person_name in conflicts}
                names=", ".join(sorted(unique_names))
                return False, f"Schedule conflict for: {names}"
 
-            #Insert meeting
-            self.cursor.execute(
-                """
-                INSERT INTO meetings
-                    (title, description, start_time, end_time, location)
-                    VALUES (%s,%s,%s,%s,%s) RETURNING meeting_id;
-                """, (title, description, start_time, end_time, location)
+            meeting_id=self._insert_meeting(
+                title,description,start_time,end_time,location,participant_ids,
+                uid=uid,room_id=room_id
             )
+            if meeting_id is None:
+                self.connection.rollback()
+                return False, "Meeting already exists"
+            return True, "Meeting scheduled successfully"
 
-            meeting_id=self.cursor.fetchone()[0]
-
-            #insert participants
-            for person_id in participant_ids:
-                self.cursor.execute(
-                    """
-                    INSERT INTO meeting_participants (meeting_id, person_id)
-                        VALUES (%s, %s);
-                    """, (meeting_id, person_id)
-                )
+        try:
+            self._ensure_partitions([start_time])
 
-            self.connection.commit()
-            return True, "Meeting scheduled successfully"
+            ok,message=self._run_transaction(work,serializable=self.serializable_scheduling)
+            if ok:
+                self._after_meetings_write(participant_ids,[(start_time,end_time)])
+            return ok, message
 
         except Error as e:
-            self.connection.rollback()
+            if e.pgcode==EXCLUSION_VIOLATION:
+                return False, "Room is already booked at that time"
+            if e.pgcode==UNIQUE_VIOLATION:
+                return False, "Meeting already exists"
             return False, f"Database error: {str(e)}"
         except Exception as e:
             self.connection.rollback()
             return False, f"Unexpected error: {e}"
 
 
-    def meeting_exists(self,title,start_time,end_time,location,participant_ids):
+    def _insert_meeting(self,title,description,start_time,end_time,location,
+                        participant_ids,uid=None,sequence=0,room_id=None):
         """
-        Checks if a meeting already exists in db with same fields and participants
-        Used when importing in order not to insert a meeting multiple times
+        Insert an already validated meeting and its participants
+        (no commit, the caller owns the transaction)
+
+        The fingerprint index skips exact duplicates; other violations
+        (room exclusion constraint, uid index) raise to the caller
 
         Returns:
-            bool
+            int | None: the new meeting_id, None if the meeting already exists
         """
-        if not self.is_connected:
-            return False
-
-        ids=[]
-        for participant_id in participant_ids:
-            ids.append(int(participant_id))
-
-        ids=sorted(set(ids))
-
+        fingerprint=meeting_fingerprint(title,start_time,end_time,location,participant_ids)
         self.cursor.execute(
             """
-            SELECT m.meeting_id FROM meetings m 
-            WHERE m.title=%s 
-                AND m.start_time=%s 
-                AND m.end_time=%s
-                AND COALESCE(m.location,'')=COALESCE(%s,'')
-            """,
-            (title,start_time,end_time,location)
+            INSERT INTO meetings
+                (title, description, start_time, end_time, location,
+                 fingerprint, uid, sequence, room_id)
+                VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s)
+                ON CONFLICT {dedup_target} DO NOTHING
+                RETURNING meeting_id;
+            """.format(dedup_target=self._dedup_target()),
+            (title, description, start_time, end_time, location,
+             fingerprint, uid or new_uid(), sequence, room_id)
         )
+
         row=self.cursor.fetchone()
         if not row:
-            return False
+            return None
         meeting_id=row[0]
 
-        self.cursor.execute(
-            "SELECT person_id FROM meeting_participants WHERE meeting_id=%s",
-            (meeting_id,)
-        )
-        existing_ids=sorted({r[0] for r in self.cursor.fetchall()})
-        return existing_ids==ids
+        #insert participants
+        self._insert_participants([(meeting_id,pid,start_time) for pid in participant_ids])
 
+        return meeting_id
 
-    def get_meetings_in_interval(self, start_time, end_time):
+    def _dedup_target(self):
         """
-        Return all meetings in selected interval
+        ON CONFLICT target of the fingerprint index; naming it lets other
+        violations (room exclusion constraint) reach the caller
 
         Returns:
-            (bool,list|str):
-                - True and a list of meetings:
-                    [
-                        (title,description,start_time,end_time,location,participants),
-                        ...
-                    ]
-                - False and error msg on failure
+            str
         """
+        if self.partitioned:
+            return "(tenant_id, fingerprint, start_time)"
+        return "(tenant_id, fingerprint)"
 
-        if not self.is_connected:
-            return False, "No database connection"
-
-        if not isinstance(start_time,datetime) or not isinstance(end_time,datetime):
-            return False, "Start and end times must be datetime values"
+    def _insert_participants(self,rows):
+        """
+        Insert participant rows (no commit)
 
-        if end_time<=start_time:
-            return False, "End time must be after start time"
+        Args:
+            rows: list of (meeting_id,person_id,start_time); start_time is
+                  only stored in the partitioned layout
 
-        try:
-            query="""
-                SELECT
-                    m.title,
-                    m.description,
-                    m.start_time,
-                    m.end_time,
-                    m.location, 
-                    STRING_AGG(p.name,', ') AS participants
-                FROM meetings m JOIN 
-                     meeting_participants mp ON m.meeting_id = mp.meeting_id
-                    JOIN persons p ON mp.person_id = p.person_id
-                WHERE start_time >= %s AND end_time <= %s
-                GROUP BY m.meeting_id ORDER BY start_time;
-            """
+        Returns:
+            None
+        """
+        if not rows:
+            return
+
+        if self.partitioned:
+            execute_values(
+                self.cursor,
+                "INSERT INTO meeting_participants (meeting_id, person_id, start_time) VALUES %s;",
+                rows
+            )
+        else:
+            execute_values(
+                self.cursor,
+                "INSERT INTO meeting_participants (meeting_id, person_id) VALUES %s;",
+                [(meeting_id,person_id) for meeting_id,person_id,start_time in rows]
+            )
 
-            self.cursor.execute(query,(start_time,end_time))
-            results= self.cursor.fetchall()
-            return True, results
-        except Error as e:
-            return False,  f"Database error: {str(e)}"
-        except Exception as e:
-            return False, f"Unexpected error: {str(e)}"
+    def _after_meetings_write(self,person_ids,ranges=None,meeting_ids=()):
+        """
+        Called after every committed write to meetings
+        Drops cached data the write touched (see _invalidate_caches) and
+        pins reads to the primary for a while (read-your-writes)
 
+        Returns:
+            None
+        """
+        self._invalidate_caches(person_ids,ranges,meeting_ids)
+        self.replica_set.pin_primary()
 
-    #EXPORT MEETINGS PART
-    def export_meetings_to_file(self,meetings,file_path):
+    def _invalidate_caches(self,person_ids,ranges=None,meeting_ids=()):
         """
-        Export meetings to ics file
+        Drop cached data of the given persons, after a local write or
+        a change notified by another client
+
+        Cached interval searches are dropped when they hold one of
+        meeting_ids or overlap one of the written (start,end) ranges;
+        all of them when the ranges are unknown (None)
 
         Returns:
-            (bool,str):
-                - True and success msg on success
+            None
+        """
+        self.feed_cache.invalidate_persons(person_ids)
+        if ranges is None:
+            self.interval_cache.clear()
+        else:
+            self.interval_cache.invalidate(meeting_ids,ranges)
+
+    def delete_meeting(self,meeting_id):
+        """
+        Delete a meeting
+
+        The row is kept as a tombstone (deleted_at set, sequence bumped)
+        so incremental sync can export the cancellation
+
+        Returns:
+            (bool,str):
+                - True and success msg if deleted
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+
+        def work():
+            self.cursor.execute(
+                """
+                UPDATE meetings
+                SET deleted_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP,
+                    sequence = sequence + 1,
+                    fingerprint = NULL
+                WHERE meeting_id = %s AND tenant_id = current_tenant()
+                  AND deleted_at IS NULL;
+                """, (meeting_id,)
+            )
+            if self.cursor.rowcount==0:
+                return None
+
+            self.cursor.execute(
+                "SELECT person_id FROM meeting_participants WHERE meeting_id = %s;",
+                (meeting_id,)
+            )
+            return [row[0] for row in self.cursor.fetchall()]
+
+        try:
+            participant_ids=self._run_transaction(work)
+            if participant_ids is None:
+                return False, "Meeting not found"
+
+            #the deleted meeting is found in the cached results by id
+            self._after_meetings_write(participant_ids,[],[meeting_id])
+            return True, "Meeting deleted successfully"
+
+        except Error as e:
+            return False, f"Database error: {e}"
+
+    def meeting_exists(self,title,start_time,end_time,location,participant_ids):
+        """
+        Checks if a meeting already exists in db with same fields and participants
+        Used when importing in order not to insert a meeting multiple times
+
+        The check is a single lookup on the unique fingerprint index
+
+        Returns:
+            bool
+        """
+        if not self.is_connected:
+            return False
+
+        fingerprint=meeting_fingerprint(title,start_time,end_time,location,participant_ids)
+        self.cursor.execute(
+            "SELECT 1 FROM meetings WHERE tenant_id = current_tenant() AND fingerprint=%s;",
+            (fingerprint,)
+        )
+        return self.cursor.fetchone() is not None
+
+
+    def get_meetings_in_interval(self, start_time, end_time, mode="contained", include_archived=False):
+        """
+        Return all meetings in selected interval
+
+        Participants come back as parallel arrays, so no name has
+        to be split or looked up again
+
+        Modes:
+            - contained: meetings fully inside [start, end]
+            - overlapping: meetings that touch the interval at all
+            - starts_within: meetings starting inside [start, end)
+
+        With include_archived the meetings moved out of the hot tables
+        by archive_meetings_before are searched too (one more indexed
+        query on meetings_archive, never cached, not available offline)
+
+        Returns:
+            (bool,list|str):
+                - True and a list of Meeting records
+                - False and error msg on failure
+        """
+
+        if not self.is_connected and not self.offline:
+            return False, "No database connection"
+
+        if not isinstance(start_time,datetime) or not isinstance(end_time,datetime):
+            return False, "Start and end times must be datetime values"
+
+        start_time,end_time=to_aware(start_time),to_aware(end_time)
+        if end_time<=start_time:
+            return False, "End time must be after start time"
+
+        if mode not in INTERVAL_MODES:
+            return False, f"Invalid search mode: {mode}"
+
+        if self.offline:
+            if include_archived:
+                return False, "Archived meetings are not available offline"
+            return True, self.snapshot.meetings_in_interval(start_time,end_time,mode)
+
+        #without the NOTIFY triggers other clients' writes would never
+        #evict cached searches
+        use_cache=self.change_listener is not None and self.has_notify
+        try:
+            meetings=self.interval_cache.get(start_time,end_time,mode) if use_cache else None
+            if meetings is None and use_cache:
+                #cache the overlapping superset, any mode can be served from it;
+                #read from the primary, a lagging replica could cache old rows
+                query,params=self._interval_query(start_time,end_time,"overlapping")
+                overlapping=[Meeting.from_row(row) for row in self._read(query,params,primary=True)]
+                self.interval_cache.put(start_time,end_time,overlapping)
+                meetings=[meeting for meeting in overlapping if meeting.in_interval(start_time,end_time,mode)]
+            elif meetings is None:
+                query,params=self._interval_query(start_time,end_time,mode)
+                meetings=[Meeting.from_row(row) for row in self._read(query,params)]
+
+            if include_archived and self.has_archive:
+                query,params=self._archive_interval_query(start_time,end_time,mode)
+                archived=[Meeting.from_row(row) for row in self._read(query,params)]
+                meetings=sorted(meetings+archived,key=lambda meeting: meeting.start_time)
+            return True, meetings
+        except Error as e:
+            return False,  f"Database error: {str(e)}"
+        except Exception as e:
+            return False, f"Unexpected error: {str(e)}"
+
+    def _interval_query(self,start_time,end_time,mode="contained"):
+        """
+        Build the query of get_meetings_in_interval
+
+        contained/starts_within are (tenant_id, start_time) range scans on
+        the btree index, overlapping uses the (tenant_id, range) gist index;
+        every mode bounds start_time on both sides so partitions are
+        pruned too (see check_partition_pruning)
+
+        Returns:
+            (str,tuple): query and parameters
+        """
+        lower=self._overlap_floor(start_time) if mode=="overlapping" else start_time
+        if mode=="overlapping":
+            where="""
+                WHERE m.tenant_id = current_tenant()
+                  AND {range_type}(m.start_time, m.end_time) && {range_type}(%s, %s)
+                  AND m.start_time > %s AND m.start_time < %s
+            """.format(range_type=self.range_type)
+            params=(start_time,end_time,self._overlap_floor(start_time),end_time)
+        elif mode=="starts_within":
+            where="""
+                WHERE m.tenant_id = current_tenant()
+                  AND m.start_time >= %s AND m.start_time < %s
+            """
+            params=(start_time,end_time)
+        else:
+            where="""
+                WHERE m.tenant_id = current_tenant()
+                  AND m.start_time >= %s AND m.start_time < %s
+                  AND m.end_time <= %s
+            """
+            params=(start_time,end_time,end_time)
+
+        where+=self._participant_bounds()
+        params+=self._participant_bound_params(lower,end_time)
+        query=MEETING_SELECT.format(mp_join=self.mp_join)+where+"""
+              AND m.deleted_at IS NULL
+            GROUP BY m.meeting_id, m.start_time ORDER BY m.start_time;
+        """
+        return query,params
+
+    def _archive_interval_query(self,start_time,end_time,mode="contained"):
+        """
+        Build the query of get_meetings_in_interval over meetings_archive,
+        rows shaped like MEETING_SELECT rows
+        Same index use as _interval_query, on the archive's (tenant_id,
+        start_time) btree and (tenant_id, range) gist indexes
+
+        Returns:
+            (str,tuple): query and parameters
+        """
+        if mode=="overlapping":
+            where="tstzrange(a.start_time, a.end_time) && tstzrange(%s, %s)"
+            params=(start_time,end_time)
+        elif mode=="starts_within":
+            where="a.start_time >= %s AND a.start_time < %s"
+            params=(start_time,end_time)
+        else:
+            where="a.start_time >= %s AND a.start_time < %s AND a.end_time <= %s"
+            params=(start_time,end_time,end_time)
+
+        query=f"""
+            SELECT a.meeting_id, a.uid, a.title, a.description,
+                   a.start_time, a.end_time, a.location,
+                   ARRAY_AGG(p.person_id ORDER BY p.name, p.person_id),
+                   ARRAY_AGG(p.name ORDER BY p.name, p.person_id),
+                   ARRAY_AGG(p.email ORDER BY p.name, p.person_id)
+            FROM meetings_archive a
+                JOIN persons p ON p.person_id = ANY(a.participant_ids)
+            WHERE a.tenant_id = current_tenant()
+              AND {where}
+              AND a.deleted_at IS NULL
+            GROUP BY a.meeting_id ORDER BY a.start_time;
+        """
+        return query,params
+
+    def get_meetings_by_ids(self,meeting_ids):
+        """
+        Return the meetings with the given ids as Meeting records
+
+        Returns:
+            (bool,list|str):
+                - True and a list of Meeting records in start time order
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+
+        try:
+            ids=[int(meeting_id) for meeting_id in meeting_ids]
+        except (TypeError, ValueError):
+            return False, "Invalid meeting ID"
+
+        try:
+            query=MEETING_SELECT.format(mp_join=self.mp_join)+"""
+                WHERE m.meeting_id = ANY(%s::int[])
+                  AND m.tenant_id = current_tenant()
+                  AND m.deleted_at IS NULL
+                GROUP BY m.meeting_id, m.start_time ORDER BY m.start_time;
+            """
+
+            return True, [Meeting.from_row(row) for row in self._read(query,(ids,))]
+        except Error as e:
+            return False, f"Database error: {e}"
+
+
+    def get_meetings_for_person(self,person_id,start_time=None,end_time=None):
+        """
+        Return the meetings of one person, optionally only the ones
+        overlapping [start_time, end_time)
+
+        Returns:
+            (bool,list|str):
+                - True and a list of Meeting records in start time order
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+
+        start_time=to_aware(start_time) if start_time else None
+        end_time=to_aware(end_time) if end_time else None
+        if start_time and end_time and end_time<=start_time:
+            return False, "End time must be after start time"
+
+        try:
+            query=MEETING_SELECT.format(mp_join=self.mp_join)+"""
+                WHERE m.meeting_id IN (
+                        SELECT meeting_id FROM meeting_participants WHERE person_id = %s
+                    )
+                  AND (%s::timestamptz IS NULL OR m.end_time > %s)
+                  AND (%s::timestamptz IS NULL OR m.start_time < %s)
+                  AND m.tenant_id = current_tenant()
+                  AND m.deleted_at IS NULL
+                GROUP BY m.meeting_id, m.start_time ORDER BY m.start_time;
+            """
+            rows=self._read(query,(person_id,start_time,start_time,end_time,end_time))
+            return True, [Meeting.from_row(row) for row in rows]
+        except Error as e:
+            return False, f"Database error: {e}"
+
+
+    #EXPORT MEETINGS PART
+    def export_meetings_to_file(self,meetings,file_path,zone=None):
+        """
+        Export Meeting records to ics file
+        Times are written in zone (see meetings_to_ics)
+        The records are rendered as given, so meetings read from the
+        offline snapshot export without a database connection
+
+        Returns:
+            (bool,str):
+                - True and success msg on success
                 - False and error message on failure
         """
+        if not self.is_connected and not self.offline:
+            return False, "No database connection"
+
+        if not meetings:
+            return False, "No meetings to export"
+
+        # file_path validations
+        if not file_path:
+            return False, "No export file selected"
+        if not file_path.lower().endswith(".ics"):
+            return False, "File must be .ics file"
+
+        try:
+            #write calendar to .ics file
+            with open(file_path, "wb") as f:
+                f.write(self.meetings_to_ics(meetings,zone))
+
+            return True, "Exported meetings successfully"
+
+        except Exception as e:
+            return False, f"Export failed: {str(e)}"
+
+
+    def meetings_to_ics(self,meetings,zone=None):
+        """
+        Render Meeting records as one calendar
+        Times carry the TZID of zone (an IANA name, the local zone by
+        default) and the calendar holds its VTIMEZONE
+
+        Returns:
+            bytes
+        """
+        zone=zone or local_zone_name()
+
+        # create calendar
+        cal=new_calendar()
+
+        # for every meeting create an VEVENT
+        for meeting in meetings:
+            cal.add_component(build_event(
+                meeting.uid,meeting.title,meeting.description,
+                meeting.start_time,meeting.end_time,meeting.location,
+                meeting.participant_names,meeting.participant_emails,
+                zone=zone
+            ))
+        if meetings and zone!="UTC":
+            add_timezones(
+                cal,
+                min(meeting.start_time for meeting in meetings),
+                max(meeting.end_time for meeting in meetings)
+            )
+        return cal.to_ical()
+
+    #PER PERSON FEEDS PART
+    def render_person_feed(self,person_id):
+        """
+        Render the ICS feed of one person
+
+        The feed is assembled from cached VEVENT fragments; only meetings
+        that were never rendered (or changed since) are serialized again
+        Times are written in the person's time zone (the local zone if
+        none is set)
+
+        Returns:
+            (bool,bytes|str):
+                - True and the calendar as bytes
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+
+        feed=self.feed_cache.get_feed(person_id)
+        if feed is not None:
+            return True, feed
+
+        try:
+            zone_rows,versions=self._read_batch([
+                ("SELECT timezone FROM persons WHERE person_id = %s AND tenant_id = current_tenant();",
+                 (person_id,)),
+                ("""
+                SELECT m.meeting_id, m.sequence
+                FROM meetings m
+                    JOIN meeting_participants mp ON {mp_join}
+                WHERE mp.person_id = %s AND m.tenant_id = current_tenant()
+                  AND m.deleted_at IS NULL
+                ORDER BY m.start_time;
+                """.format(mp_join=self.mp_join), (person_id,))
+            ])
+            zone=(zone_rows[0][0] if zone_rows else None) or local_zone_name()
+
+            fragments={}
+            missing=[]
+            for meeting_id,sequence in versions:
+                fragment=self.feed_cache.get_fragment(meeting_id,sequence,zone)
+                if fragment is None:
+                    missing.append(meeting_id)
+                else:
+                    fragments[meeting_id]=fragment
+
+            if missing:
+                missing_rows=self._read(
+                    """
+                    SELECT m.meeting_id, m.sequence, m.uid, m.title, m.description,
+                           m.start_time, m.end_time, m.location,
+                           ARRAY_AGG(p.name ORDER BY p.name, p.person_id),
+                           ARRAY_AGG(p.email ORDER BY p.name, p.person_id)
+                    FROM meetings m
+                        JOIN meeting_participants mp ON {mp_join}
+                        JOIN persons p ON mp.person_id = p.person_id
+                    WHERE m.meeting_id = ANY(%s::int[])
+                    GROUP BY m.meeting_id, m.start_time;
+                    """.format(mp_join=self.mp_join), (missing,)
+                )
+                for meeting_id,sequence,uid,title,description,start,end,location,names,emails in missing_rows:
+                    fragment=build_event(
+                        uid,title,description,start,end,location,names,emails,
+                        sequence=sequence,zone=zone
+                    ).to_ical()
+                    self.feed_cache.put_fragment(meeting_id,sequence,fragment,zone)
+                    fragments[meeting_id]=fragment
+
+            self.connection.commit()
+
+            feed=assemble_feed(
+                (fragments[meeting_id] for meeting_id,sequence in versions
+                 if meeting_id in fragments),
+                vtimezone(zone) if versions and zone!="UTC" else b""
+            )
+            self.feed_cache.put_feed(person_id,feed)
+            return True, feed
+
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
+        except Exception as e:
+            return False, f"Feed failed: {e}"
+
+    #IMPORT MEETINGS PART
+    def get_person_id_by_name(self,names):
+        """
+        Map a list of participant names to person_ids from the db
+
+        Returns:
+            dict:
+                A dict mapping lowercase_name -> person_id
+                Returns {} if not connected or names list is empty
+        """
+
+        if not self.is_connected:
+            return {}
+
+        new_names=[]
+        for name in names:
+            stripped=name.strip()
+            if stripped:
+                new_names.append(stripped)
+
+        if not new_names:
+            return {}
+
+        #convert names to lowercase
+        lower_names=[]
+        for name in new_names:
+            lower_names.append(name.lower())
+
+        #query
+        self.cursor.execute(
+            """
+            SELECT person_id,name FROM persons
+            WHERE tenant_id = current_tenant() AND LOWER(name)=ANY(%s)
+            """, (lower_names,)
+        )
+
+        rows=self.cursor.fetchall()
+
+        result={}
+        for person_id,name in rows:
+            result[name.lower()]=person_id
+
+        return result
+
+    def new_name_index(self):
+        """
+        Name index for one import, loaded from persons on first use
+
+        Returns:
+            NameIndex
+        """
+        def load():
+            self.cursor.execute("SELECT person_id, name FROM persons WHERE tenant_id = current_tenant();")
+            return self.cursor.fetchall()
+
+        return NameIndex(load)
+
+    def resolve_participant_names(self,names,name_index=None):
+        """
+        Resolve participant names to person_ids
+
+        Every name is first matched in the in-memory index (exact,
+        accent / punctuation insensitive, any name order, initials); the
+        names left over are searched together in one pg_trgm similarity
+        query on the persons name index, when pg_trgm is installed
+
+        Args:
+            name_index: NameIndex shared by the files of one import
+                        (a new one is built if None)
+
+        Returns:
+            dict: name -> NameMatch, for every distinct non-empty name
+        """
+        name_index=name_index or self.new_name_index()
+        matches={}
+        for name in names:
+            if name.strip() and name not in matches:
+                matches[name]=name_index.match(name)
+
+        fuzzy=[name for name,match in matches.items() if match.method=="unresolved"]
+        if fuzzy and self.has_trgm:
+            self.cursor.execute(
+                """
+                SELECT n.name, c.person_id, c.score
+                FROM unnest(%s::text[]) AS n(name)
+                    CROSS JOIN LATERAL (
+                        SELECT p.person_id, similarity(LOWER(p.name), LOWER(n.name)) AS score
+                        FROM persons p
+                        WHERE LOWER(p.name) %% LOWER(n.name)
+                          AND p.tenant_id = current_tenant()
+                        ORDER BY score DESC, p.person_id
+                        LIMIT 2
+                    ) c
+                ORDER BY n.name, c.score DESC, c.person_id;
+                """, (fuzzy,)
+            )
+            scored={}
+            for name,person_id,score in self.cursor.fetchall():
+                scored.setdefault(name,[]).append((person_id,score))
+            for name in fuzzy:
+                matches[name]=pick_trigram_match(name,scored.get(name,[]))
+
+        return matches
+
+    def resolve_event_participants(self,events,name_index=None):
+        """
+        Resolve the participants of parsed events to person_ids
+
+        ATTENDEE emails of all events are looked up with one query on the
+        unique email index; events without attendees fall back to the
+        names of their "Participants:" description line, all resolved
+        in one batch by resolve_participant_names
+
+        Returns:
+            (list[list[int]],dict):
+                - sorted person_ids per event, in event order
+                  (unknown participants are left out)
+                - name -> NameMatch of every name looked up
+        """
+        emails={email for event in events for email in event["attendee_emails"]}
+        email_to_id={}
+        if emails:
+            self.cursor.execute(
+                "SELECT person_id, email FROM persons "
+                "WHERE tenant_id = current_tenant() AND email = ANY(%s);",
+                (list(emails),)
+            )
+            email_to_id={email: person_id for person_id,email in self.cursor.fetchall()}
+
+        names=[
+            name for event in events if not event["attendee_emails"]
+            for name in event["participant_names"]
+        ]
+        matches=self.resolve_participant_names(names,name_index) if names else {}
+
+        resolved=[]
+        for event in events:
+            if event["attendee_emails"]:
+                ids={email_to_id[e] for e in event["attendee_emails"] if e in email_to_id}
+            else:
+                ids={
+                    matches[name].person_id for name in event["participant_names"]
+                    if name in matches and matches[name].person_id is not None
+                }
+            resolved.append(sorted(ids))
+
+        return resolved, matches
+
+    def extract_participants(self, description):
+        """
+        Extract participants from meeting description
+
+        Returns:
+            list[str]:
+                - List of participants names found after "Participants:"
+                - [] if none found
+        """
+        return extract_participants(description)
+
+    def remove_participants_description(self,description):
+        """
+        Remove "Participants:" line from description when importing
+
+        Returns:
+            str:
+                Description without "Participants: line
+                "" if description is empty
+        """
+        return remove_participants_description(description)
+
+    #IMPORT PIPELINE PART
+    def import_meetings_from_file(self,file_path,dry_run=False):
+        """
+        Import meetings from ics file and insert in db, all or nothing
+        (see run_import_pipeline)
+
+        Returns:
+            (bool,str):
+                - True and success msg with imported count (with
+                  dry_run, the count of meetings that can be imported)
+                - False and error msg listing the problems of the file
+        """
+
+        if not self.is_connected:
+            return False, "No database connection"
+
+        #validations for file_path
+        if not file_path:
+            return False,"No file selected"
+        if not file_path.lower().endswith(".ics"):
+            return False, "Invalid file type. Select .ics file"
+        if not os.path.exists(file_path):
+            return False, "File not found"
+
+        try:
+            with open(file_path, "rb") as f:
+                data=f.read()
+        except OSError as e:
+            return False, f"Cannot read file: {e}"
+
+        ok,report=self.run_import_pipeline(data,file_path,dry_run)
+        return ok, format_import_report(report)
+
+    def run_import_pipeline(self,data,source="<stdin>",dry_run=False):
+        """
+        Staged import of one calendar: parse, validate, resolve, dedup,
+        conflicts, commit
+
+        Every stage handles the whole file at once (one query per db
+        stage). The problems of all events are collected instead of
+        stopping at the first one; duplicates of stored meetings or of
+        an earlier event of the file are skipped, they are not problems
+
+        With dry_run nothing is written: the checks run in a transaction
+        that is rolled back. Otherwise the meetings are inserted in one
+        transaction, and only when the file has no problem at all
+
+        Returns:
+            (bool,dict):
+                - success flag (no problems, and committed unless dry_run)
+                - report {"file", "dry_run", "events", "accepted",
+                  "imported", "duplicates", "problems", "warnings",
+                  "names", "timings"}; problems and warnings are
+                  {"index", "title", "stage", "message"} dicts
+        """
+        report=new_import_report(source,dry_run)
+        problems=report["problems"]
+        if not self.is_connected:
+            problems.append(import_problem(None,"","parse","No database connection"))
+            return False, report
+
+        clock=StageClock(report["timings"])
+        try:
+            events=parse_events(data)
+        except Exception as e:
+            problems.append(import_problem(None,"","parse",f"cannot parse calendar: {e}"))
+            return False, report
+        clock.mark("parse")
+
+        return self._run_import_stages(events,report,clock)
+
+    def _run_import_stages(self,events,report,clock,name_index=None):
+        """
+        Stages of run_import_pipeline after parsing (validate to commit),
+        for the parsed events of one file
+
+        The stages run one after the other on this connection: validation
+        is a few string and time checks per event, far cheaper than handing
+        events to a worker, and resolve and the db stages share the one
+        connection. The concurrent part of an import is parsing:
+        bulk_import_files parses the next files on a process pool while
+        the current one goes through these stages
+
+        Args:
+            report: new_import_report of the file (its dry_run flag applies)
+            name_index: NameIndex shared by the files of one import
+                        (a new one is built if None)
+
+        Returns:
+            (bool,dict): see run_import_pipeline
+        """
+        problems=report["problems"]
+        dry_run=report["dry_run"]
+        report["events"]=len(events)
+
+        uids=[event["uid"] for event in events if event["uid"]]
+        try:
+            stored_uids={row[0] for row in self._read(
+                "SELECT uid FROM meetings WHERE tenant_id = current_tenant() AND uid = ANY(%s);",
+                (uids,),primary=True
+            )} if uids else set()
+        except Exception as e:
+            self.connection.rollback()
+            problems.append(import_problem(None,"","validate",f"Database error: {e}"))
+            return False, report
+        fields=self._validate_import_events(events,stored_uids)
+        clock.mark("validate")
+        try:
+            resolved,matches=self.resolve_event_participants(events,name_index)
+            clock.mark("resolve")
+        except Exception as e:
+            self.connection.rollback()
+            problems.append(import_problem(None,"","resolve",f"Database error: {e}"))
+            return False, report
+        report["names"]={name: match.as_dict() for name,match in matches.items()}
+
+        candidates=[]
+        for index,(event,checked,participant_ids) in enumerate(zip(events,fields,resolved)):
+            title=event["title"]
+            ok,cleaned,msg=checked
+            if not ok:
+                problems.append(import_problem(index,title,"validate",msg))
+
+            declared=len(event["attendee_emails"]) or len(event["participant_names"])
+            if not declared:
+                problems.append(import_problem(index,title,"resolve","no participants"))
+                continue
+            if not participant_ids:
+                problems.append(import_problem(index,title,"resolve",
+                                               "participants do not exist in database"))
+                continue
+            if len(participant_ids)<declared:
+                report["warnings"].append(import_problem(
+                    index,title,"resolve",
+                    f"{declared-len(participant_ids)} of {declared} participants not found"
+                ))
+
+            if ok:
+                title,description,location=cleaned
+                start,end=event["start_time"],event["end_time"]
+                candidates.append((index,(title,description,start,end,location,participant_ids,
+                                          meeting_fingerprint(title,start,end,location,participant_ids),
+                                          event["uid"] or new_uid())))
+
+        #partitions are committed on their own, before the write transaction
+        if not dry_run and not problems and candidates:
+            try:
+                self._ensure_partitions([meeting[2] for index,meeting in candidates])
+            except Error as e:
+                self.connection.rollback()
+                problems.append(import_problem(None,"","commit",f"Database error: {e}"))
+                return False, report
+
+        #problems of the stages before the db ones, kept when work() is retried
+        checked_problems=len(problems)
+
+        def work():
+            del problems[checked_problems:]
+            report["duplicates"]=0
+            accepted=self._check_import_candidates(candidates,report,clock)
+
+            if dry_run or problems:
+                self.connection.rollback()
+                return accepted, {}
+
+            meeting_ids=self._insert_meetings_batch([meeting for index,meeting in accepted])
+            clock.mark("commit")
+            return accepted, meeting_ids
+
+        try:
+            accepted,meeting_ids=self._run_transaction(work) if candidates else ([],{})
+        except Error as e:
+            problems.append(import_problem(None,"","commit",f"Database error: {e}"))
+            accepted,meeting_ids=[],{}
+
+        report["accepted"]=len(accepted)
+        if meeting_ids:
+            written=[meeting for index,meeting in accepted if meeting[6] in meeting_ids]
+            self._after_meetings_write(
+                {pid for meeting in written for pid in meeting[5]},
+                [(meeting[2],meeting[3]) for meeting in written]
+            )
+            report["imported"]=len(meeting_ids)
+            #inserted concurrently by someone else since the dedup stage
+            report["duplicates"]+=len(accepted)-len(meeting_ids)
+
+        return not problems, report
+
+    def _validate_import_events(self,events,stored_uids=()):
+        """
+        Validate stage of the import pipeline (no db access)
+        Events whose uid is in stored_uids may start in the past: they are
+        meetings already stored, dropped as duplicates later
+
+        Returns:
+            list: validate_meeting_fields result per event, in event order
+        """
+        return [
+            self.validate_meeting_fields(event["title"],event["description"],
+                                         event["start_time"],event["end_time"],
+                                         event["location"],
+                                         allow_past=event["uid"] in stored_uids)
+            for event in events
+        ]
+
+    def _check_import_candidates(self,candidates,report,clock):
+        """
+        Dedup and conflict stages of the import pipeline (no commit)
+
+        Duplicates are counted and dropped; events that overlap a stored
+        meeting or an earlier event of the file for a shared participant
+        are added to report["problems"]
+
+        Args:
+            candidates: list of (event index, meeting tuple as taken by
+                        _insert_meetings_batch)
+
+        Returns:
+            list: the (event index, meeting) pairs without duplicates
+        """
+        problems=report["problems"]
+
+        #dedup: fingerprints and uids already stored, then repeats within the file
+        #(changes to stored uids are applied by import_changes_from_file)
+        self.cursor.execute(
+            "SELECT fingerprint, uid FROM meetings "
+            "WHERE tenant_id = current_tenant() "
+            "AND (fingerprint = ANY(%s) OR uid = ANY(%s));",
+            ([meeting[6] for index,meeting in candidates],
+             [meeting[7] for index,meeting in candidates])
+        )
+        rows=self.cursor.fetchall()
+        seen={row[0] for row in rows}
+        seen_uids={row[1] for row in rows}
+        unique=[]
+        for index,meeting in candidates:
+            if meeting[6] in seen or meeting[7] in seen_uids:
+                report["duplicates"]+=1
+                continue
+            seen.add(meeting[6])
+            seen_uids.add(meeting[7])
+            unique.append((index,meeting))
+        clock.mark("dedup")
+        if not unique:
+            return unique
+
+        #conflicts: busy intervals of all involved persons, then the file itself
+        person_ids=sorted({pid for index,meeting in unique for pid in meeting[5]})
+        self._lock_participants(person_ids)
+        busy=self._load_busy_intervals(person_ids,
+                                       min(meeting[2] for index,meeting in unique),
+                                       max(meeting[3] for index,meeting in unique))
+        for index,meeting in unique:
+            start,end=meeting[2],meeting[3]
+            conflicting=[
+                pid for pid in meeting[5]
+                if any(s<end and e>start for s,e in busy.get(pid,[]))
+            ]
+            if conflicting:
+                problems.append(import_problem(index,meeting[0],"conflicts",
+                                               f"schedule conflict for person ids {conflicting}"))
+
+        overlaps=file_overlaps([(index,meeting[2],meeting[3],meeting[5]) for index,meeting in unique])
+        for index,meeting in unique:
+            if index in overlaps:
+                other,shared=overlaps[index]
+                problems.append(import_problem(
+                    index,meeting[0],"conflicts",
+                    f"overlaps event #{other+1} of the file for person ids {shared}"
+                ))
+        problems.sort(key=lambda problem: (problem["index"] is None,problem["index"] or 0))
+        clock.mark("conflicts")
+        return unique
+
+    #BULK IMPORT PART
+    def bulk_import_files(self,paths,workers=None,progress=None,dry_run=False):
+        """
+        Import many ics files at once
+
+        Files are parsed in parallel on a process pool (icalendar parsing
+        is CPU bound), while this connection is the single writer that
+        runs every parsed file through the stages of run_import_pipeline:
+        each file is imported all or nothing, in its own transaction, and
+        sees the meetings of the files committed before it
+
+        Args:
+            paths: list of files, directories or glob patterns
+            workers: number of parser processes (None = cpu count)
+            progress: optional callback(done,total,report) called after
+                      every file
+            dry_run: check every file without writing anything (each
+                     file against the stored meetings only)
+
+        Returns:
+            (bool,dict|str):
+                - True and a summary dict:
+                    {"files": [...per file pipeline reports...],
+                     "dry_run": bool, "events": int, "accepted": int,
+                     "imported": int, "duplicates": int,
+                     "failed_files": int, "elapsed": float,
+                     "events_per_sec": float}
+                - False and the summary of the files processed so far,
+                  with an "error" msg, when a file fails unexpectedly
+                  (the files before it stay committed)
+                - False and error msg when nothing was imported
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+
+        files=expand_ics_paths(paths)
+        if not files:
+            return False, "No .ics files found"
+
+        started=time.perf_counter()
+        summary={
+            "files": [],
+            "dry_run": dry_run,
+            "events": 0,
+            "accepted": 0,
+            "imported": 0,
+            "duplicates": 0,
+            "failed_files": 0,
+        }
+        name_index=self.new_name_index()
+
+        def merge(file_path,events,error):
+            report=new_import_report(file_path,dry_run)
+            if error:
+                report["problems"].append(import_problem(None,"","parse",error))
+            else:
+                self._run_import_stages(events,report,StageClock(report["timings"]),name_index)
+
+            if report["problems"]:
+                summary["failed_files"]+=1
+            summary["files"].append(report)
+            for key in ("events","accepted","imported","duplicates"):
+                summary[key]+=report[key]
+
+            if progress:
+                progress(len(summary["files"]),len(files),report)
+
+        try:
+            if workers==1 or len(files)==1:
+                for file_path in files:
+                    merge(*parse_ics_file(file_path))
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    futures=[pool.submit(parse_ics_file,file_path) for file_path in files]
+                    for future in as_completed(futures):
+                        merge(*future.result())
+
+        except Exception as e:
+            self.connection.rollback()
+            summary["error"]=f"Bulk import failed: {e}"
+
+        elapsed=time.perf_counter()-started
+        summary["elapsed"]=elapsed
+        summary["events_per_sec"]=summary["events"]/elapsed if elapsed>0 else 0.0
+        return "error" not in summary, summary
+
+    def _load_busy_intervals(self,person_ids,range_start,range_end):
+        """
+        Load the meetings of the given persons that overlap a range
+
+        Returns:
+            dict: person_id -> list of (start_time,end_time)
+        """
+        self.cursor.execute(
+            """
+            SELECT mp.person_id, m.start_time, m.end_time
+            FROM meetings m
+                JOIN meeting_participants mp ON {mp_join}
+            WHERE mp.person_id = ANY(%s::int[])
+              AND m.tenant_id = current_tenant()
+              AND m.start_time < %s AND m.end_time > %s
+              AND m.start_time > %s
+              AND m.deleted_at IS NULL;
+            """.format(mp_join=self.mp_join),
+            (list(person_ids),range_end,range_start,self._overlap_floor(range_start))
+        )
+        busy={}
+        for person_id,start,end in self.cursor.fetchall():
+            busy.setdefault(person_id,[]).append((start,end))
+        return busy
+
+    def _insert_meetings_batch(self,meetings):
+        """
+        Insert many validated meetings and their participants with
+        two multi-row statements (no commit)
+
+        Args:
+            meetings: list of tuples
+                (title,description,start_time,end_time,location,
+                 participant_ids,fingerprint,uid)
+
+        Returns:
+            dict: fingerprint -> meeting_id of the inserted meetings
+                  (meetings already in the db are skipped)
+        """
+        inserted=execute_values(
+            self.cursor,
+            """
+            INSERT INTO meetings
+                (title, description, start_time, end_time, location, fingerprint, uid)
+                VALUES %s
+                ON CONFLICT {dedup_target} DO NOTHING
+                RETURNING fingerprint, meeting_id;
+            """.format(dedup_target=self._dedup_target()),
+            [meeting[:5]+meeting[6:] for meeting in meetings],
+            fetch=True
+        )
+        meeting_ids=dict(inserted)
+
+        self._insert_participants([
+            (meeting_ids[meeting[6]],pid,meeting[2])
+            for meeting in meetings if meeting[6] in meeting_ids
+            for pid in meeting[5]
+        ])
+
+        return meeting_ids
+
+    #GROUP COMMIT PART
+    def write_batch(self,persons,meetings):
+        """
+        Validate and store a batch of persons and meetings with one commit
+        Used by WriteBatcher; persons are written first so meetings of the
+        same batch may reference them
+
+        Every item is checked against the db and against the items accepted
+        before it in the same batch (duplicate emails, duplicate meetings,
+        schedule conflicts), using one query per check for the whole batch
+
+        Args:
+            persons: list of (name,email,phone)
+            meetings: list of (title,description,start_time,end_time,location,participant_ids)
+
+        Returns:
+            (list,list): one (bool,str) result per person and per meeting,
+                         in input order
+        """
+        if not self.is_connected:
+            error=(False,"No database connection")
+            return [error]*len(persons), [error]*len(meetings)
+
+        person_results=[None]*len(persons)
+        meeting_results=[None]*len(meetings)
+
+        def work():
+            #a retried attempt validates the whole batch again
+            person_results[:]=[None]*len(persons)
+            meeting_results[:]=[None]*len(meetings)
+
+            new_persons=self._validate_persons_batch(persons,person_results)
+            if new_persons:
+                added=execute_values(
+                    self.cursor,
+                    """
+                    INSERT INTO persons (name, email, phone) VALUES %s
+                        ON CONFLICT (tenant_id, email) DO NOTHING
+                        RETURNING email;
+                    """,
+                    [person for index,person in new_persons],
+                    fetch=True
+                )
+                added={row[0] for row in added}
+                for index,(name,email,phone) in new_persons:
+                    if email in added:
+                        person_results[index]=(True,"Person added successfully")
+                    else:
+                        person_results[index]=(False,"Email already registered")
+
+            accepted=self._validate_meetings_batch(meetings,meeting_results)
+            if accepted:
+                meeting_ids=self._insert_meetings_batch([meeting for index,meeting in accepted])
+                for index,meeting in accepted:
+                    if meeting[6] in meeting_ids:
+                        meeting_results[index]=(True,"Meeting scheduled successfully")
+                    else:
+                        meeting_results[index]=(False,"Meeting already exists")
+            return accepted
+
+        try:
+            self._ensure_partitions([
+                to_aware(meeting[2]) for meeting in meetings if isinstance(meeting[2],datetime)
+            ])
+
+            accepted=self._run_transaction(work,serializable=self.serializable_scheduling)
+            written=[meeting for index,meeting in accepted if meeting_results[index][0]]
+            self._after_meetings_write(
+                {pid for meeting in written for pid in meeting[5]},
+                [(meeting[2],meeting[3]) for meeting in written]
+            )
+
+        except Error as e:
+            error=(False,f"Database error: {e}")
+            person_results=[error if r is None or r[0] else r for r in person_results]
+            meeting_results=[error if r is None or r[0] else r for r in meeting_results]
+
+        return person_results, meeting_results
+
+    def _validate_persons_batch(self,persons,results):
+        """
+        Validate a batch of persons, fill results of rejected ones
+
+        Returns:
+            list: (index,(name,email,phone)) of the persons to insert
+        """
+        valid=[]
+        for index,(name,email,phone) in enumerate(persons):
+            ok,name_or_msg=self.validate_name(name)
+            if not ok:
+                results[index]=(False,name_or_msg)
+                continue
+
+            ok,email_or_msg=self.validate_email(email)
+            if not ok:
+                results[index]=(False,email_or_msg)
+                continue
+
+            ok,phone_or_msg=self.validate_phone(phone)
+            if not ok:
+                results[index]=(False,phone_or_msg)
+                continue
+
+            valid.append((index,(name_or_msg,email_or_msg,phone_or_msg)))
+
+        if not valid:
+            return []
+
+        self.cursor.execute(
+            "SELECT email FROM persons WHERE tenant_id = current_tenant() AND email = ANY(%s);",
+            ([person[1] for index,person in valid],)
+        )
+        taken={row[0] for row in self.cursor.fetchall()}
+
+        new_persons=[]
+        for index,person in valid:
+            if person[1] in taken:
+                results[index]=(False,"Email already registered")
+                continue
+            taken.add(person[1])
+            new_persons.append((index,person))
+
+        return new_persons
+
+    def _validate_meetings_batch(self,meetings,results):
+        """
+        Validate a batch of meetings, fill results of rejected ones
+        Checks participants, fields, duplicates and conflicts against
+        the db and against the meetings accepted earlier in the batch
+
+        Returns:
+            list: (index,(title,description,start_time,end_time,location,
+                   participant_ids,fingerprint,uid)) of the meetings to insert
+        """
+        candidates=[]
+        for index,(title,description,start,end,location,participant_ids) in enumerate(meetings):
+            if not participant_ids:
+                results[index]=(False,"At least one participant is required")
+                continue
+            try:
+                ids=sorted({int(pid) for pid in participant_ids})
+            except (TypeError, ValueError):
+                results[index]=(False,"Invalid participant ID")
+                continue
+            if ids[0]<=0:
+                results[index]=(False,"Invalid participant ID")
+                continue
+
+            ok,fields,msg=self.validate_meeting_fields(title,description,start,end,location)
+            if not ok:
+                results[index]=(False,msg)
+                continue
+            title,description,location=fields
+            start,end=to_aware(start),to_aware(end)
+            fingerprint=meeting_fingerprint(title,start,end,location,ids)
+            candidates.append((index,(title,description,start,end,location,ids,fingerprint,new_uid())))
+
+        if not candidates:
+            return []
+
+        person_ids=sorted({pid for index,meeting in candidates for pid in meeting[5]})
+        self.cursor.execute(
+            "SELECT person_id, name FROM persons "
+            "WHERE person_id = ANY(%s::int[]) AND tenant_id = current_tenant();",
+            (person_ids,)
+        )
+        names=dict(self.cursor.fetchall())
+
+        self.cursor.execute(
+            "SELECT fingerprint FROM meetings "
+            "WHERE tenant_id = current_tenant() AND fingerprint = ANY(%s);",
+            ([meeting[6] for index,meeting in candidates],)
+        )
+        fingerprints={row[0] for row in self.cursor.fetchall()}
+
+        self._lock_participants(person_ids)
+        busy=self._load_busy_intervals(
+            person_ids,
+            min(meeting[2] for index,meeting in candidates),
+            max(meeting[3] for index,meeting in candidates)
+        )
+
+        accepted=[]
+        for index,meeting in candidates:
+            title,description,start,end,location,ids,fingerprint,uid=meeting
+
+            missing=[pid for pid in ids if pid not in names]
+            if missing:
+                results[index]=(False,f"Some participants do not exist in db: {missing}")
+                continue
+
+            if fingerprint in fingerprints:
+                results[index]=(False,"Meeting already exists")
+                continue
+
+            conflicting=sorted({
+                names[pid] for pid in ids
+                if any(s<end and e>start for s,e in busy.get(pid,[]))
+            })
+            if conflicting:
+                results[index]=(False,f"Schedule conflict for: {', '.join(conflicting)}")
+                continue
+
+            fingerprints.add(fingerprint)
+            for pid in ids:
+                busy.setdefault(pid,[]).append((start,end))
+            accepted.append((index,meeting))
+
+        return accepted
+
+    #PARTITIONS PART
+    def _partition_names(self,year,month):
+        """
+        Names of the meetings / meeting_participants partitions of a month
+
+        Returns:
+            (str,str)
+        """
+        suffix=f"p{year:04d}{month:02d}"
+        return f"meetings_{suffix}", f"meeting_participants_{suffix}"
+
+    def _list_partitions(self):
+        """
+        Names of the monthly partitions attached to meetings, oldest first
+
+        Returns:
+            list[str]
+        """
+        self.cursor.execute("""
+            SELECT c.relname
+            FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'meetings'::regclass
+            ORDER BY c.relname;
+        """)
+        return [row[0] for row in self.cursor.fetchall()]
+
+    def _ensure_partitions(self,times):
+        """
+        Create the missing monthly partitions for the given start times
+        No-op in the unpartitioned layout
+
+        Partitions are created and committed on their own, so this must be
+        called before a write transaction starts (not in the middle of one)
+
+        Returns:
+            None
+        """
+        if not self.partitioned:
+            return
+
+        #partitions are UTC months
+        months={(t.year,t.month) for t in map(to_utc,times)}-self.partitions
+        if not months:
+            return
+
+        #the room constraint only sees its own month, overlaps across a
+        #month boundary are caught by add_meeting's locked room check
+        for year,month in sorted(months):
+            meetings_name,participants_name=self._partition_names(year,month)
+            lower=datetime(year,month,1,tzinfo=UTC)
+            upper=datetime(year+1,1,1,tzinfo=UTC) if month==12 else datetime(year,month+1,1,tzinfo=UTC)
+            self.cursor.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {meetings_name}
+                    PARTITION OF meetings (
+                        CONSTRAINT {meetings_name}_room_no_overlap
+                            EXCLUDE USING gist (room_id WITH =, {self.range_type}(start_time, end_time) WITH &&)
+                            WHERE (deleted_at IS NULL AND room_id IS NOT NULL)
+                    ) FOR VALUES FROM (%s) TO (%s);
+                CREATE TABLE IF NOT EXISTS {participants_name}
+                    PARTITION OF meeting_participants FOR VALUES FROM (%s) TO (%s);
+                """, (lower,upper,lower,upper)
+            )
+
+        self.connection.commit()
+        self.partitions|=months
+
+    def create_partitions(self,start_time,end_time):
+        """
+        Create the monthly partitions covering [start_time, end_time]
+        ahead of time (they are also created on demand by every write)
+
+        Returns:
+            (bool,str)
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+        if not self.partitioned:
+            return False, "Meetings table is not partitioned"
+        start_time,end_time=to_utc(start_time),to_utc(end_time)
+        if end_time<start_time:
+            return False, "End time must be after start time"
+
+        months=[]
+        year,month=start_time.year,start_time.month
+        while (year,month)<=(end_time.year,end_time.month):
+            months.append(datetime(year,month,1,tzinfo=UTC))
+            year,month=(year+1,1) if month==12 else (year,month+1)
+
+        try:
+            self._ensure_partitions(months)
+            return True, f"{len(months)} monthly partitions ready"
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
+
+    def detach_partitions_before(self,cutoff):
+        """
+        Archive old data by detaching every monthly partition that ends
+        on or before cutoff
+
+        Detached partitions stay in the db as standalone tables (named
+        meetings_pYYYYMM / meeting_participants_pYYYYMM) and are no longer
+        seen by any query, they can be dumped and dropped separately
+
+        Returns:
+            (bool,list|str):
+                - True and the list of detached months ("YYYY-MM")
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+        if not self.partitioned:
+            return False, "Meetings table is not partitioned"
+
+        cutoff=to_aware(cutoff)
+        try:
+            detached=[]
+            for year,month in sorted(self.partitions):
+                upper=datetime(year+1,1,1,tzinfo=UTC) if month==12 else datetime(year,month+1,1,tzinfo=UTC)
+                if upper>cutoff:
+                    continue
+
+                meetings_name,participants_name=self._partition_names(year,month)
+                self.cursor.execute(f"ALTER TABLE meeting_participants DETACH PARTITION {participants_name};")
+
+                #the detached participant rows keep a foreign key to meetings,
+                #drop it or detaching the meetings partition is refused
+                self.cursor.execute(
+                    """
+                    SELECT conname FROM pg_constraint
+                    WHERE conrelid = %s::regclass AND contype = 'f'
+                      AND confrelid = 'meetings'::regclass;
+                    """, (participants_name,)
+                )
+                for (constraint,) in self.cursor.fetchall():
+                    self.cursor.execute(
+                        f'ALTER TABLE {participants_name} DROP CONSTRAINT "{constraint}";'
+                    )
+
+                self.cursor.execute(f"ALTER TABLE meetings DETACH PARTITION {meetings_name};")
+                self.connection.commit()
+
+                self.partitions.discard((year,month))
+                detached.append(f"{year:04d}-{month:02d}")
+
+            return True, detached
+
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
+
+    def explain_partitions(self,start_time,end_time,participant_ids=None):
+        """
+        Report which partitions the interval search (every mode) and the
+        conflict check scan for a range, from their EXPLAIN plans, and
+        which of them lie outside the range the query can match
+        (see check_partition_pruning)
+
+        Returns:
+            (bool,dict|str):
+                - True and {query: {"scanned": [names], "outside": [names]}}
+                  for the queries "interval_contained",
+                  "interval_overlapping", "interval_starts_within" and
+                  "conflicts"
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+
+        def relations(plan,found):
+            name=plan.get("Relation Name")
+            if name:
+                found.add(name)
+            for child in plan.get("Plans",[]):
+                relations(child,found)
+            return found
+
+        start_time,end_time=to_aware(start_time),to_aware(end_time)
+        floor=self._overlap_floor(start_time)
+        #query -> (query, params, lower bound of the start_time it can match)
+        queries={
+            f"interval_{mode}": self._interval_query(start_time,end_time,mode)
+                                +(floor if mode=="overlapping" else start_time,)
+            for mode in INTERVAL_MODES
+        }
+        queries["conflicts"]=self._conflict_query(participant_ids or [1],start_time,end_time)+(floor,)
+
+        try:
+            result={}
+            for key,(query,params,lower) in queries.items():
+                self.cursor.execute("EXPLAIN (FORMAT JSON) "+query,params)
+                plan=self.cursor.fetchone()[0][0]["Plan"]
+                scanned=sorted(relations(plan,set()))
+                result[key]={
+                    "scanned": scanned,
+                    "outside": [name for name in scanned
+                                if not partition_overlaps(name,lower,end_time)],
+                }
+
+            self.connection.commit()
+            return True, result
+
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
+
+    def check_partition_pruning(self,start_time,end_time,participant_ids=None):
+        """
+        Verify from the EXPLAIN plans that the interval search and the
+        conflict check of a range only scan the monthly partitions that
+        can hold a matching meeting (start_time from MAX_MEETING_LENGTH
+        before the range for overlap searches, to its end)
+
+        Returns:
+            (bool,dict|str):
+                - True and {query: [partitions outside the range]}, empty
+                  lists when every query is pruned
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+        if not self.partitioned:
+            return False, "Meetings table is not partitioned"
+
+        ok,result=self.explain_partitions(start_time,end_time,participant_ids)
+        if not ok:
+            return False, result
+        return True, {key: scans["outside"] for key,scans in result.items()}
+
+    #ARCHIVE PART
+    def setup_archive(self):
+        """
+        Install the meetings_archive table of archive.sql, used by
+        archive_meetings_before
+
+        Returns:
+            (bool,str)
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+
+        archive_path=os.path.join(os.path.dirname(__file__),"archive.sql")
+        if not os.path.exists(archive_path):
+            return False, "archive.sql not found"
+
+        try:
+            with open(archive_path,"r") as f:
+                self.cursor.execute(f.read())
+            self.connection.commit()
+            self.has_archive=True
+            return True, "Meeting archive installed"
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
+
+    def archive_meetings_before(self,cutoff=None,batch_size=ARCHIVE_BATCH,pause=ARCHIVE_PAUSE,progress=None):
+        """
+        Move the meetings that ended on or before cutoff (default:
+        ARCHIVE_HORIZON ago), with their participants, from the hot
+        tables into meetings_archive
+
+        Works in batches of batch_size meetings, each moved by one
+        statement in its own transaction, sleeping pause seconds between
+        batches; rows locked by concurrent writers are skipped and taken
+        by a later run. Cancelled meetings are only moved once their
+        cancellation is older than cutoff too, so incremental sync still
+        exports it
+
+        Archived meetings no longer take part in conflict checks, only
+        get_meetings_in_interval(..., include_archived=True) returns them;
+        the load summaries stop counting them (their triggers see a delete)
+        Works on both layouts; detach_partitions_before is the cheaper
+        whole-month alternative of the partitioned one
+
+        Args:
+            progress: optional callback(archived so far) after every batch
+
+        Returns:
+            (bool,dict|str):
+                - True and {"archived", "batches": int, "cutoff": datetime}
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+        if not self.has_archive:
+            return False, "Meeting archive not installed"
+        if batch_size<=0:
+            return False, "Batch size must be positive"
+
+        cutoff=to_aware(cutoff) if cutoff is not None else datetime.now(UTC)-ARCHIVE_HORIZON
+
+        def work():
+            #start_time < cutoff is implied by end_time <= cutoff, it lets
+            #the (tenant_id, start_time) index and partition pruning apply
+            self.cursor.execute(
+                """
+                WITH batch AS (
+                    SELECT meeting_id, start_time FROM meetings
+                    WHERE tenant_id = current_tenant()
+                      AND start_time < %s AND end_time <= %s
+                      AND (deleted_at IS NULL OR updated_at <= %s)
+                    ORDER BY start_time
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                ),
+                participants AS (
+                    SELECT mp.meeting_id, ARRAY_AGG(mp.person_id ORDER BY mp.person_id) AS ids
+                    FROM batch m
+                        JOIN meeting_participants mp ON {mp_join}
+                    GROUP BY mp.meeting_id
+                ),
+                moved AS (
+                    DELETE FROM meetings m USING batch b
+                    WHERE m.meeting_id = b.meeting_id AND m.start_time = b.start_time
+                    RETURNING m.*
+                )
+                INSERT INTO meetings_archive
+                    (meeting_id, tenant_id, uid, sequence, title, description,
+                     start_time, end_time, location, room_id, participant_ids,
+                     created_at, updated_at, deleted_at)
+                SELECT mv.meeting_id, mv.tenant_id, mv.uid, mv.sequence, mv.title,
+                       mv.description, mv.start_time, mv.end_time, mv.location,
+                       mv.room_id, COALESCE(pa.ids, '{{}}'), mv.created_at,
+                       mv.updated_at, mv.deleted_at
+                FROM moved mv
+                    LEFT JOIN participants pa ON pa.meeting_id = mv.meeting_id
+                RETURNING meeting_id, start_time, end_time, participant_ids;
+                """.format(mp_join=self.mp_join), (cutoff,cutoff,cutoff,batch_size)
+            )
+            return self.cursor.fetchall()
+
+        report={"archived": 0, "batches": 0, "cutoff": cutoff}
+        try:
+            while True:
+                rows=self._run_transaction(work)
+                if not rows:
+                    break
+
+                report["archived"]+=len(rows)
+                report["batches"]+=1
+                self._after_meetings_write(
+                    {pid for row in rows for pid in row[3]},
+                    [(start,end) for meeting_id,start,end,ids in rows],
+                    [row[0] for row in rows]
+                )
+                if progress:
+                    progress(report["archived"])
+                if len(rows)<batch_size:
+                    break
+                time.sleep(pause)
+
+            return True, report
+        except Error as e:
+            return False, f"Database error: {e}"
+
+    #INCREMENTAL SYNC PART
+    def export_changes_since(self,sync_token,file_path):
+        """
+        Export only the meetings created, updated or deleted since a sync token
+
+        Deleted meetings are written as STATUS:CANCELLED events and every
+        event carries its stored UID and SEQUENCE, so the receiving side
+        can apply the file with import_changes_from_file
+
+        Args:
+            sync_token: token returned by the previous call (None = everything)
+            file_path: target .ics file
+
+        Returns:
+            (bool,dict|str):
+                - True and {"exported": int, "sync_token": str}
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+
+        if not file_path:
+            return False, "No export file selected"
+        if not file_path.lower().endswith(".ics"):
+            return False, "File must be .ics file"
+
+        since=datetime.min.replace(tzinfo=UTC)
+        if sync_token:
+            try:
+                since=to_aware(datetime.fromisoformat(sync_token))-SYNC_OVERLAP
+            except ValueError:
+                return False, "Invalid sync token"
+
+        try:
+            #may run on a replica: its lag is kept below max_replica_lag,
+            #which must stay smaller than SYNC_OVERLAP
+            token_rows,rows=self._read_batch([
+                ("SELECT CURRENT_TIMESTAMP;",None),
+                ("""
+                SELECT m.uid, m.sequence, m.deleted_at IS NOT NULL,
+                       m.title, m.description, m.start_time, m.end_time, m.location,
+                       ARRAY_REMOVE(ARRAY_AGG(p.name ORDER BY p.name, p.person_id), NULL),
+                       ARRAY_REMOVE(ARRAY_AGG(p.email ORDER BY p.name, p.person_id), NULL)
+                FROM meetings m
+                    LEFT JOIN meeting_participants mp ON {mp_join}
+                    LEFT JOIN persons p ON mp.person_id = p.person_id
+                WHERE m.tenant_id = current_tenant() AND m.updated_at > %s
+                GROUP BY m.meeting_id, m.start_time
+                ORDER BY m.updated_at;
+                """.format(mp_join=self.mp_join), (since,))
+            ])
+            new_token=token_rows[0][0].isoformat()
+            self.connection.commit()
+
+            cal=new_calendar()
+            for uid,sequence,cancelled,title,description,start,end,location,names,emails in rows:
+                cal.add_component(build_event(
+                    uid,title,description,start,end,location,names,emails,
+                    sequence=sequence,cancelled=cancelled
+                ))
+
+            with open(file_path, "wb") as f:
+                f.write(cal.to_ical())
+
+            return True, {"exported": len(rows), "sync_token": new_token}
+
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
+        except Exception as e:
+            return False, f"Export failed: {e}"
+
+    def import_changes_from_file(self,file_path):
+        """
+        Apply an incremental sync file
+
+        Events are matched on UID: unknown UIDs are created, known UIDs
+        are only updated or cancelled when the event SEQUENCE is higher
+        than the stored one, everything else is skipped as already applied
+        The whole file is applied in one transaction
+
+        Returns:
+            (bool,dict|str):
+                - True and {"created","updated","cancelled","unchanged","rejected": int,
+                            "errors": [str], "names": {name: match report}}
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+
+        if not file_path:
+            return False,"No file selected"
+        if not file_path.lower().endswith(".ics"):
+            return False, "Invalid file type. Select .ics file"
+        if not os.path.exists(file_path):
+            return False, "File not found"
+
+        try:
+            with open(file_path, "rb") as f:
+                events=parse_events(f.read())
+        except Exception as e:
+            return False, f"Import failed: {e}"
+
+        def work():
+            report={"created": 0, "updated": 0, "cancelled": 0,
+                    "unchanged": 0, "rejected": 0, "errors": [], "names": {}}
+
+            uids=[event["uid"] for event in events if event["uid"]]
+            self.cursor.execute(
+                """
+                SELECT uid, meeting_id, sequence, deleted_at IS NOT NULL
+                FROM meetings WHERE tenant_id = current_tenant() AND uid = ANY(%s);
+                """, (uids,)
+            )
+            stored={uid: (meeting_id,sequence,deleted) for uid,meeting_id,sequence,deleted in self.cursor.fetchall()}
+
+            resolved,matches=self.resolve_event_participants(events)
+            report["names"]={name: match.as_dict() for name,match in matches.items()}
+            self._lock_participants({pid for ids in resolved for pid in ids})
+
+            touched=set()
+            for event,participant_ids in zip(events,resolved):
+                status,msg=self._apply_sync_event(event,stored,participant_ids,touched)
+                report[status]+=1
+                if msg:
+                    report["errors"].append(f"{event['title']}: {msg}")
+            return report,touched
+
+        try:
+            self._ensure_partitions([event["start_time"] for event in events])
+
+            report,touched=self._run_transaction(work)
+            #updated meetings may have moved: drop every cached interval
+            self._after_meetings_write(touched)
+            return True, report
+
+        except Error as e:
+            return False, f"Database error: {e}"
+        except Exception as e:
+            self.connection.rollback()
+            return False, f"Import failed: {e}"
+
+    def _apply_sync_event(self,event,stored,participant_ids,touched):
+        """
+        Apply one event of a sync file (no commit)
+        Ids of the persons whose meetings changed are added to touched
+
+        Returns:
+            (str,str): report key (created/updated/cancelled/unchanged/rejected)
+                       and error msg ("" if none)
+        """
+        uid=event["uid"]
+        known=stored.get(uid) if uid else None
+
+        if known and event["sequence"]<=known[1]:
+            return "unchanged",""
+
+        if event["cancelled"]:
+            if not known or known[2]:
+                return "unchanged",""
+            self.cursor.execute(
+                """
+                UPDATE meetings
+                SET deleted_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP,
+                    sequence = %s,
+                    fingerprint = NULL
+                WHERE meeting_id = %s;
+                """, (event["sequence"],known[0])
+            )
+            self.cursor.execute(
+                "SELECT person_id FROM meeting_participants WHERE meeting_id = %s;",
+                (known[0],)
+            )
+            touched.update(row[0] for row in self.cursor.fetchall())
+            stored[uid]=(known[0],event["sequence"],True)
+            return "cancelled",""
+
+        if not participant_ids:
+            return "rejected","participants do not exist in database"
+
+        #replicated changes keep meetings that already started
+        ok,fields,msg=self.validate_meeting_fields(
+            event["title"],event["description"],event["start_time"],
+            event["end_time"],event["location"],allow_past=True
+        )
+        if not ok:
+            return "rejected",msg
+        title,description,location=fields
+        start,end=event["start_time"],event["end_time"]
+
+        #on the transaction's own cursor, as add_meeting: sees the rows
+        #written earlier in this sync and lets db errors reach _run_transaction
+        query,params=self._conflict_query(
+            participant_ids,start,end,
+            exclude_meeting_id=known[0] if known else None
+        )
+        self.cursor.execute(query,params)
+        conflicts=self.cursor.fetchall()
+        if conflicts:
+            names=", ".join(sorted({name for kind,person_id,name in conflicts}))
+            return "rejected",f"Schedule conflict for: {names}"
+
+        if not known:
+            meeting_id=self._insert_meeting(
+                title,description,start,end,location,participant_ids,
+                uid=uid or None,sequence=event["sequence"]
+            )
+            if meeting_id is None:
+                return "unchanged",""
+            touched.update(participant_ids)
+            if uid:
+                stored[uid]=(meeting_id,event["sequence"],False)
+            return "created",""
+
+        fingerprint=meeting_fingerprint(title,start,end,location,participant_ids)
+        self.cursor.execute(
+            "SELECT 1 FROM meetings "
+            "WHERE tenant_id = current_tenant() AND fingerprint=%s AND meeting_id<>%s;",
+            (fingerprint,known[0])
+        )
+        if self.cursor.fetchone():
+            return "rejected","an identical meeting already exists"
+
+        self.cursor.execute(
+            """
+            UPDATE meetings
+            SET title = %s, description = %s, start_time = %s, end_time = %s,
+                location = %s, fingerprint = %s, sequence = %s,
+                updated_at = CURRENT_TIMESTAMP, deleted_at = NULL
+            WHERE meeting_id = %s;
+            """, (title,description,start,end,location,fingerprint,
+                  event["sequence"],known[0])
+        )
+        self.cursor.execute(
+            "DELETE FROM meeting_participants WHERE meeting_id = %s RETURNING person_id;",
+            (known[0],)
+        )
+        touched.update(row[0] for row in self.cursor.fetchall())
+        touched.update(participant_ids)
+        self._insert_participants([(known[0],pid,start) for pid in participant_ids])
+        stored[uid]=(known[0],event["sequence"],False)
+        return "updated",""
+
+    #OFFLINE SNAPSHOT PART
+    def export_snapshot(self,file_path):
+        """
+        Write every live meeting to a local snapshot file (see snapshot.py)
+        that open_snapshot can map for offline reads
+
+        Returns:
+            (bool,dict|str):
+                - True and {"meetings": int, "sync_token": str}
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+        if not file_path:
+            return False, "No snapshot file selected"
+
+        try:
+            token_rows,person_rows,meeting_rows=self._read_batch([
+                ("SELECT CURRENT_TIMESTAMP;",None),
+                ("SELECT person_id, name, email FROM persons WHERE tenant_id = current_tenant();",None),
+                ("""
+                SELECT m.meeting_id, m.uid, m.title, m.description,
+                       m.start_time, m.end_time, m.location, ARRAY_AGG(mp.person_id)
+                FROM meetings m
+                    JOIN meeting_participants mp ON {mp_join}
+                WHERE m.tenant_id = current_tenant() AND m.deleted_at IS NULL
+                GROUP BY m.meeting_id, m.start_time;
+                """.format(mp_join=self.mp_join),None)
+            ])
+            self.connection.commit()
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
+
+        persons={person_id: (name,email) for person_id,name,email in person_rows}
+        try:
+            count=self._replace_snapshot(file_path,persons,meeting_rows,token_rows[0][0])
+        except (OSError, ValueError) as e:
+            return False, f"Snapshot failed: {e}"
+        return True, {"meetings": count, "sync_token": token_rows[0][0].isoformat()}
+
+    def open_snapshot(self,file_path,offline=True):
+        """
+        Memory-map a snapshot file written by export_snapshot
+
+        With offline get_meetings_in_interval and check_conflicts answer
+        from the snapshot (binary searches, no db connection needed)
+        instead of the database; writes still need the database
+
+        Returns:
+            (bool,str): success flag and message
+        """
+        try:
+            snapshot=CalendarSnapshot(file_path)
+        except (OSError, ValueError) as e:
+            return False, f"Cannot open snapshot: {e}"
+
+        self.close_snapshot()
+        self.snapshot=snapshot
+        self.offline=offline
+        return True, f"Snapshot of {len(snapshot)} meetings as of {snapshot.sync_token}"
+
+    def close_snapshot(self):
+        """
+        Unmap the open snapshot and go back to reading the database
+
+        Returns:
+            None
+        """
+        if self.snapshot is not None:
+            self.snapshot.close()
+        self.snapshot=None
+        self.offline=False
+
+    def refresh_snapshot(self):
+        """
+        Bring the open snapshot up to date with the database
+
+        Only meetings created, updated or deleted since the snapshot's
+        sync token (minus SYNC_OVERLAP) are loaded; they are merged with
+        the rows of the old file, which is then rewritten and mapped again
+        Persons are reloaded completely, so renames reach every meeting
+
+        Returns:
+            (bool,dict|str):
+                - True and {"meetings": int, "changed": int, "sync_token": str}
+                - False and error msg on failure
+        """
         if not self.is_connected:
             return False, "No database connection"
+        if self.snapshot is None:
+            return False, "No snapshot open"
 
-        if not meetings:
-            return False, "No meetings to export"
+        since=self.snapshot.built_at-SYNC_OVERLAP
+        try:
+            token_rows,person_rows,changed_rows=self._read_batch([
+                ("SELECT CURRENT_TIMESTAMP;",None),
+                ("SELECT person_id, name, email FROM persons WHERE tenant_id = current_tenant();",None),
+                ("""
+                SELECT m.meeting_id, m.uid, m.title, m.description,
+                       m.start_time, m.end_time, m.location,
+                       ARRAY_REMOVE(ARRAY_AGG(mp.person_id), NULL),
+                       m.deleted_at IS NOT NULL
+                FROM meetings m
+                    LEFT JOIN meeting_participants mp ON {mp_join}
+                WHERE m.tenant_id = current_tenant() AND m.updated_at > %s
+                GROUP BY m.meeting_id, m.start_time;
+                """.format(mp_join=self.mp_join),(since,))
+            ])
+            self.connection.commit()
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
 
-        # file_path validations
-        if not file_path:
-            return False, "No export file selected"
-        if not file_path.lower().endswith(".ics"):
-            return False, "File must be .ics file"
+        meetings={row[0]: row for row in self.snapshot.rows()}
+        for row in changed_rows:
+            meetings.pop(row[0],None)
+            if not row[8]:
+                meetings[row[0]]=row[:8]
 
+        persons={person_id: (name,email) for person_id,name,email in person_rows}
         try:
-            # create calendar
-            cal=Calendar()
-            cal.add("prodid", "-//Meeting Scheduler//EN")
-            cal.add("version", "2.0")
+            count=self._replace_snapshot(self.snapshot.path,persons,meetings.values(),token_rows[0][0])
+        except (OSError, ValueError) as e:
+            return False, f"Snapshot refresh failed: {e}"
+        return True, {"meetings": count, "changed": len(changed_rows),
+                      "sync_token": token_rows[0][0].isoformat()}
 
-            # for every meeting create an VEVENT
-            for title,description,start_time,end_time,location,participants in meetings:
-                event = Event()
-                event.add("uid", f"{uuid.uuid4()}@meeting-scheduler")
-                event.add("summary", title)
-                event.add("description", f"{description}\nParticipants: {participants}")
-                event.add("location", location)
-                event.add("dtstart", start_time)
-                event.add("dtend", end_time)
-                event.add("dtstamp", datetime.utcnow())
+    def _replace_snapshot(self,file_path,persons,meetings,built_at):
+        """
+        Write a snapshot file; an open snapshot of the same file is
+        unmapped first and mapped again afterwards (same offline flag)
 
-                cal.add_component(event)
+        Returns:
+            int: number of meetings written
+        """
+        reopen=self.snapshot is not None and os.path.abspath(self.snapshot.path)==os.path.abspath(file_path)
+        offline=self.offline
+        if reopen:
+            #materialize the rows before the mapping goes away
+            meetings=list(meetings)
+            self.close_snapshot()
 
-            #write calendar to .ics file
-            with open(file_path, "wb") as f:
-                f.write(cal.to_ical())
+        try:
+            return write_snapshot(file_path,persons,meetings,built_at)
+        finally:
+            #the old file is still in place when writing failed
+            if reopen:
+                self.snapshot=CalendarSnapshot(file_path)
+                self.offline=offline
+
+    #STATS PART
+    def get_stats(self):
+        """
+        Overall counts of the database, for reporting
 
-            return True, "Exported meetings successfully"
+        Returns:
+            (bool,dict|str):
+                - True and {"persons", "rooms", "meetings", "cancelled",
+                  "upcoming", "participations", "first_start", "last_end"}
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
 
-        except Exception as e:
-            return False, f"Export failed: {str(e)}"
+        try:
+            rows=self._read(
+                """
+                SELECT
+                    (SELECT COUNT(*) FROM persons WHERE tenant_id = current_tenant()),
+                    (SELECT COUNT(*) FROM rooms WHERE tenant_id = current_tenant()),
+                    COUNT(*) FILTER (WHERE m.deleted_at IS NULL),
+                    COUNT(*) FILTER (WHERE m.deleted_at IS NOT NULL),
+                    COUNT(*) FILTER (WHERE m.deleted_at IS NULL
+                                       AND m.start_time >= CURRENT_TIMESTAMP),
+                    (SELECT COUNT(*) FROM meeting_participants mp
+                        JOIN meetings m ON {mp_join}
+                     WHERE m.tenant_id = current_tenant() AND m.deleted_at IS NULL),
+                    MIN(m.start_time) FILTER (WHERE m.deleted_at IS NULL),
+                    MAX(m.end_time) FILTER (WHERE m.deleted_at IS NULL)
+                FROM meetings m
+                WHERE m.tenant_id = current_tenant();
+                """.format(mp_join=self.mp_join)
+            )
+            keys=("persons","rooms","meetings","cancelled","upcoming",
+                  "participations","first_start","last_end")
+            return True, dict(zip(keys,rows[0]))
+        except Error as e:
+            return False, f"Database error: {e}"
 
+    def get_cache_stats(self):
+        """
+        Hit / miss counters of the in-process caches
 
-    #IMPORT MEETINGS PART
-    def get_person_id_by_name(self,names):
+        Returns:
+            dict: {"intervals": IntervalCache.stats(),
+                   "feeds": {"hits", "misses", "fragments", "feeds"}}
         """
-        Map a list of participant names to person_ids from the db
+        return {
+            "intervals": self.interval_cache.stats(),
+            "feeds": {
+                "hits": self.feed_cache.hits,
+                "misses": self.feed_cache.misses,
+                "fragments": len(self.feed_cache.fragments),
+                "feeds": len(self.feed_cache.feeds),
+            },
+        }
+
+    #CHANGE NOTIFICATIONS PART
+    def setup_change_notifications(self):
+        """
+        Install the NOTIFY triggers of notify.sql, so every client
+        learns about meetings written by the others
 
         Returns:
-            dict:
-                A dict mapping lowercase_name -> person_id
-                Returns {} if not connected or names list is empty
+            (bool,str)
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+
+        notify_path=os.path.join(os.path.dirname(__file__),"notify.sql")
+        if not os.path.exists(notify_path):
+            return False, "notify.sql not found"
+
+        try:
+            with open(notify_path,"r") as f:
+                self.cursor.execute(f.read())
+            self.connection.commit()
+            self.has_notify=True
+            return True, "Change notifications installed"
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
+
+    #TENANTS PART
+    def setup_row_security(self):
         """
+        Install the tenant_isolation policies of row_security.sql, so
+        sessions of an application role (not the table owner) can only
+        reach the rows of their own tenant
 
+        Returns:
+            (bool,str)
+        """
         if not self.is_connected:
-            return {}
+            return False, "No database connection"
 
-        new_names=[]
-        for name in names:
-            stripped=name.strip()
-            if stripped:
-                new_names.append(stripped)
+        security_path=os.path.join(os.path.dirname(__file__),"row_security.sql")
+        if not os.path.exists(security_path):
+            return False, "row_security.sql not found"
 
-        if not new_names:
-            return {}
+        try:
+            with open(security_path,"r") as f:
+                self.cursor.execute(f.read())
+            self.connection.commit()
+            return True, "Row level security installed"
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
 
-        #convert names to lowercase
-        lower_names=[]
-        for name in new_names:
-            lower_names.append(name.lower())
+    def start_change_listener(self):
+        """
+        Start the background LISTEN thread (on its own primary connection)
+        Received changes are queued until poll_changes() is called
 
-        #query
-        self.cursor.execute(
-            """
-            SELECT person_id,name FROM persons WHERE LOWER(name)=ANY(%s)
-            """, (lower_names,)
-        )
+        Returns:
+            (bool,str)
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+        if self.change_listener:
+            return True, "Change listener already running"
 
-        rows=self.cursor.fetchall()
+        self.change_listener=ChangeListener(self.connect_params,self.change_queue.put,
+                                            tenant_channel(self.tenant_id))
+        self.change_listener.start()
+        return True, "Change listener started"
 
-        result={}
-        for person_id,name in rows:
-            result[name.lower()]=person_id
+    def stop_change_listener(self):
+        """
+        Stop the background LISTEN thread
 
-        return result
+        Returns:
+            None
+        """
+        if self.change_listener:
+            self.change_listener.stop()
+            self.change_listener=None
+        #without notifications, writes of other clients would go unnoticed
+        self.interval_cache.clear()
 
-    def extract_participants(self, description):
+    def poll_changes(self):
         """
-        Extract participants from meeting description
+        Apply the changes queued by the listener; call it from the thread
+        that owns this manager (the Tk loop in the GUI)
+
+        Only the changed meetings are loaded (one query by id), the
+        caches of their participants are dropped
 
         Returns:
-            list[str]:
-                - List of participants names found after "Participants:"
-                - [] if none found
+            dict | None: None if nothing changed, otherwise
+                {"meetings": {meeting_id: Meeting} (live changed meetings),
+                 "removed": set of changed meeting_ids that are gone,
+                 "resync": True if notifications may have been lost}
         """
-        if not description:
-            return []
+        changes={}
+        resync=False
+        while True:
+            try:
+                batch=self.change_queue.get_nowait()
+            except queue.Empty:
+                break
+            if batch is None:
+                resync=True
+            else:
+                changes.update(batch)
 
-        text = str(description)
+        if not changes and not resync:
+            return None
+        if not self.is_connected:
+            return None
+
+        if resync:
+            self.feed_cache.clear_feeds()
+            self.interval_cache.clear()
 
-        lines = text.splitlines()
+        #the notification was sent after the commit on the primary,
+        #a replica may not have replayed it yet
+        self.replica_set.pin_primary()
 
-        for line in lines:
-            line_stripped = line.strip()
-            if line_stripped.lower().startswith("participants:"):
-                parts = line_stripped.split(":", 1)
-                if len(parts) < 2:
-                    return []
+        ids=list(changes)
+        ok,meetings=self.get_meetings_by_ids(ids)
+        if not ok:
+            return {"meetings": {}, "removed": set(), "resync": True}
 
-                names_part = parts[1]
+        try:
+            self.cursor.execute(
+                "SELECT DISTINCT person_id FROM meeting_participants WHERE meeting_id = ANY(%s::int[]);",
+                (ids,)
+            )
+            self._invalidate_caches([row[0] for row in self.cursor.fetchall()],
+                                    list(changes.values()),changes)
+            self.connection.commit()
+        except Error:
+            self.connection.rollback()
+            self.feed_cache.clear_feeds()
+            self.interval_cache.clear()
+
+        found={meeting.meeting_id: meeting for meeting in meetings}
+        return {
+            "meetings": found,
+            "removed": set(ids)-set(found),
+            "resync": resync,
+        }
+
+    #LOAD SUMMARIES PART
+    def setup_load_summaries(self):
+        """
+        Install the per day load summaries (summaries.sql): the
+        person_daily_load / location_daily_load tables, the triggers that
+        keep them up to date on every write and an initial rebuild
 
-                participants = []
-                for name in names_part.split(","):
-                    name = name.strip()
-                    if name:
-                        participants.append(name)
+        Returns:
+            (bool,str)
+        """
+        if not self.is_connected:
+            return False, "No database connection"
 
-                return participants
+        summaries_path=os.path.join(os.path.dirname(__file__),"summaries.sql")
+        if not os.path.exists(summaries_path):
+            return False, "summaries.sql not found"
 
-        return []
+        try:
+            with open(summaries_path,"r") as f:
+                self.cursor.execute(f.read())
+            self.cursor.execute("SELECT rebuild_load_summaries();")
+            self.connection.commit()
+            return True, "Load summaries installed"
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
 
-    def remove_participants_description(self,description):
+    def rebuild_load_summaries(self):
         """
-        Remove "Participants:" line from description when importing
+        Recompute the load summaries from the raw meetings
+        Needed only after maintenance that bypasses triggers
+        (e.g. detach_partitions_before keeps the archived months counted)
 
         Returns:
-            str:
-                Description without "Participants: line
-                "" if description is empty
+            (bool,str)
         """
-        if not description:
-            return ""
+        if not self.is_connected:
+            return False, "No database connection"
 
-        lines=str(description).splitlines()
-        kept=[]
+        try:
+            self.cursor.execute("SELECT rebuild_load_summaries();")
+            self.connection.commit()
+            return True, "Load summaries rebuilt"
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
 
-        for line in lines:
-            stripped=line.strip()
-            if stripped.lower().startswith("participants:"):
-                continue #skip line
-            kept.append(stripped)
+    def _load_query(self,table,key,key_type,start_date,end_date,keys,period):
+        """
+        Build the per day / per week query over one summary table
 
-        return "\n".join(kept).strip()
+        Returns:
+            (str,tuple)
+        """
+        if period not in ("day","week"):
+            raise ValueError(f"Unknown period: {period}")
+
+        bucket="day" if period=="day" else "date_trunc('week', day)::date"
+        query=f"""
+            SELECT {key}, {bucket} AS period_start,
+                   SUM(meetings)::int, SUM(busy_seconds) / 3600.0
+            FROM {table}
+            WHERE tenant_id = current_tenant()
+              AND day >= %s AND day <= %s
+              AND (%s::{key_type}[] IS NULL OR {key} = ANY(%s::{key_type}[]))
+            GROUP BY {key}, period_start
+            ORDER BY {key}, period_start;
+        """
+        keys=list(keys) if keys else None
+        return query, (start_date,end_date,keys,keys)
 
-    def import_meetings_from_file(self,file_path):
+    def get_person_load(self,start_date,end_date,person_ids=None,period="day"):
         """
-        Import meetings from ics file and insert in db
+        Number of meetings and busy hours of every person per day or week,
+        read from the person_daily_load summary (see setup_load_summaries)
+
+        A meeting spanning several days counts once on each of its days
+
+        Args:
+            start_date, end_date: inclusive date range
+            person_ids: restrict to these persons (None = everybody)
+            period: "day" or "week" (weeks start on Monday)
 
         Returns:
-            (bool,str):
-                - True and success msg with imported count
+            (bool,list|str):
+                - True and rows (person_id, period_start, meetings, busy_hours)
                 - False and error msg on failure
         """
-
         if not self.is_connected:
             return False, "No database connection"
 
-        #validations for file_path
-        if not file_path:
-            return False,"No file selected"
-        if not file_path.lower().endswith(".ics"):
-            return False, "Invalid file type. Select .ics file"
-        if not os.path.exists(file_path):
-            return False, "File not found"
-
         try:
-            with open(file_path, "rb") as f:
-                #transform text in Calendar object
-                cal = Calendar.from_ical(f.read())
-
-            imported = 0
-            for component in cal.walk():
-                #if component is not an event skip it
-                if component.name != "VEVENT":
-                    continue
-
-                #extract fields
-                title =str(component.get("summary", "")).strip()
-                description =str(component.get("description", "")).strip()
-                location =str(component.get("location", "")).strip()
-                dtstart_obj=component.get("dtstart")
-                dtend_obj=component.get("dtend")
+            query,params=self._load_query(
+                "person_daily_load","person_id","int",start_date,end_date,person_ids,period
+            )
+            return True, self._read(query,params)
+        except ValueError as e:
+            return False, str(e)
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
 
-                if not dtstart_obj or not dtend_obj:
-                    continue
+    def get_location_load(self,start_date,end_date,locations=None,period="day"):
+        """
+        Number of meetings and busy hours of every location per day or week,
+        read from the location_daily_load summary (see setup_load_summaries)
 
-                # convert to datetime object
-                start_dt=dtstart_obj.dt
-                end_dt=dtend_obj.dt
+        Returns:
+            (bool,list|str):
+                - True and rows (location, period_start, meetings, busy_hours)
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
 
-                #remove tzinfo and convert to local time
-                if start_dt.tzinfo is not None:
-                    start_dt = start_dt.astimezone().replace(tzinfo=None)
-                if end_dt.tzinfo is not None:
-                    end_dt = end_dt.astimezone().replace(tzinfo=None)
+        try:
+            query,params=self._load_query(
+                "location_daily_load","location","text",start_date,end_date,locations,period
+            )
+            return True, self._read(query,params)
+        except ValueError as e:
+            return False, str(e)
+        except Error as e:
+            self.connection.rollback()
+            return False, f"Database error: {e}"
+    #ROOMS PART
+    def add_room(self,name,capacity=None):
+        """
+        Adds a bookable room
 
-                if end_dt <= start_dt:
-                    return False, f"Invalid time interval for {title}"
+        Returns:
+            (bool,str)
+        """
+        if not self.is_connected:
+            return False, "No database connection"
 
-                #extract participants from description
-                participant_names=self.extract_participants(description)
-                #added validation
-                if not participant_names:
-                    return False,f"Event {title} has not participants. Add participants"
+        ok,name,msg=self.clean_str(name,"Room name",max_len=200)
+        if not ok:
+            return False, msg
 
-                new_description=self.remove_participants_description(description)
+        if capacity is not None:
+            try:
+                capacity=int(capacity)
+            except (TypeError, ValueError):
+                return False, "Capacity must be a number"
+            if capacity<=0:
+                return False, "Capacity must be positive"
 
-                # create the list of participant ids from their names
-                # for inserting in db
-                name_to_id =self.get_person_id_by_name(participant_names)
-                participant_ids=[]
+        def work():
+            self.cursor.execute(
+                """
+                INSERT INTO rooms (name, capacity) VALUES (%s, %s)
+                ON CONFLICT (tenant_id, name) DO NOTHING
+                RETURNING room_id;
+                """, (name,capacity)
+            )
+            return self.cursor.fetchone() is not None
 
-                for name in participant_names:
-                    person_id=name_to_id.get(name.lower())
-                    if person_id:
-                        participant_ids.append(person_id)
+        try:
+            if not self._run_transaction(work):
+                return False, "Room already exists"
 
-                # added validation
-                if not participant_ids:
-                    return False,f"Participants for {title} do not exist in database"
+            self.replica_set.pin_primary()
+            return True, "Room added successfully"
+        except Error as e:
+            return False, f"Database error: {e}"
 
-                # skip duplicate meetings
-                # for not importing them multiple times
-                if self.meeting_exists(title,start_dt,end_dt,location,participant_ids):
-                    continue
+    def get_all_rooms(self):
+        """
+        Fetch all rooms for GUI selection
 
-                success, message = self.add_meeting(
-                    title=title,
-                    description=new_description,
-                    start_time=start_dt,
-                    end_time=end_dt,
-                    location=location,
-                    participant_ids=participant_ids
-                )
+        Returns:
+            -True, list[(room_id,name,capacity)]
+            -False, msg
+        """
+        if not self.is_connected:
+            return False, "No database connection"
+        try:
+            return True,self._read(
+                "SELECT room_id,name,capacity FROM rooms "
+                "WHERE tenant_id = current_tenant() ORDER BY name;"
+            )
+        except Error as e:
+            return False, f"Database error: {e}"
 
-                if not success:
-                    return False, f"Import stopped at {title}: {message}"
+    def find_free_rooms(self,start_time,end_time,min_capacity=None):
+        """
+        Rooms without a live meeting overlapping [start_time, end_time),
+        smallest fitting room first
+        Every room is probed on the (room_id, time range) exclusion index
 
-                imported+= 1
+        Returns:
+            (bool,list|str):
+                - True and rows (room_id, name, capacity)
+                - False and error msg on failure
+        """
+        if not self.is_connected:
+            return False, "No database connection"
 
-            return True, f"Imported {imported} meetings successfully"
+        start_time,end_time=to_aware(start_time),to_aware(end_time)
+        if end_time<=start_time:
+            return False, "End time must be after start time"
 
-        except Exception as e:
+        try:
+            rows=self._read(
+                """
+                SELECT r.room_id, r.name, r.capacity
+                FROM rooms r
+                WHERE r.tenant_id = current_tenant()
+                  AND (%s::int IS NULL OR r.capacity >= %s)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM meetings m
+                      WHERE m.room_id = r.room_id
+                        AND {range_type}(m.start_time, m.end_time) && {range_type}(%s, %s)
+                        AND m.start_time > %s
+                        AND m.deleted_at IS NULL
+                  )
+                ORDER BY r.capacity NULLS LAST, r.name;
+                """.format(range_type=self.range_type), (min_capacity,min_capacity,start_time,end_time,
+                      self._overlap_floor(start_time))
+            )
+            return True, rows
+        except Error as e:
             self.connection.rollback()
-            return False, f"Import failed: {str(e)}"
-
+            return False, f"Database error: {e}"
 
     def clean_str(self,s,field,allow_empty=False,max_len=None):
         """
@@ -777,6 +3678,49 @@ class DatabaseManager:
 
         return True,s,""
 
+    def validate_meeting_fields(self,title,description,start_time,end_time,location,allow_past=False):
+        """
+        Validate the non-participant fields of a meeting
+
+        Rules:
+            - Title required, max length 100
+            - Description optional, max length 1000
+            - Location optional, max length 100
+            - Start/end must be datetime values, end after start
+              (naive values are local times)
+            - Start cannot be in the past, unless allow_past (changes
+              replicated from another calendar, meetings already stored)
+
+        Returns:
+            (bool,tuple,str):
+                - success flag
+                - cleaned (title,description,location)
+                - error msg ("" if success)
+        """
+        ok,title,msg=self.clean_str(title,"Title",allow_empty=False,max_len=100)
+        if not ok:
+            return False,(),msg
+
+        ok,description,msg=self.clean_str(description,"Description",allow_empty=True,max_len=1000)
+        if not ok:
+            return False,(),msg
+
+        ok,location,msg=self.clean_str(location,"Location",allow_empty=True,max_len=100)
+        if not ok:
+            return False,(),msg
+
+        if not isinstance(start_time,datetime) or not isinstance(end_time,datetime):
+            return False,(),"Start and end times must be datetime values"
+
+        start_time,end_time=to_aware(start_time),to_aware(end_time)
+        if end_time<=start_time:
+            return False,(),"End time must be after start time"
+
+        if not allow_past and start_time< datetime.now(UTC):
+            return False,(),"Meeting cannot be scheduled in the past"
+
+        return True,(title,description,location),""
+
     def validate_name(self,name):
         """
         Validate a person name
@@ -854,3 +3798,26 @@ class DatabaseManager:
 
         return True,phone
 
+
+    def validate_timezone(self,timezone):
+        """
+        Validate a time zone name
+
+        Rules:
+            - Optional field
+            - Must be an IANA zone name (e.g. Europe/Bucharest)
+
+        Returns:
+            (bool,str):
+                - True and clean zone name (or None) if valid
+                - False and error msg if invalid
+        """
+        if timezone is None or str(timezone).strip()=="":
+            return True, None
+
+        timezone=str(timezone).strip()
+
+        if len(timezone)>64 or not is_valid_zone(timezone):
+            return False,f"Unknown time zone: {timezone}"
+
+        return True,timezone
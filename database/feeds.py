@@ -0,0 +1,123 @@
+from collections import OrderedDict
+
+FEED_HEADER = (
+    b"BEGIN:VCALENDAR\r\n"
+    b"VERSION:2.0\r\n"
+    b"PRODID:-//Meeting Scheduler//EN\r\n"
+)
+FEED_FOOTER = b"END:VCALENDAR\r\n"
+
+
+class FeedCache:
+    """
+    In-memory cache for per-person ICS feeds
+
+    Holds two levels:
+        - rendered VEVENT fragments, keyed by (meeting_id, sequence, zone),
+          bounded with LRU eviction; a changed meeting gets a new
+          sequence so stale fragments are never served
+        - assembled feeds keyed by person_id, dropped whenever a write
+          touches that person
+    """
+
+    def __init__(self, max_fragments=10000):
+        """
+        Initialize an empty cache
+
+        Returns:
+            None
+        """
+        self.max_fragments = max_fragments
+        self.fragments = OrderedDict()
+        self.feeds = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_fragment(self, meeting_id, sequence, zone=None):
+        """
+        Return a cached VEVENT fragment rendered in zone
+
+        Returns:
+            bytes | None
+        """
+        key = (meeting_id, sequence, zone)
+        fragment = self.fragments.get(key)
+        if fragment is None:
+            self.misses += 1
+            return None
+
+        self.fragments.move_to_end(key)
+        self.hits += 1
+        return fragment
+
+    def put_fragment(self, meeting_id, sequence, fragment, zone=None):
+        """
+        Store a rendered VEVENT fragment, evicting the least recently used
+
+        Returns:
+            None
+        """
+        key = (meeting_id, sequence, zone)
+        self.fragments[key] = fragment
+        self.fragments.move_to_end(key)
+        while len(self.fragments) > self.max_fragments:
+            self.fragments.popitem(last=False)
+
+    def get_feed(self, person_id):
+        """
+        Return the assembled feed of a person if still valid
+
+        Returns:
+            bytes | None
+        """
+        return self.feeds.get(person_id)
+
+    def put_feed(self, person_id, feed):
+        """
+        Store the assembled feed of a person
+
+        Returns:
+            None
+        """
+        self.feeds[person_id] = feed
+
+    def invalidate_persons(self, person_ids):
+        """
+        Drop the assembled feeds of the given persons
+        Their fragments stay cached, only changed meetings are re-rendered
+
+        Returns:
+            None
+        """
+        for person_id in person_ids:
+            self.feeds.pop(person_id, None)
+
+    def clear_feeds(self):
+        """
+        Drop every assembled feed, keep the fragments
+
+        Returns:
+            None
+        """
+        self.feeds.clear()
+
+    def clear(self):
+        """
+        Drop everything
+
+        Returns:
+            None
+        """
+        self.fragments.clear()
+        self.feeds.clear()
+
+
+def assemble_feed(fragments, timezones=b""):
+    """
+    Join rendered VEVENT fragments into a full calendar, after the
+    rendered VTIMEZONE components their TZIDs refer to
+
+    Returns:
+        bytes
+    """
+    return FEED_HEADER + timezones + b"".join(fragments) + FEED_FOOTER
@@ -0,0 +1,52 @@
+import hashlib
+import uuid
+
+from .timezones import to_utc
+
+UID_DOMAIN = "meeting-scheduler"
+
+
+def meeting_fingerprint(title, start_time, end_time, location, participant_ids):
+    """
+    Stable content hash of a meeting
+
+    Hashed over title, start/end times (as UTC), location and the sorted
+    set of participant ids, so the same meeting always gets the same value
+    no matter the participant order or the zone its times are given in
+
+    Returns:
+        str: 64 character sha256 hex digest
+    """
+    ids = ",".join(str(pid) for pid in sorted({int(pid) for pid in participant_ids}))
+    key = "\x1f".join([
+        title or "",
+        utc_isoformat(start_time),
+        utc_isoformat(end_time),
+        location or "",
+        ids,
+    ])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def utc_isoformat(value):
+    """
+    ISO format of a datetime in UTC, without offset
+    (naive values are local times, as everywhere else, see timezones.to_utc)
+
+    Returns:
+        str
+    """
+    return to_utc(value).replace(tzinfo=None).isoformat()
+
+
+def new_uid():
+    """
+    Random UID given to a meeting when it is created
+    The stored UID never changes afterwards, even when the meeting is updated,
+    so every export of a meeting writes the same UID
+
+    Returns:
+        str: uid in the form "<uuid>@meeting-scheduler"
+    """
+    return f"{uuid.uuid4()}@{UID_DOMAIN}"
+
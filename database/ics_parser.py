@@ -0,0 +1,260 @@
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+from .timezones import UTC, get_zone, to_utc
+
+#icalendar is imported inside the functions that need it, so starting
+#the application does not pay for it until an import/export is used
+
+
+def new_calendar():
+    """
+    Create an empty calendar with the application PRODID
+
+    Returns:
+        icalendar.Calendar
+    """
+    from icalendar import Calendar
+
+    cal=Calendar()
+    cal.add("prodid", "-//Meeting Scheduler//EN")
+    cal.add("version", "2.0")
+    return cal
+
+
+def add_timezones(cal,first,last):
+    """
+    Add the VTIMEZONE of every zone used by the events of cal,
+    with the transitions between the datetimes first and last
+
+    Returns:
+        None
+    """
+    cal.add_missing_timezones(
+        first_date=first.date()-timedelta(days=1),
+        last_date=last.date()+timedelta(days=1)
+    )
+
+
+@lru_cache(maxsize=None)
+def vtimezone(zone):
+    """
+    Rendered VTIMEZONE of an IANA zone, for feeds that are assembled
+    from cached fragments
+
+    Returns:
+        bytes
+    """
+    from icalendar import Timezone
+
+    return Timezone.from_tzinfo(get_zone(zone),tzid=zone).to_ical()
+
+
+def build_event(uid,title,description,start_time,end_time,location,
+                names,emails,sequence=None,cancelled=False,zone=None):
+    """
+    Build the VEVENT of one meeting
+    Every participant is written as an ATTENDEE (mailto:email, CN=name)
+    Times are written with the TZID of zone (an IANA name), in UTC
+    without one; the calendar needs the matching VTIMEZONE
+
+    Returns:
+        icalendar.Event
+    """
+    from icalendar import Event, vCalAddress
+
+    if zone and zone!="UTC":
+        tz=get_zone(zone)
+        start_time,end_time=start_time.astimezone(tz),end_time.astimezone(tz)
+    else:
+        start_time,end_time=to_utc(start_time),to_utc(end_time)
+
+    event = Event()
+    event.add("uid", uid)
+    event.add("summary", title)
+    event.add("description", description or "")
+    event.add("location", location)
+    for name,email in zip(names,emails):
+        attendee=vCalAddress(f"mailto:{email}")
+        attendee.params["cn"]=name
+        attendee.params["role"]="REQ-PARTICIPANT"
+        event.add("attendee", attendee, encode=0)
+    event.add("dtstart", start_time)
+    event.add("dtend", end_time)
+    event.add("dtstamp", datetime.now(UTC))
+    if sequence is not None:
+        event.add("sequence", sequence)
+    if cancelled:
+        event.add("status", "CANCELLED")
+
+    return event
+
+
+def extract_participants(description):
+    """
+    Extract participants from meeting description
+
+    Returns:
+        list[str]:
+            - List of participants names found after "Participants:"
+            - [] if none found
+    """
+    if not description:
+        return []
+
+    text = str(description)
+
+    lines = text.splitlines()
+
+    for line in lines:
+        line_stripped = line.strip()
+        if line_stripped.lower().startswith("participants:"):
+            parts = line_stripped.split(":", 1)
+            if len(parts) < 2:
+                return []
+
+            names_part = parts[1]
+
+            participants = []
+            for name in names_part.split(","):
+                name = name.strip()
+                if name:
+                    participants.append(name)
+
+            return participants
+
+    return []
+
+
+def remove_participants_description(description):
+    """
+    Remove "Participants:" line from description when importing
+
+    Returns:
+        str:
+            Description without "Participants: line
+            "" if description is empty
+    """
+    if not description:
+        return ""
+
+    lines=str(description).splitlines()
+    kept=[]
+
+    for line in lines:
+        stripped=line.strip()
+        if stripped.lower().startswith("participants:"):
+            continue #skip line
+        kept.append(stripped)
+
+    return "\n".join(kept).strip()
+
+
+def extract_attendee_emails(component):
+    """
+    Extract the lowercase email addresses of the ATTENDEE properties of an event
+
+    Returns:
+        list[str]: emails in file order ([] if the event has no attendees)
+    """
+    attendees = component.get("attendee", [])
+    if not isinstance(attendees, list):
+        attendees = [attendees]
+
+    emails = []
+    for attendee in attendees:
+        value = str(attendee).strip()
+        if value.lower().startswith("mailto:"):
+            value = value[len("mailto:"):]
+        value = value.strip().lower()
+        if value and value not in emails:
+            emails.append(value)
+
+    return emails
+
+
+def parse_events(data,zone=None):
+    """
+    Parse the content of an ics file into plain event dicts
+
+    Only plain python values are returned so the result can be
+    sent back from a worker process: times are converted to UTC
+    (TZID times via the VTIMEZONE of the file or the IANA zone of that
+    name, floating times and all-day dates are taken in zone, the
+    local zone by default)
+
+    Returns:
+        list[dict]: one dict per VEVENT with keys
+            uid, sequence, cancelled, title, description, location,
+            start_time, end_time, attendee_emails, participant_names
+            (participant_names is only used by files without ATTENDEE
+            lines, which carry names in a "Participants:" description line)
+    """
+    from icalendar import Calendar
+
+    #transform text in Calendar object
+    cal = Calendar.from_ical(data)
+
+    events=[]
+    for component in cal.walk():
+        #if component is not an event skip it
+        if component.name != "VEVENT":
+            continue
+
+        #extract fields
+        title =str(component.get("summary", "")).strip()
+        description =str(component.get("description", "")).strip()
+        location =str(component.get("location", "")).strip()
+        dtstart_obj=component.get("dtstart")
+        dtend_obj=component.get("dtend")
+
+        if not dtstart_obj or not dtend_obj:
+            continue
+
+        # convert to datetime object
+        start_dt=dtstart_obj.dt
+        end_dt=dtend_obj.dt
+
+        start_dt=to_utc(start_dt,zone)
+        end_dt=to_utc(end_dt,zone)
+
+        #sync fields, missing in files from other calendars
+        uid =str(component.get("uid", "")).strip()
+        try:
+            sequence =int(component.get("sequence", 0))
+        except (TypeError, ValueError):
+            sequence = 0
+        cancelled =str(component.get("status", "")).strip().upper()=="CANCELLED"
+
+        events.append({
+            "uid": uid,
+            "sequence": sequence,
+            "cancelled": cancelled,
+            "title": title,
+            "description": remove_participants_description(description),
+            "location": location,
+            "start_time": start_dt,
+            "end_time": end_dt,
+            "attendee_emails": extract_attendee_emails(component),
+            "participant_names": extract_participants(description),
+        })
+
+    return events
+
+
+def parse_ics_file(file_path):
+    """
+    Read and parse a single ics file
+    Used as the worker function of the bulk import process pool
+
+    Returns:
+        (str,list,str):
+            - file path
+            - list of parsed events ([] on failure)
+            - error msg ("" if success)
+    """
+    try:
+        with open(file_path, "rb") as f:
+            return file_path, parse_events(f.read()), ""
+    except Exception as e:
+        return file_path, [], f"Parse failed: {e}"
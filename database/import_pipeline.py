@@ -0,0 +1,167 @@
+import time
+
+#stages of the import pipeline, in order; problems name the stage they come from
+IMPORT_STAGES = ("parse", "validate", "resolve", "dedup", "conflicts", "commit")
+
+#problems listed in a formatted report before it is cut short
+MAX_LISTED_PROBLEMS = 20
+
+
+def new_import_report(source, dry_run=False):
+    """
+    Empty report of one pipeline run
+
+    Returns:
+        dict
+    """
+    return {
+        "file": source,
+        "dry_run": dry_run,
+        "events": 0,
+        "accepted": 0,
+        "imported": 0,
+        "duplicates": 0,
+        "problems": [],
+        "warnings": [],
+        "names": {},
+        "timings": {},
+    }
+
+
+def import_problem(index, title, stage, message):
+    """
+    Problem (or warning) entry of an import report
+
+    Args:
+        index: position of the event in the file, None for the whole file
+
+    Returns:
+        dict
+    """
+    return {"index": index, "title": title, "stage": stage, "message": message}
+
+
+class StageClock:
+    """
+    Wall time of consecutive pipeline stages, stored in report["timings"]
+    """
+
+    def __init__(self, timings):
+        self.timings = timings
+        self.last = time.perf_counter()
+
+    def mark(self, stage):
+        """
+        Record the time since the previous mark as the time of `stage`
+
+        Returns:
+            None
+        """
+        now = time.perf_counter()
+        self.timings[stage] = self.timings.get(stage, 0.0) + now - self.last
+        self.last = now
+
+
+def file_overlaps(candidates):
+    """
+    Events of one file that overlap an earlier event of the same file
+    for a shared participant
+
+    Args:
+        candidates: list of (index, start, end, participant_ids), in file order
+
+    Returns:
+        dict: index -> (earlier index, sorted shared person_ids)
+    """
+    overlaps = {}
+    busy = {}
+    #sweep by start time, earlier file position first on ties
+    for index, start, end, participant_ids in sorted(candidates, key=lambda c: (c[1], c[0])):
+        shared = {}
+        for pid in participant_ids:
+            intervals = busy.setdefault(pid, [])
+            #drop intervals that ended before this event starts
+            intervals[:] = [item for item in intervals if item[1] > start]
+            for other, other_end in intervals:
+                shared.setdefault(other, set()).add(pid)
+        if shared:
+            other = min(shared)
+            overlaps[max(index, other)] = (min(index, other), sorted(shared[other]))
+        for pid in participant_ids:
+            busy[pid].append((index, end))
+    return overlaps
+
+
+def format_import_report(report):
+    """
+    One message for a pipeline report, as shown by the GUI and the cli
+
+    Returns:
+        str
+    """
+    approximate = sum(1 for match in report["names"].values()
+                      if match["method"] not in ("exact", "unresolved", "ambiguous"))
+    notes = []
+    if report["duplicates"]:
+        notes.append(f"{report['duplicates']} duplicates skipped")
+    if approximate:
+        notes.append(f"{approximate} participant names matched approximately")
+    if report["warnings"]:
+        notes.append(f"{len(report['warnings'])} warnings")
+    suffix = f" ({', '.join(notes)})" if notes else ""
+
+    problems = report["problems"]
+    if not problems:
+        if report["dry_run"]:
+            return f"Dry run: {report['accepted']} of {report['events']} meetings can be imported{suffix}"
+        return f"Imported {report['imported']} meetings successfully{suffix}"
+
+    if report["dry_run"]:
+        header = f"Dry run: {len(problems)} problems in {report['events']} events{suffix}"
+    else:
+        header = f"Nothing imported, {len(problems)} problems in {report['events']} events{suffix}"
+    lines = [header]
+    for problem in problems[:MAX_LISTED_PROBLEMS]:
+        where = problem["title"] or "file"
+        if problem["index"] is not None:
+            where = f"#{problem['index'] + 1} {where}"
+        lines.append(f"- {where} [{problem['stage']}]: {problem['message']}")
+    if len(problems) > MAX_LISTED_PROBLEMS:
+        lines.append(f"... and {len(problems) - MAX_LISTED_PROBLEMS} more")
+    return "\n".join(lines)
+
+
+def format_bulk_summary(summary):
+    """
+    One message for a bulk_import_files summary, as shown by the GUI
+    and the cli
+
+    Returns:
+        str
+    """
+    files = summary["files"]
+    if summary["dry_run"]:
+        header = (f"Dry run: {summary['accepted']} of {summary['events']} meetings "
+                  f"in {len(files)} files can be imported")
+    else:
+        header = f"Imported {summary['imported']} meetings from {len(files)} files"
+    notes = []
+    if summary["duplicates"]:
+        notes.append(f"{summary['duplicates']} duplicates skipped")
+    if summary.get("events_per_sec"):
+        notes.append(f"{summary['events_per_sec']:.0f} events/s")
+    if notes:
+        header += f" ({', '.join(notes)})"
+
+    lines = [header]
+    failed = [report for report in files if report["problems"]]
+    if failed:
+        suffix = "" if summary["dry_run"] else " (nothing imported from them)"
+        lines.append(f"{len(failed)} files with problems{suffix}:")
+        for report in failed[:MAX_LISTED_PROBLEMS]:
+            lines.append(f"- {report['file']}: {len(report['problems'])} problems")
+        if len(failed) > MAX_LISTED_PROBLEMS:
+            lines.append(f"... and {len(failed) - MAX_LISTED_PROBLEMS} more")
+    if summary.get("error"):
+        lines.append(f"{summary['error']}, the remaining files were not imported")
+    return "\n".join(lines)
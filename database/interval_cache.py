@@ -0,0 +1,129 @@
+from collections import OrderedDict
+
+from .timezones import to_aware
+
+
+class IntervalCache:
+    """
+    LRU cache of get_meetings_in_interval results, keyed by time range
+
+    Every entry holds the meetings overlapping its range (sorted by
+    start), which is a superset of all three search modes: a search for
+    any sub-range of a cached range, in any mode, is answered by filtering
+    the entry with Meeting.in_interval instead of querying the db
+
+    Entries are only dropped when a write touches them: one of their
+    meetings changed (its old time is gone) or a written meeting overlaps
+    their range. Memory is bounded by the total number of meetings held
+    (plus a maximum entry count); least recently used entries go first
+    """
+
+    def __init__(self, max_meetings=20000, max_entries=64):
+        """
+        Initialize an empty cache
+
+        Returns:
+            None
+        """
+        self.max_meetings = max_meetings
+        self.max_entries = max_entries
+        #(start, end) -> (meetings, set of their meeting_ids)
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, start, end, mode):
+        """
+        Meetings of [start, end) in mode, from an entry covering the range
+
+        Returns:
+            list[Meeting] | None: None on a miss
+        """
+        for key in reversed(self.entries):
+            if key[0] <= start and end <= key[1]:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                meetings = self.entries[key][0]
+                if key == (start, end) and mode == "overlapping":
+                    return list(meetings)
+                return [meeting for meeting in meetings if meeting.in_interval(start, end, mode)]
+
+        self.misses += 1
+        return None
+
+    def put(self, start, end, meetings):
+        """
+        Store the meetings overlapping [start, end), evicting the least
+        recently used entries beyond the bounds; entries covered by the
+        new range are replaced by it
+
+        Returns:
+            None
+        """
+        if len(meetings) > self.max_meetings:
+            return
+
+        for key in [key for key in self.entries if start <= key[0] and key[1] <= end]:
+            self._drop(key)
+
+        self.entries[(start, end)] = (meetings, {meeting.meeting_id for meeting in meetings})
+        self.size += len(meetings)
+
+        while self.size > self.max_meetings or len(self.entries) > self.max_entries:
+            self._drop(next(iter(self.entries)))
+            self.evictions += 1
+
+    def _drop(self, key):
+        meetings, ids = self.entries.pop(key)
+        self.size -= len(meetings)
+
+    def invalidate(self, meeting_ids=(), ranges=()):
+        """
+        Drop the entries holding one of meeting_ids or overlapping one of
+        the (start, end) ranges
+
+        Returns:
+            None
+        """
+        meeting_ids = set(meeting_ids)
+        ranges = [(to_aware(start), to_aware(end)) for start, end in ranges]
+        stale = [
+            key for key, (meetings, ids) in self.entries.items()
+            if not meeting_ids.isdisjoint(ids)
+            or any(start < key[1] and end > key[0] for start, end in ranges)
+        ]
+        for key in stale:
+            self._drop(key)
+        self.invalidations += len(stale)
+
+    def clear(self):
+        """
+        Drop every entry
+
+        Returns:
+            None
+        """
+        self.invalidations += len(self.entries)
+        self.entries.clear()
+        self.size = 0
+
+    def stats(self):
+        """
+        Hit / miss counters and current size
+
+        Returns:
+            dict
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "meetings": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
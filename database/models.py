@@ -0,0 +1,86 @@
+class Person:
+    """
+    One person as returned by the data layer
+    __slots__ keeps large result sets compact (no per-object __dict__)
+    """
+
+    __slots__ = ("person_id", "name", "email", "phone", "timezone")
+
+    def __init__(self, person_id, name, email=None, phone=None, timezone=None):
+        self.person_id = person_id
+        self.name = name
+        self.email = email
+        self.phone = phone
+        self.timezone = timezone
+
+    def __repr__(self):
+        return f"Person({self.person_id}, {self.name!r})"
+
+
+class Meeting:
+    """
+    One meeting as returned by the data layer
+
+    Participants are kept as parallel sequences (ids, names, emails) in
+    name order, Person objects are only built on request
+    start_time / end_time are aware datetimes (UTC as stored)
+    """
+
+    __slots__ = ("meeting_id", "uid", "title", "description", "start_time",
+                 "end_time", "location", "participant_ids",
+                 "participant_names", "participant_emails")
+
+    def __init__(self, meeting_id, uid, title, description, start_time, end_time,
+                 location, participant_ids, participant_names, participant_emails):
+        self.meeting_id = meeting_id
+        self.uid = uid
+        self.title = title
+        self.description = description
+        self.start_time = start_time
+        self.end_time = end_time
+        self.location = location
+        self.participant_ids = participant_ids
+        self.participant_names = participant_names
+        self.participant_emails = participant_emails
+
+    @classmethod
+    def from_row(cls, row):
+        """
+        Build a meeting from a MEETING_SELECT row
+
+        Returns:
+            Meeting
+        """
+        return cls(*row)
+
+    @property
+    def participants(self):
+        """
+        The participants as Person objects
+
+        Returns:
+            list[Person]
+        """
+        return [
+            Person(person_id, name, email)
+            for person_id, name, email in zip(
+                self.participant_ids, self.participant_names, self.participant_emails
+            )
+        ]
+
+    def in_interval(self, start, end, mode="contained"):
+        """
+        Whether get_meetings_in_interval(start, end, mode) returns this
+        meeting; lets open views patch single rows
+
+        Returns:
+            bool
+        """
+        if mode == "overlapping":
+            return self.start_time < end and self.end_time > start
+        if mode == "starts_within":
+            return start <= self.start_time < end
+        return start <= self.start_time < end and self.end_time <= end
+
+    def __repr__(self):
+        return f"Meeting({self.meeting_id}, {self.title!r}, {self.start_time:%Y-%m-%d %H:%M})"
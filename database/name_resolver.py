@@ -0,0 +1,164 @@
+import re
+import unicodedata
+
+#confidence of each matching rule of NameIndex
+CONFIDENCE = {
+    "exact": 1.0,
+    "normalized": 0.95,
+    "token_sort": 0.9,
+    "initials": 0.8,
+}
+#pg_trgm fallback: lowest accepted similarity, and how far ahead of the
+#runner-up the best person must be for the match to be unambiguous
+MIN_TRGM_SIMILARITY = 0.6
+MIN_TRGM_MARGIN = 0.1
+
+NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_name(name):
+    """
+    Casefolded name without accents and punctuation, single spaced
+    ("  José-Luis  O'Neil " -> "jose luis o neil")
+
+    Returns:
+        str
+    """
+    decomposed = unicodedata.normalize("NFKD", str(name))
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(NON_WORD.sub(" ", stripped.casefold()).split())
+
+
+def initials_keys(tokens):
+    """
+    (initial, surname) keys of a tokenized name, in both name orders
+    ("j smith" and "smith j" both give ("j", "smith"))
+
+    Returns:
+        set[tuple]
+    """
+    if len(tokens) < 2:
+        return set()
+    return {(tokens[0][0], tokens[-1]), (tokens[-1][0], tokens[0])}
+
+
+class NameMatch:
+    """
+    Outcome of resolving one participant name
+
+    method is one of CONFIDENCE's keys, "trigram", "ambiguous" or
+    "unresolved"; person_id is None unless the name was resolved
+    """
+
+    __slots__ = ("name", "person_id", "confidence", "method", "candidates")
+
+    def __init__(self, name, person_id=None, confidence=0.0, method="unresolved",
+                 candidates=()):
+        self.name = name
+        self.person_id = person_id
+        self.confidence = confidence
+        self.method = method
+        self.candidates = tuple(candidates)
+
+    def as_dict(self):
+        """
+        Report entry of this match
+
+        Returns:
+            dict
+        """
+        return {"person_id": self.person_id, "confidence": round(self.confidence, 2),
+                "method": self.method, "candidates": list(self.candidates)}
+
+    def __repr__(self):
+        return f"NameMatch({self.name!r}, {self.person_id}, {self.method}, {self.confidence:.2f})"
+
+
+class NameIndex:
+    """
+    In-memory index of person names for one import
+
+    Built on first use from loader() -> [(person_id, name)], so an import
+    whose events all carry ATTENDEE emails never loads it; every name is
+    then matched with dict lookups only, from the strictest rule down:
+    exact (casefolded), normalized (accents and punctuation removed),
+    token_sort (any name order) and initials ("J. Smith")
+    A key shared by several persons makes the name ambiguous instead of
+    picking one of them
+    """
+
+    def __init__(self, loader):
+        """
+        Initialize an index that is not loaded yet
+
+        Returns:
+            None
+        """
+        self.loader = loader
+        self.keys = None
+
+    def _build(self):
+        self.keys = {method: {} for method in CONFIDENCE}
+        for person_id, name in self.loader():
+            for method, key in self._person_keys(name):
+                self.keys[method].setdefault(key, set()).add(person_id)
+
+    def _person_keys(self, name):
+        tokens = normalize_name(name).split()
+        yield "exact", str(name).strip().casefold()
+        yield "normalized", " ".join(tokens)
+        yield "token_sort", " ".join(sorted(tokens))
+        if len(tokens) >= 2:
+            yield "initials", (tokens[0][0], tokens[-1])
+
+    def match(self, name):
+        """
+        Resolve one name with the in-memory rules
+
+        Returns:
+            NameMatch (method "unresolved" when no rule applies)
+        """
+        if self.keys is None:
+            self._build()
+
+        tokens = normalize_name(name).split()
+        lookups = [
+            ("exact", [str(name).strip().casefold()]),
+            ("normalized", [" ".join(tokens)]),
+            ("token_sort", [" ".join(sorted(tokens))]),
+        ]
+        #initials only when the name abbreviates something ("J. Smith")
+        if any(len(token) == 1 for token in tokens):
+            lookups.append(("initials", sorted(initials_keys(tokens))))
+
+        for method, keys in lookups:
+            ids = set()
+            for key in keys:
+                ids |= self.keys[method].get(key, set())
+            if len(ids) == 1:
+                return NameMatch(name, ids.pop(), CONFIDENCE[method], method)
+            if ids:
+                return NameMatch(name, None, 0.0, "ambiguous", sorted(ids))
+
+        return NameMatch(name)
+
+
+def pick_trigram_match(name, scored):
+    """
+    Decide a pg_trgm fallback from the best scored candidates
+
+    Args:
+        scored: [(person_id, similarity)] best first
+
+    Returns:
+        NameMatch
+    """
+    if not scored or scored[0][1] < MIN_TRGM_SIMILARITY:
+        return NameMatch(name, candidates=[person_id for person_id, score in scored])
+
+    if len(scored) > 1 and scored[0][1] - scored[1][1] < MIN_TRGM_MARGIN:
+        return NameMatch(name, None, 0.0, "ambiguous",
+                         [person_id for person_id, score in scored])
+
+    person_id, score = scored[0]
+    return NameMatch(name, person_id, score, "trigram")
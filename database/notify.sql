@@ -0,0 +1,52 @@
+--Change feed: every write to meetings / meeting_participants sends a
+--NOTIFY on channel meeting_changes_<tenant_id> with the meeting id and its
+--time range, so a client only hears about the changes of its own tenant
+--Installed on demand with DatabaseManager.setup_change_notifications()
+--Identical payloads of one transaction are delivered once, so a meeting
+--and its participants written together produce a single notification
+
+CREATE OR REPLACE FUNCTION notify_meeting_change()
+RETURNS trigger AS $$
+DECLARE
+    changed_id INTEGER;
+    m RECORD;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed_id := OLD.meeting_id;
+    ELSE
+        changed_id := NEW.meeting_id;
+    END IF;
+
+    --TG_ARGV[0] names the table the trigger was declared on
+    --(TG_TABLE_NAME is the partition in the partitioned layout)
+    IF TG_ARGV[0] = 'meetings' THEN
+        IF TG_OP = 'DELETE' THEN
+            m := OLD;
+        ELSE
+            m := NEW;
+        END IF;
+    ELSE
+        SELECT start_time, end_time, tenant_id INTO m FROM meetings WHERE meeting_id = changed_id;
+        IF NOT FOUND THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+
+    PERFORM pg_notify('meeting_changes_' || m.tenant_id, json_build_object(
+        'meeting_id', changed_id,
+        'start', m.start_time,
+        'end', m.end_time
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS meetings_notify ON meetings;
+CREATE TRIGGER meetings_notify
+    AFTER INSERT OR UPDATE OR DELETE ON meetings
+    FOR EACH ROW EXECUTE FUNCTION notify_meeting_change('meetings');
+
+DROP TRIGGER IF EXISTS meeting_participants_notify ON meeting_participants;
+CREATE TRIGGER meeting_participants_notify
+    AFTER INSERT OR DELETE ON meeting_participants
+    FOR EACH ROW EXECUTE FUNCTION notify_meeting_change('meeting_participants');
@@ -0,0 +1,192 @@
+import time
+
+import psycopg2
+from psycopg2 import Error
+
+from .timezones import SESSION_OPTIONS
+
+#how long a measured replica lag is trusted (seconds)
+LAG_CHECK_INTERVAL = 1.0
+#how long a failed replica is skipped before it is tried again (seconds)
+RETRY_DOWN_AFTER = 30.0
+
+
+class Replica:
+    """
+    One read replica connection with its last measured lag
+    """
+
+    def __init__(self, config, options=SESSION_OPTIONS):
+        """
+        Initialize an unconnected replica
+        options are the libpq session options (UTC, tenant)
+
+        Returns:
+            None
+        """
+        self.config = config
+        self.options = options
+        self.connection = None
+        self.cursor = None
+        self.lag = None
+        self.checked_at = 0.0
+        self.down_until = 0.0
+
+    @property
+    def name(self):
+        return f"{self.config.get('host')}:{self.config.get('port', '5432')}/{self.config.get('database')}"
+
+    def connect(self):
+        """
+        Open the replica connection (autocommit, reads only)
+
+        Returns:
+            (bool,str)
+        """
+        try:
+            self.close()
+            self.connection = psycopg2.connect(
+                connect_timeout=10, options=self.options, **self.config
+            )
+            self.connection.autocommit = True
+            self.cursor = self.connection.cursor()
+            self.down_until = 0.0
+            return True, f"Replica {self.name} connected"
+        except Error as e:
+            self.mark_down()
+            return False, f"Replica {self.name} unavailable: {e}"
+
+    def close(self):
+        """
+        Close the replica connection, ignoring errors
+
+        Returns:
+            None
+        """
+        try:
+            if self.connection:
+                self.connection.close()
+        except Error:
+            pass
+        self.connection = None
+        self.cursor = None
+
+    def mark_down(self):
+        """
+        Skip this replica for RETRY_DOWN_AFTER seconds
+
+        Returns:
+            None
+        """
+        self.close()
+        self.down_until = time.monotonic() + RETRY_DOWN_AFTER
+
+    def current_lag(self):
+        """
+        Replication lag in seconds, measured at most every LAG_CHECK_INTERVAL
+        A replica that replayed all the WAL it received is caught up (0),
+        however long ago the primary last wrote; otherwise the lag is the
+        age of the last replayed transaction. A server that is not
+        replaying WAL (e.g. a second database used as a stand-in) reports 0
+
+        Returns:
+            float
+        """
+        now = time.monotonic()
+        if self.lag is None or now - self.checked_at > LAG_CHECK_INTERVAL:
+            self.cursor.execute("""
+                SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0
+                            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                            END;
+            """)
+            self.lag = float(self.cursor.fetchone()[0])
+            self.checked_at = now
+        return self.lag
+
+
+class ReplicaSet:
+    """
+    Read/write split helper for DatabaseManager
+
+    Picks a replica for read-only queries in round-robin order, skipping
+    replicas that are down or lag more than max_lag seconds; after a write
+    the caller pins reads to the primary for pin_seconds so it always
+    reads its own writes
+    """
+
+    def __init__(self, configs=None, max_lag=5.0, pin_seconds=5.0, options=SESSION_OPTIONS):
+        """
+        Initialize the set (call connect() to open the connections)
+
+        Returns:
+            None
+        """
+        self.replicas = [Replica(config, options) for config in (configs or [])]
+        self.max_lag = max_lag
+        self.pin_seconds = pin_seconds
+        self.pinned_until = 0.0
+        self.next_index = 0
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    def connect(self):
+        """
+        Connect every replica; failures only disable that replica
+
+        Returns:
+            list[str]: one message per replica
+        """
+        return [replica.connect()[1] for replica in self.replicas]
+
+    def close(self):
+        """
+        Close every replica connection
+
+        Returns:
+            None
+        """
+        for replica in self.replicas:
+            replica.close()
+
+    def pin_primary(self):
+        """
+        Send reads to the primary for the next pin_seconds (read-your-writes)
+
+        Returns:
+            None
+        """
+        self.pinned_until = time.monotonic() + self.pin_seconds
+
+    def pick(self):
+        """
+        Choose a healthy replica for a read
+
+        Returns:
+            Replica | None: None means read from the primary
+        """
+        now = time.monotonic()
+        if not self.replicas or now < self.pinned_until:
+            self.primary_reads += 1
+            return None
+
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(self.next_index + offset) % len(self.replicas)]
+            if replica.down_until > now:
+                continue
+            if replica.connection is None and not replica.connect()[0]:
+                continue
+
+            try:
+                if replica.current_lag() > self.max_lag:
+                    continue
+            except Error:
+                replica.mark_down()
+                continue
+
+            self.next_index = (self.next_index + offset + 1) % len(self.replicas)
+            self.replica_reads += 1
+            return replica
+
+        self.primary_reads += 1
+        return None
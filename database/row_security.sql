@@ -0,0 +1,38 @@
+--Row level security: a session only sees and writes the rows of its tenant
+--(current_tenant(), set by DatabaseManager(tenant_id=...) on connect)
+--Installed on demand with DatabaseManager.setup_row_security()
+--Policies bind roles that do not own the tables: the application must
+--connect with such a role, the owner (migrations, rebuild_load_summaries,
+--detach_partitions_before) keeps seeing every tenant
+--Queries filter on tenant_id themselves, the policies are a safety net
+--and the tenant-led indexes are used either way
+
+ALTER TABLE persons ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS tenant_isolation ON persons;
+CREATE POLICY tenant_isolation ON persons
+    USING (tenant_id = current_tenant())
+    WITH CHECK (tenant_id = current_tenant());
+
+ALTER TABLE meetings ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS tenant_isolation ON meetings;
+CREATE POLICY tenant_isolation ON meetings
+    USING (tenant_id = current_tenant())
+    WITH CHECK (tenant_id = current_tenant());
+
+ALTER TABLE rooms ENABLE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS tenant_isolation ON rooms;
+CREATE POLICY tenant_isolation ON rooms
+    USING (tenant_id = current_tenant())
+    WITH CHECK (tenant_id = current_tenant());
+
+--the archive of archive.sql, when installed
+DO $$
+BEGIN
+    IF to_regclass('meetings_archive') IS NOT NULL THEN
+        ALTER TABLE meetings_archive ENABLE ROW LEVEL SECURITY;
+        DROP POLICY IF EXISTS tenant_isolation ON meetings_archive;
+        CREATE POLICY tenant_isolation ON meetings_archive
+            USING (tenant_id = current_tenant())
+            WITH CHECK (tenant_id = current_tenant());
+    END IF;
+END $$;
@@ -2,23 +2,50 @@
 CREATE TABLE IF NOT EXISTS persons (
     person_id SERIAL PRIMARY KEY,
     name VARCHAR(100) NOT NULL ,
-    email VARCHAR(100) UNIQUE NOT NULL,
+    email VARCHAR(100) NOT NULL,
     phone VARCHAR(20),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
 );
 
+--IANA time zone of the person's feed (NULL = the application's local zone)
+ALTER TABLE persons ADD COLUMN IF NOT EXISTS timezone VARCHAR(64);
+
+--Fuzzy participant name matching of imports (similarity search on LOWER(name))
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_persons_name_trgm ON persons USING gin (LOWER(name) gin_trgm_ops);
+
 --Meetings table
 CREATE TABLE IF NOT EXISTS meetings (
     meeting_id SERIAL PRIMARY KEY,
     title VARCHAR(200) NOT NULL,
     description TEXT,
-    start_time TIMESTAMP NOT NULL,
-    end_time TIMESTAMP NOT NULL,
+    start_time TIMESTAMPTZ NOT NULL,
+    end_time TIMESTAMPTZ NOT NULL,
     location VARCHAR(200),
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     CONSTRAINT check_times CHECK (end_time > start_time)
 );
 
+--Tenants: isolated calendars sharing one database. Every row belongs to the
+--tenant of the session that wrote it (meeting_scheduler.tenant_id, set by
+--DatabaseManager); sessions without the setting and rows written before
+--tenants existed belong to tenant 0
+CREATE OR REPLACE FUNCTION current_tenant()
+RETURNS INTEGER AS $$
+    SELECT COALESCE(NULLIF(current_setting('meeting_scheduler.tenant_id', true), ''), '0')::INTEGER;
+$$ LANGUAGE sql STABLE;
+
+ALTER TABLE persons ADD COLUMN IF NOT EXISTS tenant_id INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE persons ALTER COLUMN tenant_id SET DEFAULT current_tenant();
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS tenant_id INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE meetings ALTER COLUMN tenant_id SET DEFAULT current_tenant();
+
+--tenant_id leads every index searched by values tenants share (emails,
+--UIDs, fingerprints, times); indexes on serial ids need no tenant
+--(global email uniqueness of older installs becomes per tenant)
+ALTER TABLE persons DROP CONSTRAINT IF EXISTS persons_email_key;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_persons_tenant_email ON persons (tenant_id, email);
+
 --Many to many relationship between Meetings and People
 CREATE TABLE IF NOT EXISTS meeting_participants (
     meeting_id INTEGER NOT NULL,
@@ -26,4 +53,89 @@ CREATE TABLE IF NOT EXISTS meeting_participants (
     PRIMARY KEY (meeting_id, person_id),
     FOREIGN KEY (meeting_id) REFERENCES Meetings(meeting_id) ON DELETE CASCADE,
     FOREIGN KEY (person_id) REFERENCES Persons(person_id) ON DELETE CASCADE
-);
\ No newline at end of file
+);
+
+--Stable content hash of a meeting (title, times, location, participants)
+--used for import deduplication
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS fingerprint CHAR(64);
+DROP INDEX IF EXISTS idx_meetings_fingerprint;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_meetings_tenant_fingerprint ON meetings (tenant_id, fingerprint);
+
+--Incremental sync: stable UID, SEQUENCE, modification time and tombstones
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS uid VARCHAR(255);
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS sequence INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ;
+DROP INDEX IF EXISTS idx_meetings_uid;
+DROP INDEX IF EXISTS idx_meetings_updated_at;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_meetings_tenant_uid ON meetings (tenant_id, uid);
+CREATE INDEX IF NOT EXISTS idx_meetings_tenant_updated_at ON meetings (tenant_id, updated_at);
+
+--Times are TIMESTAMPTZ: tables created with TIMESTAMP columns are converted,
+--their values being wall clock times of the application's local zone
+--(meeting_scheduler.local_timezone, set by DatabaseManager.create_tables);
+--fingerprints are reset so they are computed again from the UTC times
+DO $$
+DECLARE
+    zone TEXT := COALESCE(
+        NULLIF(current_setting('meeting_scheduler.local_timezone', true), ''),
+        current_setting('TimeZone')
+    );
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_schema = current_schema() AND table_name = 'meetings'
+                 AND column_name = 'start_time'
+                 AND data_type = 'timestamp without time zone')
+       AND (SELECT relkind FROM pg_class WHERE oid = 'meetings'::regclass) = 'r' THEN
+        ALTER TABLE meetings DROP CONSTRAINT IF EXISTS meetings_room_no_overlap;
+        DROP INDEX IF EXISTS idx_meetings_period;
+        DROP TRIGGER IF EXISTS meetings_load_after_write ON meetings;
+        EXECUTE format(
+            'ALTER TABLE meetings
+                ALTER COLUMN start_time TYPE TIMESTAMPTZ USING start_time AT TIME ZONE %1$L,
+                ALTER COLUMN end_time TYPE TIMESTAMPTZ USING end_time AT TIME ZONE %1$L,
+                ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE %1$L,
+                ALTER COLUMN updated_at TYPE TIMESTAMPTZ USING updated_at AT TIME ZONE %1$L,
+                ALTER COLUMN deleted_at TYPE TIMESTAMPTZ USING deleted_at AT TIME ZONE %1$L;
+             ALTER TABLE persons
+                ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE %1$L;',
+            zone
+        );
+        UPDATE meetings SET fingerprint = NULL;
+    END IF;
+END $$;
+
+--Interval searches: start_time range scans and tstzrange overlap, per tenant
+--(btree_gist provides the = operator class of tenant_id / room_id in gist)
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+DROP INDEX IF EXISTS idx_meetings_start_time;
+DROP INDEX IF EXISTS idx_meetings_period;
+CREATE INDEX IF NOT EXISTS idx_meetings_tenant_start_time ON meetings (tenant_id, start_time);
+CREATE INDEX IF NOT EXISTS idx_meetings_tenant_period
+    ON meetings USING gist (tenant_id, tstzrange(start_time, end_time));
+
+--Rooms: bookable resources, a room hosts at most one live meeting at a time
+
+CREATE TABLE IF NOT EXISTS rooms (
+    room_id SERIAL PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    capacity INTEGER,
+    CONSTRAINT check_capacity CHECK (capacity > 0)
+);
+
+ALTER TABLE rooms ADD COLUMN IF NOT EXISTS tenant_id INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE rooms ALTER COLUMN tenant_id SET DEFAULT current_tenant();
+ALTER TABLE rooms DROP CONSTRAINT IF EXISTS rooms_name_key;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_rooms_tenant_name ON rooms (tenant_id, name);
+
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS room_id INTEGER REFERENCES rooms(room_id);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conname = 'meetings_room_no_overlap') THEN
+        ALTER TABLE meetings ADD CONSTRAINT meetings_room_no_overlap
+            EXCLUDE USING gist (room_id WITH =, tstzrange(start_time, end_time) WITH &&)
+            WHERE (deleted_at IS NULL AND room_id IS NOT NULL);
+    END IF;
+END $$;
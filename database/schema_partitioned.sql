@@ -0,0 +1,123 @@
+--Partitioned layout for long-lived deployments
+--meetings and meeting_participants are range partitioned by start_time
+--(one partition per month, created on demand by DatabaseManager),
+--participant rows carry the meeting start_time so they live in the
+--partition of their meeting
+--Only usable on a new database: it does not convert existing tables
+--(partitions and their bounds are UTC months)
+
+--People table
+CREATE TABLE IF NOT EXISTS persons (
+    person_id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL ,
+    email VARCHAR(100) NOT NULL,
+    phone VARCHAR(20),
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+);
+
+--IANA time zone of the person's feed (NULL = the application's local zone)
+ALTER TABLE persons ADD COLUMN IF NOT EXISTS timezone VARCHAR(64);
+
+--Fuzzy participant name matching of imports (similarity search on LOWER(name))
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_persons_name_trgm ON persons USING gin (LOWER(name) gin_trgm_ops);
+
+--Tenants: isolated calendars sharing one database. Every row belongs to the
+--tenant of the session that wrote it (meeting_scheduler.tenant_id, set by
+--DatabaseManager); sessions without the setting belong to tenant 0
+CREATE OR REPLACE FUNCTION current_tenant()
+RETURNS INTEGER AS $$
+    SELECT COALESCE(NULLIF(current_setting('meeting_scheduler.tenant_id', true), ''), '0')::INTEGER;
+$$ LANGUAGE sql STABLE;
+
+--tenant_id leads every index searched by values tenants share (emails,
+--UIDs, fingerprints, times); indexes on serial ids need no tenant
+ALTER TABLE persons ADD COLUMN IF NOT EXISTS tenant_id INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE persons ALTER COLUMN tenant_id SET DEFAULT current_tenant();
+ALTER TABLE persons DROP CONSTRAINT IF EXISTS persons_email_key;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_persons_tenant_email ON persons (tenant_id, email);
+
+--Rooms: bookable resources, a room hosts at most one live meeting at a time
+--(btree_gist provides the = operator class for tenant_id / room_id in the
+--gist indexes)
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+CREATE TABLE IF NOT EXISTS rooms (
+    room_id SERIAL PRIMARY KEY,
+    name VARCHAR(200) NOT NULL,
+    capacity INTEGER,
+    CONSTRAINT check_capacity CHECK (capacity > 0)
+);
+
+ALTER TABLE rooms ADD COLUMN IF NOT EXISTS tenant_id INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE rooms ALTER COLUMN tenant_id SET DEFAULT current_tenant();
+ALTER TABLE rooms DROP CONSTRAINT IF EXISTS rooms_name_key;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_rooms_tenant_name ON rooms (tenant_id, name);
+
+--Meetings table
+--meetings are limited to 31 days so overlap searches can prune
+--partitions on start_time
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting_id SERIAL,
+    title VARCHAR(200) NOT NULL,
+    description TEXT,
+    start_time TIMESTAMPTZ NOT NULL,
+    end_time TIMESTAMPTZ NOT NULL,
+    location VARCHAR(200),
+    created_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    fingerprint CHAR(64),
+    uid VARCHAR(255),
+    sequence INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    deleted_at TIMESTAMPTZ,
+    room_id INTEGER REFERENCES rooms(room_id),
+    PRIMARY KEY (meeting_id, start_time),
+    CONSTRAINT check_times CHECK (end_time > start_time),
+    CONSTRAINT check_length CHECK (end_time - start_time <= INTERVAL '31 days')
+) PARTITION BY RANGE (start_time);
+
+ALTER TABLE meetings ADD COLUMN IF NOT EXISTS tenant_id INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE meetings ALTER COLUMN tenant_id SET DEFAULT current_tenant();
+
+--the fingerprint covers start_time, so unique per partition is unique overall
+DROP INDEX IF EXISTS idx_meetings_fingerprint;
+DROP INDEX IF EXISTS idx_meetings_uid;
+DROP INDEX IF EXISTS idx_meetings_updated_at;
+DROP INDEX IF EXISTS idx_meetings_start_time;
+DROP INDEX IF EXISTS idx_meetings_period;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_meetings_tenant_fingerprint
+    ON meetings (tenant_id, fingerprint, start_time);
+CREATE INDEX IF NOT EXISTS idx_meetings_tenant_uid ON meetings (tenant_id, uid);
+CREATE INDEX IF NOT EXISTS idx_meetings_tenant_updated_at ON meetings (tenant_id, updated_at);
+CREATE INDEX IF NOT EXISTS idx_meetings_tenant_start_time ON meetings (tenant_id, start_time);
+--partitioned databases created before TIMESTAMPTZ keep TIMESTAMP columns
+DO $$
+BEGIN
+    EXECUTE format(
+        'CREATE INDEX IF NOT EXISTS idx_meetings_tenant_period
+            ON meetings USING gist (tenant_id, %s(start_time, end_time))',
+        CASE WHEN (SELECT data_type FROM information_schema.columns
+                   WHERE table_schema = current_schema() AND table_name = 'meetings'
+                     AND column_name = 'start_time') = 'timestamp without time zone'
+             THEN 'tsrange' ELSE 'tstzrange' END
+    );
+END $$;
+--room double bookings: an exclusion constraint cannot be declared on the
+--partitioned table, every monthly partition gets its own on
+--(room_id, tstzrange) when DatabaseManager._ensure_partitions creates it
+--A per partition constraint misses bookings overlapping across a month
+--boundary: add_meeting checks rooms itself under the room advisory lock
+
+--Many to many relationship between Meetings and People
+CREATE TABLE IF NOT EXISTS meeting_participants (
+    meeting_id INTEGER NOT NULL,
+    person_id INTEGER NOT NULL,
+    start_time TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (meeting_id, person_id, start_time),
+    FOREIGN KEY (meeting_id, start_time) REFERENCES meetings(meeting_id, start_time)
+        ON DELETE CASCADE ON UPDATE CASCADE,
+    FOREIGN KEY (person_id) REFERENCES persons(person_id) ON DELETE CASCADE
+) PARTITION BY RANGE (start_time);
+
+CREATE INDEX IF NOT EXISTS idx_meeting_participants_person
+    ON meeting_participants (person_id, start_time);
@@ -0,0 +1,344 @@
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta, timezone
+
+from .models import Meeting
+
+MAGIC = b"MSSNAP\x00\x01"
+VERSION = 1
+
+#magic, version, meetings, participant refs, persons, strings,
+#string bytes, longest meeting (us), build time (us since EPOCH)
+HEADER = struct.Struct("<8sIIIIIqqq")
+
+#times are stored as microseconds since this moment
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_micros(value):
+    """
+    Microseconds since EPOCH of an aware datetime
+
+    Returns:
+        int
+    """
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(micros):
+    """
+    Aware UTC datetime of microseconds since EPOCH
+
+    Returns:
+        datetime
+    """
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def padded(size):
+    """
+    size rounded up to 8 bytes, so every section stays aligned
+
+    Returns:
+        int
+    """
+    return (size + 7) & ~7
+
+
+class StringTable:
+    """
+    Deduplicated utf-8 strings of a snapshot being written (id -1 is None)
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.offsets = array("q", [0])
+        self.data = bytearray()
+
+    def add(self, value):
+        """
+        Id of a string, adding it on first use
+
+        Returns:
+            int
+        """
+        if value is None:
+            return -1
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.ids)
+            self.ids[value] = string_id
+            self.data += value.encode("utf-8")
+            self.offsets.append(len(self.data))
+        return string_id
+
+
+def write_snapshot(path, persons, meetings, built_at):
+    """
+    Write a snapshot file (to a temporary file first, then renamed over path)
+
+    Sections, all little-endian arrays after the header:
+        starts, ends (int64 us) and meeting_ids (int32) of the live
+        meetings sorted by (start, meeting_id); their string ids (uid,
+        title, description, location); per meeting the offsets of its
+        participants (person rows in name order); the sorted person_ids
+        with their name / email string ids; the per-person offset index
+        into the meeting rows of every person (ascending, so in start
+        order); the string offsets and the utf-8 string data
+
+    Args:
+        persons: dict person_id -> (name, email)
+        meetings: iterable of (meeting_id, uid, title, description,
+                  start_time, end_time, location, participant_ids)
+        built_at: aware datetime the data is current at (the sync token)
+
+    Returns:
+        int: number of meetings written
+    """
+    strings = StringTable()
+    person_ids = array("i", sorted(persons))
+    person_rows = {person_id: row for row, person_id in enumerate(person_ids)}
+    person_fields = array("i")
+    for person_id in person_ids:
+        name, email = persons[person_id]
+        person_fields.extend((strings.add(name), strings.add(email)))
+
+    rows = sorted(meetings, key=lambda meeting: (meeting[4], meeting[0]))
+    starts, ends, meeting_ids = array("q"), array("q"), array("i")
+    fields, ref_offsets, refs = array("i"), array("i", [0]), array("i")
+    by_person = [[] for _ in person_ids]
+    longest = 0
+    for row, (meeting_id, uid, title, description, start, end, location, participant_ids) in enumerate(rows):
+        start, end = to_micros(start), to_micros(end)
+        starts.append(start)
+        ends.append(end)
+        meeting_ids.append(meeting_id)
+        longest = max(longest, end - start)
+        fields.extend((strings.add(uid), strings.add(title),
+                       strings.add(description), strings.add(location)))
+
+        members = sorted(
+            {person_rows[pid] for pid in participant_ids if pid in person_rows},
+            key=lambda person_row: (persons[person_ids[person_row]][0], person_ids[person_row])
+        )
+        refs.extend(members)
+        ref_offsets.append(len(refs))
+        for person_row in members:
+            by_person[person_row].append(row)
+
+    person_offsets, person_meetings = array("i", [0]), array("i")
+    for person_rows_of_meetings in by_person:
+        person_meetings.extend(person_rows_of_meetings)
+        person_offsets.append(len(person_meetings))
+
+    sections = [starts, ends, meeting_ids, fields, ref_offsets, refs, person_ids,
+                person_fields, person_offsets, person_meetings, strings.offsets]
+    header = HEADER.pack(MAGIC, VERSION, len(rows), len(refs), len(person_ids),
+                         len(strings.ids), len(strings.data), longest, to_micros(built_at))
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        for chunk in [header] + [section.tobytes() for section in sections] + [bytes(strings.data)]:
+            f.write(chunk)
+            f.write(b"\0" * (padded(len(chunk)) - len(chunk)))
+    os.replace(temp_path, path)
+    return len(rows)
+
+
+class CalendarSnapshot:
+    """
+    Read-only, memory-mapped snapshot of the live meetings
+
+    Nothing is loaded on open: the arrays are memoryviews over the
+    mapping, interval searches are binary searches over the sorted start
+    times and conflict checks binary search the meeting rows of each
+    participant in the per-person offset index. Meetings are bounded by
+    the longest meeting of the snapshot, stored in the header
+    """
+
+    def __init__(self, path):
+        """
+        Map a snapshot file written by write_snapshot
+
+        Returns:
+            None
+
+        Raises:
+            OSError: the file cannot be read
+            ValueError: not a snapshot file (or another version)
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self.file.close()
+            raise
+        self.views = []
+
+        try:
+            self.view = memoryview(self.map)
+            if len(self.view) < HEADER.size:
+                raise ValueError(f"{path} is not a snapshot file")
+            (magic, version, meetings, refs, persons, strings, string_bytes,
+             self.longest, built_at) = HEADER.unpack_from(self.view)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a snapshot file (version {VERSION})")
+            self.built_at = from_micros(built_at)
+
+            self.offset = padded(HEADER.size)
+            self.starts = self._section("q", meetings)
+            self.ends = self._section("q", meetings)
+            self.meeting_ids = self._section("i", meetings)
+            self.fields = self._section("i", 4 * meetings)
+            self.ref_offsets = self._section("i", meetings + 1)
+            self.refs = self._section("i", refs)
+            self.person_ids = self._section("i", persons)
+            self.person_fields = self._section("i", 2 * persons)
+            self.person_offsets = self._section("i", persons + 1)
+            self.person_meetings = self._section("i", refs)
+            self.string_offsets = self._section("q", strings + 1)
+            self.strings = self._section("B", string_bytes)
+        except Exception:
+            self.close()
+            raise
+
+        self.string_cache = {}
+
+    def _section(self, fmt, count):
+        size = count * struct.calcsize(fmt)
+        if self.offset + size > len(self.view):
+            raise ValueError(f"{self.path} is truncated")
+        section = self.view[self.offset:self.offset + size].cast(fmt)
+        self.views.append(section)
+        self.offset += padded(size)
+        return section
+
+    def close(self):
+        """
+        Unmap the file
+
+        Returns:
+            None
+        """
+        for section in self.views:
+            section.release()
+        self.views = []
+        if getattr(self, "view", None) is not None:
+            self.view.release()
+            self.view = None
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def __len__(self):
+        return len(self.starts)
+
+    @property
+    def sync_token(self):
+        """
+        Sync token of the data in the file, as used by export_changes_since
+
+        Returns:
+            str
+        """
+        return self.built_at.isoformat()
+
+    def _string(self, string_id):
+        if string_id < 0:
+            return None
+        value = self.string_cache.get(string_id)
+        if value is None:
+            begin, end = self.string_offsets[string_id], self.string_offsets[string_id + 1]
+            value = bytes(self.strings[begin:end]).decode("utf-8")
+            self.string_cache[string_id] = value
+        return value
+
+    def _person_row(self, person_id):
+        row = bisect_left(self.person_ids, person_id)
+        if row < len(self.person_ids) and self.person_ids[row] == person_id:
+            return row
+        return None
+
+    def meeting(self, row):
+        """
+        Meeting of one row
+
+        Returns:
+            Meeting
+        """
+        uid, title, description, location = self.fields[4 * row:4 * row + 4]
+        members = self.refs[self.ref_offsets[row]:self.ref_offsets[row + 1]]
+        return Meeting(
+            self.meeting_ids[row], self._string(uid), self._string(title),
+            self._string(description), from_micros(self.starts[row]),
+            from_micros(self.ends[row]), self._string(location),
+            [self.person_ids[member] for member in members],
+            [self._string(self.person_fields[2 * member]) for member in members],
+            [self._string(self.person_fields[2 * member + 1]) for member in members],
+        )
+
+    def rows(self):
+        """
+        All meeting rows as write_snapshot input tuples (for a refresh)
+
+        Returns:
+            generator of tuples
+        """
+        for row in range(len(self.starts)):
+            uid, title, description, location = self.fields[4 * row:4 * row + 4]
+            members = self.refs[self.ref_offsets[row]:self.ref_offsets[row + 1]]
+            yield (self.meeting_ids[row], self._string(uid), self._string(title),
+                   self._string(description), from_micros(self.starts[row]),
+                   from_micros(self.ends[row]), self._string(location),
+                   [self.person_ids[member] for member in members])
+
+    def meetings_in_interval(self, start_time, end_time, mode="contained"):
+        """
+        Same result as DatabaseManager.get_meetings_in_interval
+
+        Returns:
+            list[Meeting]
+        """
+        start, end = to_micros(start_time), to_micros(end_time)
+        last = bisect_left(self.starts, end)
+        if mode == "overlapping":
+            first = bisect_right(self.starts, start - self.longest)
+            rows = (row for row in range(first, last) if self.ends[row] > start)
+        elif mode == "starts_within":
+            rows = range(bisect_left(self.starts, start), last)
+        else:
+            first = bisect_left(self.starts, start)
+            rows = (row for row in range(first, last) if self.ends[row] <= end)
+        return [self.meeting(row) for row in rows]
+
+    def conflicts(self, participant_ids, start_time, end_time, exclude_meeting_id=None):
+        """
+        Same result as DatabaseManager.check_conflicts
+
+        Returns:
+            list: [(person_id, name)] of the participants with an
+                  overlapping meeting
+        """
+        start, end = to_micros(start_time), to_micros(end_time)
+        #meeting rows are in start order, so bounds on the global start
+        #array are bounds on the ascending row list of every person
+        first = bisect_right(self.starts, start - self.longest)
+        last = bisect_left(self.starts, end)
+
+        conflicts = []
+        for person_id in dict.fromkeys(participant_ids):
+            person_row = self._person_row(person_id)
+            if person_row is None:
+                continue
+            rows = self.person_meetings[self.person_offsets[person_row]:
+                                        self.person_offsets[person_row + 1]]
+            for row in rows[bisect_left(rows, first):bisect_left(rows, last)]:
+                if self.ends[row] > start and self.meeting_ids[row] != exclude_meeting_id:
+                    conflicts.append((person_id, self._string(self.person_fields[2 * person_row])))
+                    break
+        return conflicts
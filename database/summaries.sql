@@ -0,0 +1,251 @@
+--Materialized per day agenda load, maintained by triggers
+--Installed on demand with DatabaseManager.setup_load_summaries()
+--Days are UTC days, whatever the TimeZone of the writing session
+--Buckets belong to the tenant of their meetings (locations are per tenant)
+
+--Meetings and busy time of every person per day
+CREATE TABLE IF NOT EXISTS person_daily_load (
+    tenant_id INTEGER NOT NULL DEFAULT 0,
+    person_id INTEGER NOT NULL REFERENCES persons(person_id) ON DELETE CASCADE,
+    day DATE NOT NULL,
+    meetings INTEGER NOT NULL,
+    busy_seconds DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (tenant_id, person_id, day)
+);
+
+--Meetings and busy time of every location per day
+CREATE TABLE IF NOT EXISTS location_daily_load (
+    tenant_id INTEGER NOT NULL DEFAULT 0,
+    location VARCHAR(200) NOT NULL,
+    day DATE NOT NULL,
+    meetings INTEGER NOT NULL,
+    busy_seconds DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (tenant_id, location, day)
+);
+
+--summaries of installs before tenants: all their rows are tenant 0
+ALTER TABLE person_daily_load ADD COLUMN IF NOT EXISTS tenant_id INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE location_daily_load ADD COLUMN IF NOT EXISTS tenant_id INTEGER NOT NULL DEFAULT 0;
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_index i
+                       JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+                   WHERE i.indrelid = 'location_daily_load'::regclass AND i.indisprimary
+                     AND a.attname = 'tenant_id') THEN
+        ALTER TABLE person_daily_load DROP CONSTRAINT person_daily_load_pkey,
+            ADD PRIMARY KEY (tenant_id, person_id, day);
+        ALTER TABLE location_daily_load DROP CONSTRAINT location_daily_load_pkey,
+            ADD PRIMARY KEY (tenant_id, location, day);
+    END IF;
+END $$;
+
+DROP INDEX IF EXISTS idx_person_daily_load_day;
+DROP INDEX IF EXISTS idx_location_daily_load_day;
+CREATE INDEX IF NOT EXISTS idx_person_daily_load_tenant_day ON person_daily_load (tenant_id, day);
+CREATE INDEX IF NOT EXISTS idx_location_daily_load_tenant_day ON location_daily_load (tenant_id, day);
+CREATE INDEX IF NOT EXISTS idx_meeting_participants_person ON meeting_participants (person_id);
+
+--functions of installs before tenants, without the tenant argument
+DROP FUNCTION IF EXISTS refresh_person_day_load(INTEGER, DATE, INTEGER);
+DROP FUNCTION IF EXISTS refresh_location_day_load(VARCHAR, DATE, INTEGER);
+DROP FUNCTION IF EXISTS refresh_meeting_load(INTEGER, TIMESTAMPTZ, TIMESTAMPTZ, VARCHAR, INTEGER);
+
+--Recompute one (person, day) bucket from the raw tables
+--p_exclude skips a meeting that is about to be deleted
+CREATE OR REPLACE FUNCTION refresh_person_day_load(p_tenant INTEGER, p_person INTEGER, p_day DATE,
+                                                   p_exclude INTEGER)
+RETURNS void AS $$
+DECLARE
+    n INTEGER;
+    busy DOUBLE PRECISION;
+BEGIN
+    SELECT COUNT(*),
+           COALESCE(SUM(EXTRACT(EPOCH FROM
+               LEAST(m.end_time, (p_day + 1)::timestamp AT TIME ZONE 'UTC')
+               - GREATEST(m.start_time, p_day::timestamp AT TIME ZONE 'UTC')
+           )), 0)
+    INTO n, busy
+    FROM meeting_participants mp
+        JOIN meetings m ON m.meeting_id = mp.meeting_id
+    WHERE mp.person_id = p_person
+      AND m.tenant_id = p_tenant
+      AND m.deleted_at IS NULL
+      AND m.meeting_id IS DISTINCT FROM p_exclude
+      AND m.start_time < (p_day + 1)::timestamp AT TIME ZONE 'UTC'
+      AND m.end_time > p_day::timestamp AT TIME ZONE 'UTC';
+
+    IF n = 0 THEN
+        DELETE FROM person_daily_load
+        WHERE tenant_id = p_tenant AND person_id = p_person AND day = p_day;
+    ELSE
+        INSERT INTO person_daily_load (tenant_id, person_id, day, meetings, busy_seconds)
+        VALUES (p_tenant, p_person, p_day, n, busy)
+        ON CONFLICT (tenant_id, person_id, day)
+        DO UPDATE SET meetings = EXCLUDED.meetings, busy_seconds = EXCLUDED.busy_seconds;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+--Recompute one (location, day) bucket from the raw tables
+CREATE OR REPLACE FUNCTION refresh_location_day_load(p_tenant INTEGER, p_location VARCHAR, p_day DATE,
+                                                     p_exclude INTEGER)
+RETURNS void AS $$
+DECLARE
+    n INTEGER;
+    busy DOUBLE PRECISION;
+BEGIN
+    IF p_location IS NULL OR p_location = '' THEN
+        RETURN;
+    END IF;
+
+    SELECT COUNT(*),
+           COALESCE(SUM(EXTRACT(EPOCH FROM
+               LEAST(m.end_time, (p_day + 1)::timestamp AT TIME ZONE 'UTC')
+               - GREATEST(m.start_time, p_day::timestamp AT TIME ZONE 'UTC')
+           )), 0)
+    INTO n, busy
+    FROM meetings m
+    WHERE m.tenant_id = p_tenant
+      AND m.location = p_location
+      AND m.deleted_at IS NULL
+      AND m.meeting_id IS DISTINCT FROM p_exclude
+      AND m.start_time < (p_day + 1)::timestamp AT TIME ZONE 'UTC'
+      AND m.end_time > p_day::timestamp AT TIME ZONE 'UTC';
+
+    IF n = 0 THEN
+        DELETE FROM location_daily_load
+        WHERE tenant_id = p_tenant AND location = p_location AND day = p_day;
+    ELSE
+        INSERT INTO location_daily_load (tenant_id, location, day, meetings, busy_seconds)
+        VALUES (p_tenant, p_location, p_day, n, busy)
+        ON CONFLICT (tenant_id, location, day)
+        DO UPDATE SET meetings = EXCLUDED.meetings, busy_seconds = EXCLUDED.busy_seconds;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+--UTC days touched by [p_start, p_end)
+CREATE OR REPLACE FUNCTION utc_days(p_start TIMESTAMPTZ, p_end TIMESTAMPTZ)
+RETURNS SETOF DATE AS $$
+    SELECT d::date FROM generate_series(
+        date_trunc('day', p_start AT TIME ZONE 'UTC'),
+        (p_end AT TIME ZONE 'UTC') - interval '1 microsecond',
+        interval '1 day'
+    ) AS d;
+$$ LANGUAGE sql IMMUTABLE;
+
+--Recompute every bucket a meeting touches (its days x its participants and location)
+--(the TIMESTAMP version of installs before TIMESTAMPTZ is dropped)
+DROP FUNCTION IF EXISTS refresh_meeting_load(INTEGER, TIMESTAMP, TIMESTAMP, VARCHAR, INTEGER);
+CREATE OR REPLACE FUNCTION refresh_meeting_load(p_tenant INTEGER, p_meeting INTEGER,
+                                                p_start TIMESTAMPTZ, p_end TIMESTAMPTZ,
+                                                p_location VARCHAR, p_exclude INTEGER)
+RETURNS void AS $$
+DECLARE
+    d DATE;
+    p INTEGER;
+BEGIN
+    FOR d IN SELECT utc_days(p_start, p_end) LOOP
+        PERFORM refresh_location_day_load(p_tenant, p_location, d, p_exclude);
+        FOR p IN SELECT person_id FROM meeting_participants WHERE meeting_id = p_meeting LOOP
+            PERFORM refresh_person_day_load(p_tenant, p, d, p_exclude);
+        END LOOP;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+--Meetings: BEFORE DELETE (also fired when a row moves to another partition)
+--and AFTER INSERT / UPDATE of the columns the summaries depend on
+CREATE OR REPLACE FUNCTION meetings_load_trigger()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM refresh_meeting_load(OLD.tenant_id, OLD.meeting_id, OLD.start_time, OLD.end_time,
+                                     OLD.location, OLD.meeting_id);
+        RETURN OLD;
+    END IF;
+
+    IF TG_OP = 'UPDATE' THEN
+        PERFORM refresh_meeting_load(OLD.tenant_id, OLD.meeting_id, OLD.start_time, OLD.end_time,
+                                     OLD.location, NULL);
+    END IF;
+    PERFORM refresh_meeting_load(NEW.tenant_id, NEW.meeting_id, NEW.start_time, NEW.end_time,
+                                 NEW.location, NULL);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+--Participants added or removed: recompute that person on the meeting's days
+--(rows removed by ON DELETE CASCADE were already handled by the meetings trigger)
+CREATE OR REPLACE FUNCTION meeting_participants_load_trigger()
+RETURNS trigger AS $$
+DECLARE
+    row_person INTEGER;
+    row_meeting INTEGER;
+    m RECORD;
+    d DATE;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        row_person := OLD.person_id;
+        row_meeting := OLD.meeting_id;
+    ELSE
+        row_person := NEW.person_id;
+        row_meeting := NEW.meeting_id;
+    END IF;
+
+    SELECT start_time, end_time, tenant_id INTO m FROM meetings WHERE meeting_id = row_meeting;
+    IF FOUND THEN
+        FOR d IN SELECT utc_days(m.start_time, m.end_time) LOOP
+            PERFORM refresh_person_day_load(m.tenant_id, row_person, d, NULL);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS meetings_load_before_delete ON meetings;
+CREATE TRIGGER meetings_load_before_delete
+    BEFORE DELETE ON meetings
+    FOR EACH ROW EXECUTE FUNCTION meetings_load_trigger();
+
+DROP TRIGGER IF EXISTS meetings_load_after_write ON meetings;
+CREATE TRIGGER meetings_load_after_write
+    AFTER INSERT OR UPDATE OF start_time, end_time, location, deleted_at ON meetings
+    FOR EACH ROW EXECUTE FUNCTION meetings_load_trigger();
+
+DROP TRIGGER IF EXISTS meeting_participants_load ON meeting_participants;
+CREATE TRIGGER meeting_participants_load
+    AFTER INSERT OR DELETE ON meeting_participants
+    FOR EACH ROW EXECUTE FUNCTION meeting_participants_load_trigger();
+
+--Rebuild both tables from scratch (initial fill, or after bulk maintenance
+--such as detaching partitions, which does not fire triggers)
+CREATE OR REPLACE FUNCTION rebuild_load_summaries()
+RETURNS void AS $$
+BEGIN
+    TRUNCATE person_daily_load, location_daily_load;
+
+    INSERT INTO person_daily_load (tenant_id, person_id, day, meetings, busy_seconds)
+    SELECT m.tenant_id, mp.person_id, d, COUNT(*),
+           SUM(EXTRACT(EPOCH FROM
+               LEAST(m.end_time, (d + 1)::timestamp AT TIME ZONE 'UTC')
+               - GREATEST(m.start_time, d::timestamp AT TIME ZONE 'UTC')
+           ))
+    FROM meetings m
+        JOIN meeting_participants mp ON mp.meeting_id = m.meeting_id
+        CROSS JOIN LATERAL utc_days(m.start_time, m.end_time) AS d
+    WHERE m.deleted_at IS NULL
+    GROUP BY m.tenant_id, mp.person_id, d;
+
+    INSERT INTO location_daily_load (tenant_id, location, day, meetings, busy_seconds)
+    SELECT m.tenant_id, m.location, d, COUNT(*),
+           SUM(EXTRACT(EPOCH FROM
+               LEAST(m.end_time, (d + 1)::timestamp AT TIME ZONE 'UTC')
+               - GREATEST(m.start_time, d::timestamp AT TIME ZONE 'UTC')
+           ))
+    FROM meetings m
+        CROSS JOIN LATERAL utc_days(m.start_time, m.end_time) AS d
+    WHERE m.deleted_at IS NULL AND m.location IS NOT NULL AND m.location <> ''
+    GROUP BY m.tenant_id, m.location, d;
+END;
+$$ LANGUAGE plpgsql;
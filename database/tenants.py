@@ -0,0 +1,35 @@
+from .timezones import SESSION_OPTIONS
+
+#session setting read by current_tenant() in SQL (see schema.sql)
+TENANT_SETTING = "meeting_scheduler.tenant_id"
+#tenant of rows written before tenants existed and of sessions without one
+DEFAULT_TENANT = 0
+
+
+def validate_tenant_id(tenant_id):
+    """
+    Check a tenant id (a non negative int, as stored in tenant_id columns)
+
+    Returns:
+        int
+
+    Raises:
+        ValueError: not a valid tenant id
+    """
+    try:
+        value = int(tenant_id)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid tenant id: {tenant_id!r}") from None
+    if value < 0 or value > 2**31 - 1 or str(value) != str(tenant_id).strip():
+        raise ValueError(f"Invalid tenant id: {tenant_id!r}")
+    return value
+
+
+def session_options(tenant_id=DEFAULT_TENANT):
+    """
+    libpq options of a session of one tenant (UTC, tenant setting)
+
+    Returns:
+        str
+    """
+    return f"{SESSION_OPTIONS} -c {TENANT_SETTING}={validate_tenant_id(tenant_id)}"
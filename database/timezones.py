@@ -0,0 +1,163 @@
+import os
+from datetime import datetime, time, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+UTC = timezone.utc
+
+#every db session runs in UTC: TIMESTAMPTZ values come back as UTC
+#datetimes and partition bounds / load summary days are UTC too
+SESSION_OPTIONS = "-c timezone=UTC"
+
+#formatted values kept per converter before its cache is reset
+MAX_CACHED = 20000
+
+
+@lru_cache(maxsize=None)
+def local_zone_name():
+    """
+    IANA name of the zone naive datetimes are interpreted in
+    ($TZ, else the target of /etc/localtime, else "UTC")
+
+    Returns:
+        str
+    """
+    name = os.environ.get("TZ", "").lstrip(":")
+    if name and is_valid_zone(name):
+        return name
+
+    try:
+        target = os.path.realpath("/etc/localtime")
+    except OSError:
+        target = ""
+    if "zoneinfo" + os.sep in target:
+        name = target.split("zoneinfo" + os.sep, 1)[1]
+        if is_valid_zone(name):
+            return name
+
+    return "UTC"
+
+
+@lru_cache(maxsize=None)
+def get_zone(name=None):
+    """
+    ZoneInfo of an IANA zone name, the local zone for None / ""
+
+    Returns:
+        ZoneInfo
+
+    Raises:
+        ValueError: unknown zone name
+    """
+    if not name:
+        name = local_zone_name()
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown time zone: {name}") from e
+
+
+def is_valid_zone(name):
+    """
+    Whether name is a known IANA zone name
+
+    Returns:
+        bool
+    """
+    try:
+        ZoneInfo(name)
+        return True
+    except (ZoneInfoNotFoundError, ValueError):
+        return False
+
+
+def to_aware(value, zone=None):
+    """
+    Attach a zone to a naive datetime (a wall clock time in `zone`, a
+    tzinfo or zone name, the local zone by default); aware datetimes are
+    returned unchanged. A date is taken as its midnight
+
+    Returns:
+        datetime
+    """
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    if value.tzinfo is None or value.utcoffset() is None:
+        if zone is None or isinstance(zone, str):
+            zone = get_zone(zone)
+        return value.replace(tzinfo=zone)
+    return value
+
+
+def to_utc(value, zone=None):
+    """
+    to_aware(value, zone) converted to UTC
+
+    Returns:
+        datetime
+    """
+    return to_aware(value, zone).astimezone(UTC)
+
+
+class ZoneConverter:
+    """
+    Memoized conversion of aware datetimes into one zone
+
+    Result sets repeat the same few start/end times (meetings start on
+    the hour), so converted and formatted values are cached per instant;
+    the caches are simply reset once they hold MAX_CACHED values
+    """
+
+    def __init__(self, name=None):
+        """
+        Initialize a converter for an IANA zone (local zone for None)
+
+        Returns:
+            None
+        """
+        self.zone = get_zone(name)
+        self.name = name or local_zone_name()
+        self.converted = {}
+        self.formatted = {}
+
+    def convert(self, value):
+        """
+        value in this zone (naive values are first taken as local time)
+
+        Returns:
+            datetime
+        """
+        result = self.converted.get(value)
+        if result is None:
+            if len(self.converted) >= MAX_CACHED:
+                self.converted.clear()
+            result = to_aware(value).astimezone(self.zone)
+            self.converted[value] = result
+        return result
+
+    def format(self, value, fmt="%d-%m-%Y %H:%M"):
+        """
+        value in this zone rendered with strftime(fmt)
+
+        Returns:
+            str
+        """
+        key = (value, fmt)
+        result = self.formatted.get(key)
+        if result is None:
+            if len(self.formatted) >= MAX_CACHED:
+                self.formatted.clear()
+            result = self.convert(value).strftime(fmt)
+            self.formatted[key] = result
+        return result
+
+
+@lru_cache(maxsize=None)
+def converter(name=None):
+    """
+    Shared ZoneConverter of a zone (local zone for None)
+
+    Returns:
+        ZoneConverter
+    """
+    return ZoneConverter(name)
@@ -0,0 +1,106 @@
+import random
+import threading
+from collections import Counter
+
+from psycopg2 import InterfaceError, OperationalError
+
+#SQLSTATEs after which the whole transaction can simply be run again
+RETRYABLE_SQLSTATES = {
+    "40001",  #serialization_failure (SERIALIZABLE conflicts)
+    "40P01",  #deadlock_detected
+    "55P03",  #lock_not_available
+}
+#SQLSTATEs meaning the server dropped the session: reconnect, then retry
+RECONNECT_SQLSTATES = {
+    "57P01",  #admin_shutdown
+    "57P02",  #crash_shutdown
+    "57P03",  #cannot_connect_now
+}
+
+#attempts of one unit of work, including the first one
+MAX_ATTEMPTS = 5
+#backoff before retry n is uniform in [0, min(MAX_DELAY, BASE_DELAY * 2**(n-1))]
+BASE_DELAY = 0.05
+MAX_DELAY = 2.0
+
+
+class CommitUnknownError(OperationalError):
+    """
+    The connection was lost while COMMIT was in flight: the transaction
+    may or may not have been applied, so it is not run again
+    """
+
+
+def retry_reason(error, connection):
+    """
+    Classify a failed transaction
+
+    Returns:
+        str | None: "retry" (run again on the same connection),
+                    "reconnect" (connection lost) or None (give up)
+    """
+    code = getattr(error, "pgcode", None)
+    if code in RETRYABLE_SQLSTATES:
+        return "retry"
+    if code in RECONNECT_SQLSTATES or (code or "").startswith("08"):
+        return "reconnect"
+    if isinstance(error, (OperationalError, InterfaceError)) and (
+        connection is None or connection.closed
+    ):
+        return "reconnect"
+    return None
+
+
+def backoff_delay(attempt, base=BASE_DELAY, cap=MAX_DELAY):
+    """
+    Full jitter exponential backoff before retry number `attempt`
+
+    Returns:
+        float: seconds
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class TransactionMetrics:
+    """
+    Counters of the transactional executor, safe to read from any thread
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.transactions = 0
+        self.retries = 0
+        self.reconnects = 0
+        self.failures = 0
+        self.by_sqlstate = Counter()
+
+    def record_success(self):
+        with self.lock:
+            self.transactions += 1
+
+    def record_retry(self, error, reason):
+        with self.lock:
+            self.retries += 1
+            if reason == "reconnect":
+                self.reconnects += 1
+            self.by_sqlstate[getattr(error, "pgcode", None) or type(error).__name__] += 1
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+
+    def as_dict(self):
+        """
+        Snapshot of the counters
+
+        Returns:
+            dict
+        """
+        with self.lock:
+            return {
+                "transactions": self.transactions,
+                "retries": self.retries,
+                "reconnects": self.reconnects,
+                "failures": self.failures,
+                "by_sqlstate": dict(self.by_sqlstate),
+            }
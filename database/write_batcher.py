@@ -0,0 +1,168 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+#marks the end of the queue
+_STOP = object()
+
+
+class WriteBatcher:
+    """
+    Group-commit writer for high-rate person/meeting creation
+
+    Callers submit requests from any thread; a single writer thread
+    collects them for up to max_delay seconds or max_items requests,
+    validates the whole batch with DatabaseManager.write_batch (one query
+    per check, conflicts checked inside the batch too) and commits once,
+    then hands every caller its own (bool,str) result
+
+    The batcher needs its own connected DatabaseManager: the writer
+    thread is the only user of that connection
+    """
+
+    def __init__(self, db, max_items=200, max_delay=0.005):
+        """
+        Initialize the batcher (call start() before submitting)
+
+        Returns:
+            None
+        """
+        self.db = db
+        self.max_items = max_items
+        self.max_delay = max_delay
+        self.queue = queue.Queue()
+        self.thread = None
+        self.batches = 0
+        self.items = 0
+
+    def start(self):
+        """
+        Start the writer thread
+
+        Returns:
+            None
+        """
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self._run, name="write-batcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Flush pending requests and stop the writer thread
+
+        Returns:
+            None
+        """
+        if not self.thread:
+            return
+        self.queue.put(_STOP)
+        self.thread.join()
+        self.thread = None
+
+    def submit_person(self, name, email, phone=None):
+        """
+        Queue a new person
+
+        Returns:
+            Future: resolves to (bool,str) like DatabaseManager.add_person
+        """
+        return self._submit("person", (name, email, phone))
+
+    def submit_meeting(self, title, description, start_time, end_time, location, participant_ids):
+        """
+        Queue a new meeting
+
+        Returns:
+            Future: resolves to (bool,str) like DatabaseManager.add_meeting
+        """
+        return self._submit(
+            "meeting",
+            (title, description, start_time, end_time, location, list(participant_ids))
+        )
+
+    def add_person(self, name, email, phone=None):
+        """
+        Blocking version of submit_person
+
+        Returns:
+            (bool,str)
+        """
+        return self.submit_person(name, email, phone).result()
+
+    def add_meeting(self, title, description, start_time, end_time, location, participant_ids):
+        """
+        Blocking version of submit_meeting
+
+        Returns:
+            (bool,str)
+        """
+        return self.submit_meeting(
+            title, description, start_time, end_time, location, participant_ids
+        ).result()
+
+    def _submit(self, kind, payload):
+        if not self.thread:
+            raise RuntimeError("WriteBatcher is not started")
+        future = Future()
+        self.queue.put((kind, payload, future))
+        return future
+
+    def _collect(self, first):
+        """
+        Collect a batch starting with `first`, until max_items requests
+        or max_delay seconds
+
+        Returns:
+            (list,bool): the batch and whether stop was requested
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_items:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self.queue.get()
+            if first is _STOP:
+                break
+            batch, stopping = self._collect(first)
+            self._flush(batch)
+
+    def _flush(self, batch):
+        """
+        Write one batch and resolve the futures of its callers
+
+        Returns:
+            None
+        """
+        persons = [(payload, future) for kind, payload, future in batch if kind == "person"]
+        meetings = [(payload, future) for kind, payload, future in batch if kind == "meeting"]
+
+        try:
+            person_results, meeting_results = self.db.write_batch(
+                [payload for payload, future in persons],
+                [payload for payload, future in meetings]
+            )
+        except Exception as e:
+            error = (False, f"Unexpected error: {e}")
+            person_results = [error] * len(persons)
+            meeting_results = [error] * len(meetings)
+
+        for (payload, future), result in zip(persons + meetings, person_results + meeting_results):
+            future.set_result(result)
+
+        self.batches += 1
+        self.items += len(batch)
@@ -1,23 +1,47 @@
 import tkinter as tk
+from functools import lru_cache
 from tkinter import font
 
+#font constants exported by this module: name -> (size, weight)
+#they are resolved on first access, once the real root window exists
+FONTS = {
+    "FONT_TITLE": (16, "bold"),
+    "FONT_NORMAL": (10, "normal"),
+}
 
-def get_poppins(size=12, weight="normal"):
+
+@lru_cache(maxsize=None)
+def has_poppins():
     """
-    Returns font Poppins is exists
+    Check once whether font Poppins is installed
+    Uses the application root window (a hidden one only if none exists yet)
     """
     root = tk._default_root
     if not root:
         root = tk.Tk()
         root.withdraw()
 
-    available_fonts = font.families()
+    return "Poppins" in font.families(root)
 
-    if "Poppins" in available_fonts:
+
+def get_poppins(size=12, weight="normal"):
+    """
+    Returns font Poppins is exists
+    """
+    if has_poppins():
         return ("Poppins", size, weight)
 
     #fallback
     return ("Arial", size, weight)
 
-FONT_TITLE=get_poppins(size=16,weight="bold")
-FONT_NORMAL=get_poppins(size=10)
\ No newline at end of file
+
+def __getattr__(name):
+    """
+    Resolve FONT_TITLE / FONT_NORMAL lazily and cache them on the module
+    """
+    if name in FONTS:
+        value = get_poppins(*FONTS[name])
+        globals()[name] = value
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,13 @@
 import tkinter as tk
 from datetime import datetime
-from tkinter import messagebox
+from tkinter import messagebox, ttk
 
+from database.timezones import UTC, to_aware
 from fonts import FONT_NORMAL, FONT_TITLE
 
+#room combobox entry meaning "do not book a room"
+NO_ROOM = "(no room)"
+
 
 class MeetingForm:
     """
@@ -12,6 +16,7 @@ class MeetingForm:
     This form allows the user to:
         - enter meeting title/description/location
         - set start and end datetime
+        - optionally book a room (or list only the rooms free at that time)
         - select participants from existing persons in the database
         - submit the meeting to be stored in the db
     """
@@ -67,6 +72,28 @@ class MeetingForm:
         self.end_entry = tk.Entry(self.frame, width=40, font=FONT_NORMAL)
         self.end_entry.pack(pady=5)
 
+        #Room selection
+        tk.Label(self.frame, text="Room", font=FONT_NORMAL).pack(anchor="w")
+        self.room_combo = ttk.Combobox(
+            self.frame,
+            values=[NO_ROOM],
+            state="readonly",
+            width=38,
+            font=FONT_NORMAL
+        )
+        self.room_combo.current(0)
+        self.room_combo.pack(pady=5)
+
+        tk.Button(
+            self.frame,
+            text="Show free rooms",
+            command=self.load_free_rooms,
+            font=FONT_NORMAL,
+        ).pack(pady=2)
+
+        # A mapping room label -> (room_id, room name)
+        self.room_map = {}
+
         # A mapping form name -> person_id
         self.person_map = {}
 
@@ -96,18 +123,60 @@ class MeetingForm:
             messagebox.showerror("Error", persons)
             return
 
-        for pid,name in persons:
-            self.person_map[name] = pid
-            self.participants.insert(tk.END, name)
+        for person in persons:
+            self.person_map[person.name] = person.person_id
+            self.participants.insert(tk.END, person.name)
+
+    def set_rooms(self, rooms):
+        """
+        Fill the room combobox with (room_id, name, capacity) rows
+
+        Returns:
+            None
+        """
+        self.room_map = {}
+        for room_id, name, capacity in rooms:
+            label = name if capacity is None else f"{name} ({capacity})"
+            self.room_map[label] = (room_id, name)
+
+        self.room_combo["values"] = [NO_ROOM] + list(self.room_map)
+        self.room_combo.current(0)
+
+    def load_rooms(self):
+        ok, rooms = self.db.get_all_rooms()
+        if not ok:
+            messagebox.showerror("Error", rooms)
+            return
+        self.set_rooms(rooms)
+
+    def load_free_rooms(self):
+        """
+        Keep only the rooms that are free between the entered start and end
+
+        Returns:
+            None
+        """
+        times = self.read_times()
+        if times is None:
+            return
+
+        ok, rooms = self.db.find_free_rooms(*times)
+        if not ok:
+            messagebox.showerror("Error", rooms)
+            return
+        if not rooms:
+            messagebox.showinfo("Rooms", "No room is free at that time")
+        self.set_rooms(rooms)
 
     def show(self):
         """
-        Display the meeting form and refresh the list of persons
+        Display the meeting form and refresh the list of persons and rooms
 
         Returns:
             None
         """
         self.load_persons() #refresh persons list
+        self.load_rooms()
         self.frame.pack(fill="both", expand=True, padx=20, pady=20)
 
     def hide(self):
@@ -119,49 +188,64 @@ class MeetingForm:
         """
         self.frame.pack_forget()
 
-    def submit(self):
+    def read_times(self):
         """
-        Validates input and schedules a meeting
-
-        After validation, the method:
-            - Converts selected participant names to participant_ids
-            - Calls db.add_meeting(...)
-            - Displays success or error feedback message
+        Parse the start and end inputs (local time), showing an error if invalid
 
         Returns:
-            None
+            (datetime,datetime) | None: aware datetimes
         """
-
-        #datetime inputs
         try:
-            start=datetime.strptime(
+            start=to_aware(datetime.strptime(
                 self.start_entry.get(),
                 "%d-%m-%Y %H:%M"
-            )
-            end = datetime.strptime(
+            ))
+            end = to_aware(datetime.strptime(
                 self.end_entry.get(),
                 "%d-%m-%Y %H:%M"
-            )
+            ))
         except ValueError:
             messagebox.showerror(
                 "Error",
             "Invalid date format. Use DD-MM-YYYY HH:MM"
             )
-            return
+            return None
 
-        now = datetime.now()
-
-        if start<now:
+        if end <= start:
             messagebox.showerror(
                 "Error",
-                "Start time cannot be in the past"
+                "End time must be after start time"
             )
+            return None
+
+        return start, end
+
+    def submit(self):
+        """
+        Validates input and schedules a meeting
+
+        After validation, the method:
+            - Converts selected participant names to participant_ids
+            - Resolves the selected room
+            - Calls db.add_meeting(...)
+            - Displays success or error feedback message
+
+        Returns:
+            None
+        """
+
+        #datetime inputs
+        times = self.read_times()
+        if times is None:
             return
+        start, end = times
 
-        if end <= start:
+        now = datetime.now(UTC)
+
+        if start<now:
             messagebox.showerror(
                 "Error",
-                "End time must be after start time"
+                "Start time cannot be in the past"
             )
             return
 
@@ -180,14 +264,23 @@ class MeetingForm:
             for i in selected
         ]
 
+        #selected room, its name is the location if none was typed
+        room_id = None
+        location = self.location_entry.get().strip()
+        room = self.room_map.get(self.room_combo.get())
+        if room:
+            room_id, room_name = room
+            location = location or room_name
+
         #submit meeting to db_manager
         success, message = self.db.add_meeting(
             self.title_entry.get().strip(),
             self.desc_entry.get().strip(),
             start,
             end,
-            self.location_entry.get().strip(),
-            participant_ids
+            location,
+            participant_ids,
+            room_id=room_id
         )
 
         if success:
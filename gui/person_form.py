@@ -8,8 +8,8 @@ class PersonForm:
     """
     Form for adding a new person into the database
     This class provides a Tkinter user interface that allows the user
-    to input personal information (name, email, phone) and submit it to the
-    database through the DatabaseManager
+    to input personal information (name, email, phone, time zone) and submit
+    it to the database through the DatabaseManager
     """
 
     def __init__(self, parent, db_manager,show_menu):
@@ -53,6 +53,11 @@ class PersonForm:
         self.phone_entry = tk.Entry(self.frame, width=40, font=FONT_NORMAL)
         self.phone_entry.pack(pady=5)
 
+        #Time zone input, empty means the local zone
+        tk.Label(self.frame, text="Time zone (e.g. Europe/Bucharest)",font=FONT_NORMAL).pack(anchor="w")
+        self.timezone_entry = tk.Entry(self.frame, width=40, font=FONT_NORMAL)
+        self.timezone_entry.pack(pady=5)
+
         #Submit button
         tk.Button(
             self.frame,
@@ -97,8 +102,9 @@ class PersonForm:
         name = self.name_entry.get()
         email = self.email_entry.get()
         phone = self.phone_entry.get()
+        timezone = self.timezone_entry.get()
 
-        success, message = self.db.add_person(name, email, phone)
+        success, message = self.db.add_person(name, email, phone, timezone)
 
         if success:
             messagebox.showinfo("Success", message)
@@ -116,3 +122,4 @@ class PersonForm:
         self.name_entry.delete(0, tk.END)
         self.email_entry.delete(0, tk.END)
         self.phone_entry.delete(0, tk.END)
+        self.timezone_entry.delete(0, tk.END)
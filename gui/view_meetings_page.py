@@ -1,9 +1,21 @@
 import tkinter as tk
+from bisect import bisect_left
 from datetime import datetime
 from tkinter import filedialog, messagebox, ttk
 
+from database.import_pipeline import format_bulk_summary
+from database.timezones import converter, to_aware
 from fonts import FONT_NORMAL, FONT_TITLE
 
+#format of the times shown and typed in the page
+TIME_FORMAT = "%d-%m-%Y %H:%M"
+
+#search modes shown in the page -> db search mode
+SEARCH_MODES = {
+    "Fully inside interval": "contained",
+    "Overlapping interval": "overlapping",
+    "Starting in interval": "starts_within",
+}
 
 class ViewMeetingsPage:
     """
@@ -11,7 +23,7 @@ class ViewMeetingsPage:
 
     This page allows the user to:
         - Search meetings in the db within a given time interval
-        - Display meetings
+        - Display meetings (kept up to date with changes made by other clients)
         - Export selected meetings to .ics file
         - Import meetings from .ics file into db
     """
@@ -82,6 +94,23 @@ class ViewMeetingsPage:
         )
         self.end_entry.pack(pady=3)
 
+        #search mode selection
+        tk.Label(
+            self.frame,
+            text="Show meetings",
+            font=FONT_NORMAL
+        ).pack(anchor="w")
+
+        self.mode_combo = ttk.Combobox(
+            self.frame,
+            values=list(SEARCH_MODES),
+            state="readonly",
+            width=38,
+            font=FONT_NORMAL
+        )
+        self.mode_combo.current(0)
+        self.mode_combo.pack(pady=3)
+
         #search button
         tk.Button(
             self.frame,
@@ -129,6 +158,11 @@ class ViewMeetingsPage:
 
         self.tree.pack(fill="both", expand=True, pady=10)
 
+        #Meeting records of the displayed rows, keyed by Treeview item id
+        self.meetings = {}
+        #(start, end, mode) of the displayed search, None before the first one
+        self.search_params = None
+
     def show(self):
         """
         Show view meetings page
@@ -155,20 +189,16 @@ class ViewMeetingsPage:
             -Clears current Treeview rows
             -Parses and validates start/end datetime format (DD-MM-YYYY HH:MM)
             -Ensures end > start
-            -Calls db.get_meetings_in_interval(start, end)
+            -Calls db.get_meetings_in_interval(start, end, mode) with the selected mode
             -Displays meetings in the Treeview
 
         Returns:
             None
         """
-        #clear table
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-
         try:
-            #convert text to datetime object
-            start=datetime.strptime(self.start_entry.get(), "%d-%m-%Y %H:%M")
-            end=datetime.strptime(self.end_entry.get(), "%d-%m-%Y %H:%M")
+            #convert text to datetime object (local time)
+            start=to_aware(datetime.strptime(self.start_entry.get(), TIME_FORMAT))
+            end=to_aware(datetime.strptime(self.end_entry.get(), TIME_FORMAT))
         except ValueError:
             messagebox.showerror(
                 "Error",
@@ -184,30 +214,104 @@ class ViewMeetingsPage:
             )
             return
 
+        self.search_params=(start, end, SEARCH_MODES[self.mode_combo.get()])
+        self.load_results(report_empty=True)
+
+    def load_results(self, report_empty=False):
+        """
+        Run the current search and fill the table
+
+        Returns:
+            None
+        """
+        #clear table
+        for row in self.tree.get_children():
+            self.tree.delete(row)
+        self.meetings = {}
+
         #get meetings from db
-        ok,meetings=self.db.get_meetings_in_interval(start, end)
+        start, end, mode = self.search_params
+        ok,meetings=self.db.get_meetings_in_interval(start, end, mode)
         if not ok:
             messagebox.showerror("Error", meetings)
             return
 
         #handle empty results
-        if not meetings:
+        if not meetings and report_empty:
             messagebox.showerror(
                 "No results",
                 "No meetings found in this interval"
             )
             return
 
-        #insert rows into table
-        for title, description, start_t, end_t, location , participants in meetings:
-            #transform from datetime to string
-            start_str = start_t.strftime("%d-%m-%Y %H:%M")
-            end_str = end_t.strftime("%d-%m-%Y %H:%M")
-            self.tree.insert(
+        #insert rows into table, the meeting_id is used as row id
+        for meeting in meetings:
+            item = self.tree.insert(
                 "",
                 tk.END,
-                values=(title, description, start_str, end_str, location, participants)
+                iid=str(meeting.meeting_id),
+                values=self.row_values(meeting)
             )
+            self.meetings[item] = meeting
+
+    def row_values(self, meeting):
+        """
+        Table cells of one meeting
+
+        Returns:
+            tuple
+        """
+        #transform from datetime to local time string
+        local = converter()
+        start_str = local.format(meeting.start_time, TIME_FORMAT)
+        end_str = local.format(meeting.end_time, TIME_FORMAT)
+        return (meeting.title, meeting.description, start_str, end_str,
+                meeting.location, ", ".join(meeting.participant_names))
+
+    def remove_row(self, item):
+        if self.tree.exists(item):
+            self.tree.delete(item)
+        self.meetings.pop(item, None)
+
+    def apply_changes(self, changes):
+        """
+        Patch the displayed rows with changes from db.poll_changes():
+        changed meetings are updated, inserted at their start time
+        position or removed, without re-running the whole search
+
+        Returns:
+            None
+        """
+        if self.search_params is None:
+            return
+
+        if changes["resync"]:
+            self.load_results()
+            return
+
+        start, end, mode = self.search_params
+        for meeting_id in changes["removed"]:
+            self.remove_row(str(meeting_id))
+
+        for meeting in changes["meetings"].values():
+            item = str(meeting.meeting_id)
+            if not meeting.in_interval(start, end, mode):
+                self.remove_row(item)
+                continue
+
+            if self.tree.exists(item):
+                self.tree.item(item, values=self.row_values(meeting))
+            else:
+                self.tree.insert("", tk.END, iid=item, values=self.row_values(meeting))
+            self.meetings[item] = meeting
+
+            #keep start time order
+            others = [row for row in self.tree.get_children() if row != item]
+            position = bisect_left(
+                [self.meetings[row].start_time for row in others],
+                meeting.start_time
+            )
+            self.tree.move(item, "", position)
 
 
     def export_meetings(self):
@@ -217,7 +321,7 @@ class ViewMeetingsPage:
         Steps:
             -Check if any meetings are selected in the Treeview
             -Ask user for a save location
-            -Convert selected table rows into meeting tuples
+            -Take the Meeting records of the selected rows (kept by item id)
             -Call db.export_meetings_to_file(meetings_to_export, file_path)
             -Display success/error feedback message
 
@@ -244,18 +348,7 @@ class ViewMeetingsPage:
         if not file_path:
             return  #stopped saving
 
-        meetings_to_export=[]
-        for item_id in selected_items:
-            values=self.tree.item(item_id, "values")
-
-            title=values[0]
-            description = values[1]
-            start_dt = datetime.strptime(values[2], "%d-%m-%Y %H:%M")
-            end_dt = datetime.strptime(values[3], "%d-%m-%Y %H:%M")
-            location = values[4]
-            participants = values[5]
-
-            meetings_to_export.append((title, description, start_dt, end_dt, location, participants))
+        meetings_to_export=[self.meetings[item] for item in selected_items]
 
         success,message=self.db.export_meetings_to_file(meetings_to_export,file_path)
 
@@ -266,30 +359,52 @@ class ViewMeetingsPage:
 
     def import_meetings(self):
         """
-        import meetings from ics file into the db
+        import meetings from one or more ics files into the db
 
         Steps:
-            -Ask user to select an ICS file
-            -Call db.import_meetings_from_file(file_path)
+            -Ask user to select one or more ICS files
+            -Check the files with a dry run (db.import_meetings_from_file
+             for one file, db.bulk_import_files for many) and import them,
+             each file all or nothing, once confirmed
             -Display success/error message
 
         Returns:
             None
         """
-        file_path = filedialog.askopenfilename(
+        file_paths = filedialog.askopenfilenames(
             title="Import meetings",
             filetypes=[("iCalendar files", "*.ics")]
         )
 
-        if not file_path:
+        if not file_paths:
             return #stopped saving
 
-        success, message = self.db.import_meetings_from_file(file_path)
+        if len(file_paths)==1:
+            success, message = self.db.import_meetings_from_file(file_paths[0], dry_run=True)
+            if not success:
+                messagebox.showerror("Import error", message)
+                return
+            if not messagebox.askyesno("Import meetings", f"{message}\n\nImport them?"):
+                return
+            success, message = self.db.import_meetings_from_file(file_paths[0])
+        else:
+            success, summary = self.db.bulk_import_files(list(file_paths), dry_run=True)
+            if not success:
+                messagebox.showerror(
+                    "Import error",
+                    format_bulk_summary(summary) if isinstance(summary, dict) else summary
+                )
+                return
+            if not summary["accepted"]:
+                messagebox.showerror("Import error", format_bulk_summary(summary))
+                return
+            if not messagebox.askyesno("Import meetings", f"{format_bulk_summary(summary)}\n\nImport them?"):
+                return
+            success, summary = self.db.bulk_import_files(list(file_paths))
+            #a failed import still lists the files committed before it
+            message=format_bulk_summary(summary) if isinstance(summary, dict) else summary
 
         if success:
             messagebox.showinfo("Success", message)
         else:
             messagebox.showerror("Import error", message)
-
-
-
@@ -1,33 +1,61 @@
+import argparse
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import messagebox
 
 from config.db_config import DEFAULT_CONFIG
 from database import DatabaseManager
-from gui.meeting_form import MeetingForm
-from gui.menu_page import MenuPage
-from gui.person_form import PersonForm
-from gui.view_meetings_page import ViewMeetingsPage
+from database.tenants import DEFAULT_TENANT, validate_tenant_id
 
+#how often the UI checks whether the background connection finished (ms)
+CONNECT_POLL_MS = 50
+#how often the UI applies meeting changes notified by other clients (ms)
+CHANGES_POLL_MS = 500
 
-def main():
+
+def main(fast_start=True, on_ready=None, snapshot=None, tenant_id=DEFAULT_TENANT):
     """
     Entry point of the application
 
     The application uses a single container frame and switches
     between pages by showing/hiding frames
 
+    In fast start mode the menu is shown right away: the database
+    connects in a background thread and every other page is only
+    built the first time the user navigates to it
+    With fast_start=False everything is connected and built up front
+
+    With a snapshot file (see cli.py snapshot) the application runs
+    offline: no database connection, meetings are searched in the
+    memory-mapped snapshot and every write is refused
+
+    Args:
+        fast_start: lazy startup (default) or eager startup
+        on_ready: optional callback(root) run once the menu is painted,
+                  used by benchmarks/startup_bench.py
+        snapshot: optional snapshot file for offline mode
+        tenant_id: tenant whose data the application shows and edits
+
     Returns:
         None
     """
-    #connect to database
-    db = DatabaseManager()
-    success, message = db.connect(**DEFAULT_CONFIG)
+    db = DatabaseManager(tenant_id=tenant_id)
 
-    if not success:
-        messagebox.showerror("Database Error", message)
-        return
-    else:
-        print("Database connection established")
+    if snapshot:
+        success, message = db.open_snapshot(snapshot, offline=True)
+        if not success:
+            messagebox.showerror("Snapshot Error", message)
+            return
+        print(message)
+    elif not fast_start:
+        #connect to database
+        success, message = db.connect(**DEFAULT_CONFIG)
+
+        if not success:
+            messagebox.showerror("Database Error", message)
+            return
+        else:
+            print("Database connection established")
 
     #initialize main app window
     root = tk.Tk()
@@ -38,10 +66,40 @@ def main():
     container = tk.Frame(root)
     container.pack(fill="both", expand=True)
 
-    menu_page = None
-    person_form = None
-    meeting_form = None
-    view_meetings_page = None
+    #pages built so far, by name
+    pages = {}
+    #set once the (background) connection succeeded
+    db_ready = {"value": not fast_start or bool(snapshot)}
+
+    #gui modules are imported on first use of their page
+    def build_menu():
+        from gui.menu_page import MenuPage
+        return MenuPage(
+            container,
+            show_person=show_person,
+            show_meeting=show_meeting,
+            show_view_meetings_interval=show_view_meetings_interval,
+            exit_app=root.destroy
+        )
+
+    def build_person():
+        from gui.person_form import PersonForm
+        return PersonForm(container, db, show_menu)
+
+    def build_meeting():
+        from gui.meeting_form import MeetingForm
+        return MeetingForm(container, db, show_menu)
+
+    def build_view_meetings():
+        from gui.view_meetings_page import ViewMeetingsPage
+        return ViewMeetingsPage(container, db, show_menu)
+
+    page_factories = {
+        "menu": build_menu,
+        "person": build_person,
+        "meeting": build_meeting,
+        "view_meetings": build_view_meetings,
+    }
 
     #function to hide all pages
     def hide_all_pages():
@@ -53,14 +111,29 @@ def main():
         Returns:
             None
         """
-        if menu_page:
-            menu_page.hide()
-        if person_form:
-            person_form.hide()
-        if meeting_form:
-            meeting_form.hide()
-        if view_meetings_page:
-            view_meetings_page.hide()
+        for page in pages.values():
+            page.hide()
+
+    def show_page(name):
+        """
+        Display a page, building it on first use
+        Pages other than the menu need the database connection
+
+        Returns:
+            None
+        """
+        if name != "menu" and not db_ready["value"]:
+            messagebox.showinfo(
+                "Please wait",
+                "Connecting to the database, try again in a moment"
+            )
+            return
+
+        if name not in pages:
+            pages[name] = page_factories[name]()
+
+        hide_all_pages()
+        pages[name].show()
 
     def show_menu():
         """
@@ -69,8 +142,7 @@ def main():
         Returns:
             None
         """
-        hide_all_pages()
-        menu_page.show()
+        show_page("menu")
 
     def show_person():
         """
@@ -79,8 +151,7 @@ def main():
         Returns:
             None
         """
-        hide_all_pages()
-        person_form.show()
+        show_page("person")
 
     def show_meeting():
         """
@@ -89,8 +160,7 @@ def main():
         Returns:
             None
         """
-        hide_all_pages()
-        meeting_form.show()
+        show_page("meeting")
 
     def show_view_meetings_interval():
         """
@@ -99,26 +169,106 @@ def main():
         Returns:
             None
         """
-        hide_all_pages()
-        view_meetings_page.show()
+        show_page("view_meetings")
 
-    #initialize pages
-    person_form = PersonForm(container, db, show_menu)
-    meeting_form= MeetingForm(container, db, show_menu)
-    view_meetings_page = ViewMeetingsPage(container, db, show_menu)
+    def poll_changes():
+        """
+        Apply meeting changes from other clients to the caches and,
+        if it was built, to the view meetings page
 
-    menu_page = MenuPage(
-        container,
-        show_person=show_person,
-        show_meeting=show_meeting,
-        show_view_meetings_interval=show_view_meetings_interval,
-        exit_app=root.destroy
-    )
+        Returns:
+            None
+        """
+        changes = db.poll_changes()
+        if changes and "view_meetings" in pages:
+            pages["view_meetings"].apply_changes(changes)
+        root.after(CHANGES_POLL_MS, poll_changes)
+
+    def start_live_refresh():
+        """
+        Listen for changes once the database is connected
+
+        Returns:
+            None
+        """
+        db.start_change_listener()
+        root.after(CHANGES_POLL_MS, poll_changes)
+
+    if not fast_start:
+        #initialize pages
+        for name in page_factories:
+            pages[name] = page_factories[name]()
+        if not snapshot:
+            start_live_refresh()
+    elif not snapshot:
+        #connect to database while the menu is already visible
+        executor = ThreadPoolExecutor(max_workers=1)
+        connecting = executor.submit(db.connect, **DEFAULT_CONFIG)
+        executor.shutdown(wait=False)
+
+        def check_connection():
+            """
+            Poll the background connection from the Tk thread
+
+            Returns:
+                None
+            """
+            if not connecting.done():
+                root.after(CONNECT_POLL_MS, check_connection)
+                return
+
+            success, message = connecting.result()
+            if not success:
+                messagebox.showerror("Database Error", message)
+                root.destroy()
+                return
+
+            db_ready["value"] = True
+            print("Database connection established")
+            start_live_refresh()
+
+        root.after(CONNECT_POLL_MS, check_connection)
 
     #show main menu initially
     show_menu()
+
+    if on_ready:
+        root.after_idle(on_ready, root)
+
     root.mainloop()
+    db.close()
+
+
+def parse_tenant(value):
+    """
+    argparse type for tenant ids (as cli.py --tenant)
+
+    Returns:
+        int
+    """
+    try:
+        return validate_tenant_id(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def parse_args(argv=None):
+    """
+    Command line options of the application
+
+    Returns:
+        argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description="Meeting scheduler")
+    parser.add_argument("--eager", action="store_true",
+                        help="connect and build every page up front")
+    parser.add_argument("--offline", metavar="SNAPSHOT",
+                        help="run offline on a snapshot file (see cli.py snapshot)")
+    parser.add_argument("--tenant", type=parse_tenant, default=DEFAULT_TENANT,
+                        help="tenant whose data is shown and edited")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    main(fast_start=not args.eager, snapshot=args.offline, tenant_id=args.tenant)